@@ -156,7 +156,7 @@ async def demo_context_manager():
     # Start session
     print("\n1. Starting session...")
     await context.start_session('demo_session')
-    print(f"   Session started: {context.current_context['session_id']}")
+    print(f"   Session started: {context.current_context.session_id}")
     
     # Set goal
     print("\n2. Setting goal...")
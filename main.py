@@ -222,6 +222,8 @@ class CosikAgent:
         
         # Save state
         await self.memory.save_state()
+        await self.memory.stop()
+        self.memory.close()
     
     async def self_modify(self, modification_request: Dict[str, Any]) -> bool:
         """
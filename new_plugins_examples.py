@@ -132,8 +132,8 @@ async def browser_examples():
     config = {'plugins': {'browser': {}}}
     plugin = BrowserAutomationPlugin(config)
     
-    print("   Note: Browser automation requires Selenium WebDriver")
-    print("   Install with: pip install selenium")
+    print("   Note: Browser automation requires Playwright")
+    print("   Install with: pip install playwright && playwright install")
     print("\n   Example operations:")
     print("   - Start browser (Chrome/Firefox/Edge)")
     print("   - Navigate to URLs")
@@ -142,7 +142,7 @@ async def browser_examples():
     print("   - Execute JavaScript")
     print("   - Take screenshots")
     
-    # Example code (would work if Selenium is installed):
+    # Example code (would work if Playwright is installed):
     """
     # Start Chrome browser
     await plugin.execute('', action='start', browser_type='chrome', headless=True)
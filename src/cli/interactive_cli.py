@@ -11,25 +11,28 @@ Features:
 """
 
 import os
-import sys
-from typing import Dict, List, Optional, Any, Callable
-from datetime import datetime
+import asyncio
+from typing import List
 from pathlib import Path
-import json
 from loguru import logger
 
 try:
     from prompt_toolkit import PromptSession
-    from prompt_toolkit.completion import WordCompleter, Completer, Completion
+    from prompt_toolkit.completion import Completer, Completion
     from prompt_toolkit.history import FileHistory
     from prompt_toolkit.styles import Style
     from prompt_toolkit.formatted_text import HTML
-    from prompt_toolkit.key_binding import KeyBindings
     PROMPT_TOOLKIT_AVAILABLE = True
 except ImportError:
     PROMPT_TOOLKIT_AVAILABLE = False
     logger.warning("prompt_toolkit not available. Install with: pip install prompt-toolkit")
 
+try:
+    import aiofiles
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    AIOFILES_AVAILABLE = False
+
 
 class CommandCompleter(Completer):
     """Custom completer for Cosik commands."""
@@ -77,7 +80,8 @@ class InteractiveCLI:
         """
         self.agent = agent
         self.history_file = Path(history_file)
-        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        if not self.history_file.parent.exists():
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
         
         # Command aliases
         self.aliases = {
@@ -158,14 +162,19 @@ class InteractiveCLI:
         else:
             return "Cosik> "
     
-    async def _execute_builtin(self, command: str, args: List[str]) -> bool:
+    async def _execute_builtin(self, command: str, tail: str = '') -> bool:
         """
         Execute built-in CLI command.
         
+        Args:
+            command: Command name (aliases already expanded)
+            tail: Raw remainder of the input line after the command
+        
         Returns:
             True if command was handled, False to pass to agent
         """
         cmd = command.lower()
+        tail = tail.strip()
         
         # Exit
         if cmd in ['exit', 'quit', 'q']:
@@ -190,7 +199,7 @@ class InteractiveCLI:
         
         # Show history
         elif cmd == 'history':
-            self._show_history()
+            await self._show_history()
             return True
         
         # List workflows
@@ -215,10 +224,10 @@ class InteractiveCLI:
         
         # Start recording
         elif cmd in ['record', 'rec']:
-            if not args:
+            if not tail:
                 print("Usage: record <workflow_name>")
             else:
-                workflow_name = ' '.join(args)
+                workflow_name = tail
                 if hasattr(self.agent, 'command_replay'):
                     self.agent.command_replay.start_recording(workflow_name)
                     print(f"Recording workflow: {workflow_name}")
@@ -240,10 +249,10 @@ class InteractiveCLI:
         
         # Replay workflow
         elif cmd in ['replay', 'play']:
-            if not args:
+            if not tail:
                 print("Usage: replay <workflow_name>")
             else:
-                workflow_name = ' '.join(args)
+                workflow_name = tail
                 if hasattr(self.agent, 'command_replay'):
                     try:
                         print(f"Replaying workflow: {workflow_name}")
@@ -324,15 +333,20 @@ Tips:
         
         print()
     
-    def _show_history(self):
+    async def _show_history(self):
         """Show command history."""
         if not self.history_file.exists():
             print("No history available")
             return
         
         try:
-            with open(self.history_file, 'r') as f:
-                lines = f.readlines()
+            # Read without blocking the event loop
+            if AIOFILES_AVAILABLE:
+                async with aiofiles.open(self.history_file, 'rb') as f:
+                    data = await f.read()
+            else:
+                data = await asyncio.to_thread(self.history_file.read_bytes)
+            lines = data.decode('utf-8', errors='replace').splitlines()
             
             print("\n=== Command History (last 20) ===")
             for i, line in enumerate(lines[-20:], 1):
@@ -470,13 +484,13 @@ Tips:
         # Expand aliases
         parts = user_input.split(maxsplit=1)
         command = parts[0].lower()
-        args = parts[1].split() if len(parts) > 1 else []
+        tail = parts[1] if len(parts) > 1 else ''
         
         if command in self.aliases:
             command = self.aliases[command]
         
         # Try built-in commands first
-        if await self._execute_builtin(command, args):
+        if await self._execute_builtin(command, tail):
             return
         
         # Record if recording
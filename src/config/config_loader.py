@@ -1,10 +1,15 @@
 """Configuration loader for Cosik AI Agent."""
 
+import asyncio
+import copy
 import yaml
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 from loguru import logger
 
+# Prefer the libyaml-backed dumper when available
+_YAML_DUMPER = getattr(yaml, 'CDumper', yaml.Dumper)
+
 
 class ConfigLoader:
     """Load and manage configuration for the agent."""
@@ -18,6 +23,11 @@ class ConfigLoader:
         """
         self.config_path = Path(config_path)
         self.config = self._load_config()
+        
+        # (repr, serialized YAML) per top-level section; a section's YAML is
+        # reused while its repr is unchanged, however it was modified
+        self._section_yaml: Dict[str, Tuple[str, str]] = {}
+        self._save_lock = asyncio.Lock()
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -96,9 +106,10 @@ class ConfigLoader:
             # Apply changes
             self._apply_changes(self.config, changes)
             
-            # Save to file
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.config, f, default_flow_style=False)
+            # Save to file off the event loop, one save at a time, from a
+            # snapshot taken here so the worker never reads live sections
+            async with self._save_lock:
+                await asyncio.to_thread(self._save_config, self._snapshot_sections())
             
             logger.info("Configuration updated successfully")
             return True
@@ -106,6 +117,52 @@ class ConfigLoader:
             logger.error(f"Error updating config: {e}")
             return False
     
+    def _snapshot_sections(self) -> List[Tuple[str, str, Any]]:
+        """
+        Snapshot the top-level sections for _save_config.
+        
+        Sections whose repr matches the cached one are not copied, since
+        their cached YAML is still current; the rest are deep-copied.
+        
+        Returns:
+            (key, repr, copy of the section or None) in sorted key order
+        """
+        sections = []
+        for key in sorted(self.config):
+            fingerprint = repr(self.config[key])
+            cached = self._section_yaml.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                sections.append((key, fingerprint, None))
+            else:
+                sections.append((key, fingerprint, copy.deepcopy(self.config[key])))
+        return sections
+    
+    def _save_config(self, sections: Optional[List[Tuple[str, str, Any]]] = None):
+        """
+        Write the configuration to the YAML file.
+        
+        Args:
+            sections: Snapshot from _snapshot_sections; taken now if None
+        """
+        if sections is None:
+            sections = self._snapshot_sections()
+        
+        # Sections are emitted in sorted order, matching a full sorted dump
+        chunks = []
+        section_yaml = {}
+        for key, fingerprint, section in sections:
+            if section is None:
+                text = self._section_yaml[key][1]
+            else:
+                text = yaml.dump({key: section}, Dumper=_YAML_DUMPER,
+                                 default_flow_style=False)
+            section_yaml[key] = (fingerprint, text)
+            chunks.append(text)
+        
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(chunks))
+        self._section_yaml = section_yaml
+    
     def _apply_changes(self, config: Dict, changes: Dict):
         """Recursively apply changes to configuration."""
         for key, value in changes.items():
@@ -1,5 +1,5 @@
 """Context management package."""
 
-from .context_manager import ContextManager
+from .context_manager import ContextManager, SessionContext
 
-__all__ = ['ContextManager']
+__all__ = ['ContextManager', 'SessionContext']
@@ -1,11 +1,25 @@
 """Context management system for maintaining awareness and intelligent decision making."""
 
-import asyncio
+import time
+import platform
 from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
-from datetime import datetime, timedelta
-from collections import deque
-import json
+from datetime import datetime
+from collections import deque, OrderedDict
+from dataclasses import dataclass, field
+from itertools import islice
+
+
+@dataclass(slots=True)
+class SessionContext:
+    """State of the current session."""
+    session_id: Optional[str] = None
+    start_time: Optional[datetime] = None
+    current_goal: Optional[Dict[str, Any]] = None
+    active_tasks: List[Dict[str, Any]] = field(default_factory=list)
+    environment: Dict[str, Any] = field(default_factory=dict)
+    user_preferences: Dict[str, Any] = field(default_factory=dict)
+    constraints: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class ContextManager:
@@ -14,6 +28,9 @@ class ContextManager:
     environment information, and user preferences.
     """
     
+    # Interaction types worth remembering in working memory
+    _WORKING_MEMORY_INTERACTIONS = frozenset({'user_input', 'critical_event'})
+    
     def __init__(self, config, memory_manager=None):
         """
         Initialize context manager.
@@ -26,24 +43,42 @@ class ContextManager:
         self.memory = memory_manager
         
         # Context state
-        self.current_context = {
-            'session_id': None,
-            'start_time': None,
-            'current_goal': None,
-            'active_tasks': [],
-            'environment': {},
-            'user_preferences': {},
-            'constraints': []
-        }
+        self.current_context = SessionContext()
+        
+        # Constraints compiled by set_constraints
+        self._forbidden_actions: frozenset = frozenset()
+        self._time_limit: Optional[float] = None
         
-        # Short-term working memory
+        # Active tasks indexed by task id
+        self._tasks_by_id: Dict[str, Dict[str, Any]] = {}
+        
+        # Monotonic session start, used for duration measurements
+        self._session_start_mono: Optional[float] = None
+        
+        # Lowercased words of the current goal, used by infer_intent
+        self._goal_keywords: frozenset = frozenset()
+        
+        # Bumped whenever state copied by get_relevant_context changes (working
+        # memory, goal, tasks, constraints); keys its cache
+        self._wm_version = 0
+        self._relevant_context_cache: OrderedDict = OrderedDict()
+        self._relevant_context_cache_size = 32
+        
+        # Short-term working memory of (kind, timestamp_ns, payload) tuples
         self.working_memory = deque(maxlen=config.get('context.working_memory_size', 20))
         
         # Recent interactions
         self.recent_interactions = deque(maxlen=config.get('context.interaction_history_size', 50))
         
-        # Application state tracking
-        self.app_states = {}
+        # Application state tracking (LRU, least recently used evicted first)
+        self.app_states: OrderedDict = OrderedDict()
+        self._app_states_cap = config.get('context.app_states_max', 64)
+        
+        # Environment fields that do not change during the process lifetime
+        self._static_env = {
+            'os': platform.system().lower(),
+            'screen_resolution': self._detect_resolution()
+        }
         
         # Performance tracking
         self.performance_metrics = {
@@ -63,40 +98,48 @@ class ContextManager:
         """
         logger.info(f"Starting new session: {session_id}")
         
-        self.current_context = {
-            'session_id': session_id,
-            'start_time': datetime.now(),
-            'current_goal': None,
-            'active_tasks': [],
-            'environment': await self._capture_environment(),
-            'user_preferences': initial_context.get('preferences', {}) if initial_context else {},
-            'constraints': initial_context.get('constraints', []) if initial_context else []
-        }
+        self.current_context = SessionContext(
+            session_id=session_id,
+            start_time=datetime.now(),
+            environment=self._capture_environment(),
+            user_preferences=initial_context.get('preferences', {}) if initial_context else {}
+        )
+        self.set_constraints(initial_context.get('constraints', []) if initial_context else [])
+        self._session_start_mono = time.perf_counter()
+        self._wm_version += 1
+        self._tasks_by_id.clear()
+        self._goal_keywords = frozenset()
         
         # Load previous session context if available
         if self.memory:
             previous = await self.memory.get_previous_session_context()
             if previous:
-                self.current_context['user_preferences'].update(
+                self.current_context.user_preferences.update(
                     previous.get('user_preferences', {})
                 )
         
         logger.info("Session started successfully")
     
-    async def _capture_environment(self) -> Dict[str, Any]:
+    def _capture_environment(self) -> Dict[str, Any]:
         """Capture current environment state."""
-        env = {
+        # Static fields are detected once in __init__; only volatile ones
+        # are refreshed here
+        return {
+            **self._static_env,
             'timestamp': datetime.now().isoformat(),
-            'os': 'windows',  # Assuming Windows for this project
             'active_windows': [],
-            'clipboard_content': None,
-            'screen_resolution': None
+            'clipboard_content': None
         }
-        
-        # Could be extended to capture more details
-        # For now, basic structure
-        
-        return env
+    
+    @staticmethod
+    def _detect_resolution() -> Optional[Tuple[int, int]]:
+        """Detect the primary screen resolution, if a display is available."""
+        try:
+            import pyautogui
+            width, height = pyautogui.size()
+            return (width, height)
+        except Exception:
+            return None
     
     async def update_goal(self, goal: str, metadata: Optional[Dict] = None) -> None:
         """
@@ -107,61 +150,61 @@ class ContextManager:
             metadata: Optional metadata about the goal
         """
         logger.info(f"Updating goal: {goal}")
+        now, now_ns = self._now()
         
-        self.current_context['current_goal'] = {
+        self.current_context.current_goal = {
             'description': goal,
-            'start_time': datetime.now(),
+            'start_time': now,
             'metadata': metadata or {},
             'status': 'active'
         }
+        self._goal_keywords = frozenset(goal.lower().split())
         
         # Add to working memory
-        self.working_memory.append({
-            'type': 'goal_update',
-            'goal': goal,
-            'timestamp': datetime.now()
-        })
+        self.working_memory.append(('goal_update', now_ns, goal))
+        self._wm_version += 1
     
     async def add_task(self, task: Dict[str, Any]) -> None:
         """Add a task to active tasks."""
+        now, now_ns = self._now()
         task_with_meta = {
             **task,
-            'added_at': datetime.now(),
+            'added_at': now,
             'status': 'pending'
         }
-        self.current_context['active_tasks'].append(task_with_meta)
+        self.current_context.active_tasks.append(task_with_meta)
+        if 'id' in task:
+            self._tasks_by_id[task['id']] = task_with_meta
         
         # Add to working memory
-        self.working_memory.append({
-            'type': 'task_added',
-            'task': task,
-            'timestamp': datetime.now()
-        })
+        self.working_memory.append(('task_added', now_ns, task))
+        self._wm_version += 1
     
     async def update_task_status(self, task_id: str, status: str, result: Optional[Dict] = None) -> None:
         """Update status of an active task."""
-        for task in self.current_context['active_tasks']:
-            if task.get('id') == task_id:
-                task['status'] = status
-                task['updated_at'] = datetime.now()
-                if result:
-                    task['result'] = result
-                
-                # Update performance metrics
-                if status == 'completed':
-                    self.performance_metrics['tasks_completed'] += 1
-                elif status == 'failed':
-                    self.performance_metrics['tasks_failed'] += 1
-                
-                # Calculate success rate
-                total = (self.performance_metrics['tasks_completed'] + 
-                        self.performance_metrics['tasks_failed'])
-                if total > 0:
-                    self.performance_metrics['success_rate'] = (
-                        self.performance_metrics['tasks_completed'] / total
-                    )
-                
-                break
+        task = self._tasks_by_id.get(task_id)
+        if task is None:
+            return
+        
+        task['status'] = status
+        task['updated_at'] = datetime.now()
+        if result:
+            task['result'] = result
+        self._wm_version += 1
+        
+        # Update performance metrics
+        if status == 'completed':
+            self.performance_metrics['tasks_completed'] += 1
+        elif status == 'failed':
+            self.performance_metrics['tasks_failed'] += 1
+        
+        # Calculate success rate
+        total = (self.performance_metrics['tasks_completed'] + 
+                self.performance_metrics['tasks_failed'])
+        if total > 0:
+            self.performance_metrics['success_rate'] = (
+                self.performance_metrics['tasks_completed'] / total
+            )
     
     async def add_interaction(
         self,
@@ -175,28 +218,42 @@ class ContextManager:
             interaction_type: Type of interaction (user_input, system_output, etc.)
             data: Interaction data
         """
+        now, now_ns = self._now()
+        
+        # Only interactions that reach working memory carry a snapshot
+        relevant = interaction_type in self._WORKING_MEMORY_INTERACTIONS
         interaction = {
             'type': interaction_type,
             'data': data,
-            'timestamp': datetime.now(),
-            'context_snapshot': self._create_context_snapshot()
+            'timestamp': now,
+            'context_snapshot': self._create_context_snapshot() if relevant else None
         }
         
         self.recent_interactions.append(interaction)
         
         # Also add to working memory if relevant
-        if interaction_type in ['user_input', 'critical_event']:
-            self.working_memory.append({
-                'type': 'interaction',
-                'interaction': interaction,
-                'timestamp': datetime.now()
-            })
+        if relevant:
+            self.working_memory.append(('interaction', now_ns, interaction))
+            self._wm_version += 1
+    
+    @staticmethod
+    def _now() -> Tuple[datetime, int]:
+        """Read the clock once, as a datetime and as epoch nanoseconds."""
+        now_ns = time.time_ns()
+        return datetime.fromtimestamp(now_ns / 1_000_000_000), now_ns
+    
+    @staticmethod
+    def _tail(items: deque, n: int) -> list:
+        """Return the last n items of a deque without copying the whole deque."""
+        if n <= 0:
+            return []
+        return list(islice(items, max(0, len(items) - n), None))
     
     def _create_context_snapshot(self) -> Dict[str, Any]:
         """Create a lightweight snapshot of current context."""
         return {
-            'goal': self.current_context.get('current_goal', {}).get('description'),
-            'active_task_count': len(self.current_context['active_tasks']),
+            'goal': (self.current_context.current_goal or {}).get('description'),
+            'active_task_count': len(self.current_context.active_tasks),
             'recent_events': len(self.working_memory)
         }
     
@@ -215,14 +272,23 @@ class ContextManager:
         Returns:
             Relevant context information
         """
+        # similar_past_tasks also goes stale once memory stores another task
+        task_version = self.memory.task_version if self.memory else 0
+        cache_key = (query, max_items, self._wm_version, task_version)
+        cached = self._relevant_context_cache.get(cache_key)
+        if cached is not None:
+            self._relevant_context_cache.move_to_end(cache_key)
+            # A copy, so callers that add keys do not alter later hits
+            return dict(cached)
+        
         logger.info(f"Retrieving relevant context for: {query[:50]}...")
         
         context = {
-            'current_goal': self.current_context.get('current_goal'),
-            'active_tasks': self.current_context.get('active_tasks', []),
-            'recent_history': list(self.working_memory)[-max_items:],
-            'environment': self.current_context.get('environment'),
-            'constraints': self.current_context.get('constraints', []),
+            'current_goal': self.current_context.current_goal,
+            'active_tasks': self.current_context.active_tasks,
+            'recent_history': self._tail(self.working_memory, max_items),
+            'environment': self.current_context.environment,
+            'constraints': self.current_context.constraints,
             'performance': self.performance_metrics
         }
         
@@ -231,7 +297,30 @@ class ContextManager:
             relevant_history = await self.memory.find_similar_tasks(query, limit=5)
             context['similar_past_tasks'] = relevant_history
         
-        return context
+        self._relevant_context_cache[cache_key] = context
+        while len(self._relevant_context_cache) > self._relevant_context_cache_size:
+            self._relevant_context_cache.popitem(last=False)
+        
+        return dict(context)
+    
+    def set_constraints(self, constraints: List[Dict[str, Any]]) -> None:
+        """
+        Replace session constraints and precompile them for check_constraints.
+        
+        Args:
+            constraints: List of constraint dictionaries
+        """
+        self.current_context.constraints = constraints
+        self._wm_version += 1
+        self._forbidden_actions = frozenset(
+            action
+            for c in constraints if c.get('type') == 'forbidden_action'
+            for action in c.get('actions', [])
+        )
+        self._time_limit = min(
+            (c.get('max_duration', 3600) for c in constraints if c.get('type') == 'time_limit'),
+            default=None
+        )
     
     async def check_constraints(self, proposed_action: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """
@@ -244,26 +333,17 @@ class ContextManager:
             Tuple of (is_allowed, list_of_violations)
         """
         violations = []
-        constraints = self.current_context.get('constraints', [])
         
-        for constraint in constraints:
-            constraint_type = constraint.get('type')
-            
-            if constraint_type == 'forbidden_action':
-                forbidden = constraint.get('actions', [])
-                action_type = proposed_action.get('intent', '')
-                if action_type in forbidden:
-                    violations.append(f"Action '{action_type}' is forbidden")
-            
-            elif constraint_type == 'time_limit':
-                max_duration = constraint.get('max_duration', 3600)
-                estimated_duration = proposed_action.get('estimated_duration', 0)
-                if estimated_duration > max_duration:
-                    violations.append(f"Action exceeds time limit ({estimated_duration}s > {max_duration}s)")
-            
-            elif constraint_type == 'resource_limit':
-                # Check resource constraints
-                pass
+        action_type = proposed_action.get('intent', '')
+        if action_type in self._forbidden_actions:
+            violations.append(f"Action '{action_type}' is forbidden")
+        
+        if self._time_limit is not None:
+            estimated_duration = proposed_action.get('estimated_duration', 0)
+            if estimated_duration > self._time_limit:
+                violations.append(f"Action exceeds time limit ({estimated_duration}s > {self._time_limit}s)")
+        
+        # resource_limit constraints are not enforced yet
         
         is_allowed = len(violations) == 0
         return is_allowed, violations
@@ -271,7 +351,7 @@ class ContextManager:
     async def update_user_preference(self, key: str, value: Any) -> None:
         """Update a user preference."""
         logger.info(f"Updating user preference: {key} = {value}")
-        self.current_context['user_preferences'][key] = value
+        self.current_context.user_preferences[key] = value
         
         # Persist if memory available
         if self.memory:
@@ -279,7 +359,7 @@ class ContextManager:
     
     async def get_user_preference(self, key: str, default: Any = None) -> Any:
         """Get a user preference."""
-        return self.current_context['user_preferences'].get(key, default)
+        return self.current_context.user_preferences.get(key, default)
     
     async def track_application_state(
         self,
@@ -293,23 +373,24 @@ class ContextManager:
             app_name: Application name
             state: Current state information
         """
+        now, now_ns = self._now()
         self.app_states[app_name] = {
             'state': state,
-            'last_updated': datetime.now()
+            'last_updated': now
         }
+        self.app_states.move_to_end(app_name)
+        while len(self.app_states) > self._app_states_cap:
+            self.app_states.popitem(last=False)
         
         # Add to working memory
-        self.working_memory.append({
-            'type': 'app_state_update',
-            'app': app_name,
-            'state': state,
-            'timestamp': datetime.now()
-        })
+        self.working_memory.append(('app_state_update', now_ns, (app_name, state)))
+        self._wm_version += 1
     
     async def get_application_state(self, app_name: str) -> Optional[Dict[str, Any]]:
         """Get tracked state of an application."""
         app_state = self.app_states.get(app_name)
         if app_state:
+            self.app_states.move_to_end(app_name)
             return app_state['state']
         return None
     
@@ -332,23 +413,22 @@ class ContextManager:
         }
         
         # Use current goal
-        if self.current_context.get('current_goal'):
-            goal_desc = self.current_context['current_goal'].get('description', '')
+        if self.current_context.current_goal:
             # Simple matching - could be enhanced with ML
-            if any(word in partial_information.get('text', '').lower() 
-                   for word in goal_desc.lower().split()):
+            text_words = set(partial_information.get('text', '').lower().split())
+            if self._goal_keywords & text_words:
                 inference['confidence'] += 0.3
                 inference['reasoning'].append("Aligns with current goal")
         
         # Use recent interactions
-        recent_types = [i['type'] for i in list(self.recent_interactions)[-5:]]
+        recent_types = [i['type'] for i in self._tail(self.recent_interactions, 5)]
         if 'user_input' in recent_types:
             inference['confidence'] += 0.2
             inference['reasoning'].append("Follows recent user input")
         
         # Use active tasks
-        if self.current_context['active_tasks']:
-            last_task = self.current_context['active_tasks'][-1]
+        if self.current_context.active_tasks:
+            last_task = self.current_context.active_tasks[-1]
             if last_task.get('status') == 'pending':
                 inference['intent'] = last_task.get('intent', 'unknown')
                 inference['confidence'] += 0.4
@@ -364,14 +444,14 @@ class ContextManager:
             Suggested action or None
         """
         # Check if there's a current goal
-        if not self.current_context.get('current_goal'):
+        if not self.current_context.current_goal:
             return None
         
-        goal = self.current_context['current_goal']
+        goal = self.current_context.current_goal
         
         # Check for pending tasks
         pending_tasks = [
-            t for t in self.current_context['active_tasks']
+            t for t in self.current_context.active_tasks
             if t.get('status') == 'pending'
         ]
         
@@ -384,7 +464,7 @@ class ContextManager:
         
         # Check if goal is complete
         completed_tasks = [
-            t for t in self.current_context['active_tasks']
+            t for t in self.current_context.active_tasks
             if t.get('status') == 'completed'
         ]
         
@@ -395,7 +475,7 @@ class ContextManager:
             }
         
         # Suggest decomposing goal if no tasks
-        if not self.current_context['active_tasks']:
+        if not self.current_context.active_tasks:
             return {
                 'action': 'decompose_goal',
                 'goal': goal['description'],
@@ -414,20 +494,20 @@ class ContextManager:
         summary_parts = []
         
         # Session info
-        if self.current_context.get('session_id'):
-            session_duration = (datetime.now() - self.current_context['start_time']).total_seconds()
+        if self.current_context.session_id:
+            session_duration = time.perf_counter() - self._session_start_mono
             summary_parts.append(
-                f"Session: {self.current_context['session_id']} "
+                f"Session: {self.current_context.session_id} "
                 f"(running for {session_duration:.0f}s)"
             )
         
         # Current goal
-        if self.current_context.get('current_goal'):
-            goal = self.current_context['current_goal']
+        if self.current_context.current_goal:
+            goal = self.current_context.current_goal
             summary_parts.append(f"Goal: {goal['description']}")
         
         # Task status
-        active_count = len(self.current_context.get('active_tasks', []))
+        active_count = len(self.current_context.active_tasks)
         if active_count > 0:
             summary_parts.append(f"Active tasks: {active_count}")
         
@@ -451,22 +531,24 @@ class ContextManager:
         logger.info("Ending session")
         
         session_duration = (
-            datetime.now() - self.current_context['start_time']
-        ).total_seconds() if self.current_context.get('start_time') else 0
+            time.perf_counter() - self._session_start_mono
+        ) if self._session_start_mono is not None else 0
         
         summary = {
-            'session_id': self.current_context.get('session_id'),
+            'session_id': self.current_context.session_id,
             'duration': session_duration,
-            'goal': self.current_context.get('current_goal'),
-            'tasks_executed': len(self.current_context.get('active_tasks', [])),
+            'goal': self.current_context.current_goal,
+            'tasks_executed': len(self.current_context.active_tasks),
             'performance': self.performance_metrics.copy(),
-            'final_context': self.current_context.copy()
+            'final_context': self.current_context
         }
         
         # Save to persistent memory
         if self.memory:
             await self.memory.store_session_context(summary)
         
+        self._tasks_by_id.clear()
+        
         logger.info(f"Session ended: {summary['tasks_executed']} tasks, "
                    f"{summary['duration']:.0f}s duration")
         
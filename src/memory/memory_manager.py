@@ -1,45 +1,207 @@
 """Memory management system for the AI agent."""
 
 import json
+import asyncio
+import dataclasses
 import sqlite3
+import threading
+import zlib
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from loguru import logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Size of the hashed bag-of-words vectors used by find_similar_tasks
+EMBEDDING_DIM = 256
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for objects the json module cannot serialize."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return str(obj)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes (stored as BLOB)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+
+def _to_epoch_us(ts: datetime) -> int:
+    """Convert a datetime to integer microseconds since the epoch."""
+    return int(ts.timestamp() * 1_000_000)
+
+
+def _from_epoch_us(value) -> str:
+    """Convert stored epoch microseconds back to an ISO timestamp string."""
+    return datetime.fromtimestamp(int(value) / 1_000_000).isoformat()
+
+
+def _loads(data) -> Any:
+    """Deserialize a JSON string or bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _embed(text: str):
+    """Hash the words of a text into a unit-length float32 vector."""
+    vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for word in text.lower().split():
+        vec[zlib.crc32(word.encode('utf-8')) % EMBEDDING_DIM] += 1.0
+    norm = np.linalg.norm(vec)
+    if norm:
+        vec /= norm
+    return vec
+
+
+def _task_text(intent: str, parameters: Any) -> str:
+    """Build the text a task is matched on: its intent and parameter values."""
+    words = [intent.replace('_', ' ')]
+    if isinstance(parameters, dict):
+        words.extend(str(v) for v in parameters.values())
+    return ' '.join(words)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True)
+    def _l2_distances(query, bank):
+        """Squared L2 distance from query to every row of bank."""
+        n, d = bank.shape
+        out = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = 0.0
+            for j in range(d):
+                diff = bank[i, j] - query[j]
+                acc += diff * diff
+            out[i] = acc
+        return out
+else:
+    def _l2_distances(query, bank):
+        """Squared L2 distance from query to every row of bank."""
+        diff = bank - query
+        return np.einsum('ij,ij->i', diff, diff)
+
+
+def _topk_l2(query, bank, k: int):
+    """
+    Find the k rows of bank closest to query.
+    
+    Returns:
+        Tuple of (row indexes sorted by distance, distances for those rows)
+    """
+    dists = _l2_distances(query, bank)
+    if k < len(dists):
+        idx = np.argpartition(dists, k)[:k]
+    else:
+        idx = np.arange(len(dists))
+    idx = idx[np.argsort(dists[idx])]
+    return idx, dists[idx]
+
 
 class MemoryManager:
     """Manage agent memory, including interactions, tasks, and learning."""
     
+    # INSERT statements used by the batched writer
+    SQL_ADD_INTERACTION = (
+        "INSERT INTO interactions (timestamp, input_text, parsed_result) VALUES (?, ?, ?)"
+    )
+    SQL_ADD_TASK = (
+        "INSERT INTO tasks (timestamp, intent, parameters, status, result, retry_count) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    SQL_ADD_ERROR = "INSERT INTO errors (timestamp, error_message) VALUES (?, ?)"
+    SQL_ADD_SELF_MODIFICATION = (
+        "INSERT INTO self_modifications (timestamp, modification_type, details, success) "
+        "VALUES (?, ?, ?, ?)"
+    )
+    SQL_ADD_SESSION_CONTEXT = (
+        "INSERT INTO session_contexts (timestamp, session_id, summary) VALUES (?, ?, ?)"
+    )
+    
     def __init__(self, config):
         """Initialize memory manager."""
         self.config = config
         self.enabled = config.get('memory.enabled', True)
         self.storage_path = Path(config.get('memory.storage_path', './data/memory'))
         self.max_history = config.get('memory.max_history', 1000)
+        self.write_batch_size = config.get('memory.write_batch_size', 100)
         
         # Create storage directory
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
-        # Initialize database
+        # Initialize database (single connection reused for all queries)
         self.db_path = self.storage_path / 'memory.db'
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
         self._init_database()
         
+        # Background writer that coalesces inserts into one transaction
+        self._write_q: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        
+        # Task embeddings for find_similar_tasks, stored row-per-task in one
+        # contiguous array; loaded from the database on first use
+        self._task_bank = None
+        self._task_bank_meta: List[Dict[str, Any]] = []
+        self._task_bank_pending: List[tuple] = []
+        
+        # Bumped for every stored task result, so callers caching
+        # find_similar_tasks results can tell when they go stale
+        self.task_version = 0
+        
+        # History is trimmed back to max_history every tenth of it written
+        self._trim_interval = max(1, self.max_history // 10)
+        self._writes_since_trim = 0
+        
         logger.info("Memory manager initialized")
     
     def _init_database(self):
         """Initialize SQLite database for memory storage."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self._conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            cursor = self._conn.cursor()
+            
+            # Lets trimmed history pages be returned to the OS (new databases only)
+            cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            
+            # WAL keeps readers off the writer's back; NORMAL sync avoids
+            # an fsync on every commit
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.execute('PRAGMA temp_store=MEMORY')
+            cursor.execute('PRAGMA cache_size=-20000')
             
             # Create interactions table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS interactions (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     input_text TEXT NOT NULL,
-                    parsed_result TEXT,
+                    parsed_result BLOB,
                     context TEXT
                 )
             ''')
@@ -48,11 +210,11 @@ class MemoryManager:
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS tasks (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     intent TEXT NOT NULL,
-                    parameters TEXT,
+                    parameters BLOB,
                     status TEXT DEFAULT 'pending',
-                    result TEXT,
+                    result BLOB,
                     retry_count INTEGER DEFAULT 0
                 )
             ''')
@@ -61,7 +223,7 @@ class MemoryManager:
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS errors (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     task_id INTEGER,
                     error_message TEXT,
                     FOREIGN KEY (task_id) REFERENCES tasks (id)
@@ -72,19 +234,193 @@ class MemoryManager:
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS self_modifications (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     modification_type TEXT,
-                    details TEXT,
+                    details BLOB,
                     success INTEGER
                 )
             ''')
             
-            conn.commit()
-            conn.close()
+            # Create session_contexts table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS session_contexts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp INTEGER NOT NULL,
+                    session_id TEXT,
+                    summary BLOB
+                )
+            ''')
+            
+            # Databases created before v1 stored ISO-8601 text timestamps
+            if cursor.execute('PRAGMA user_version').fetchone()[0] < 1:
+                self._migrate_timestamps(cursor)
+                cursor.execute('PRAGMA user_version = 1')
+            
+            # Indexes for the "latest N" queries
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_tasks_status_ts
+                ON tasks (status, timestamp DESC)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_interactions_ts
+                ON interactions (timestamp DESC)
+            ''')
+            
             logger.info("Database initialized successfully")
         except Exception as e:
             logger.error(f"Database initialization failed: {e}")
     
+    def _migrate_timestamps(self, cursor: sqlite3.Cursor):
+        """Rewrite ISO-8601 text timestamps as epoch microseconds."""
+        for table in ('interactions', 'tasks', 'errors', 'self_modifications'):
+            rows = cursor.execute(
+                f"SELECT id, timestamp FROM {table} WHERE typeof(timestamp) = 'text'"
+            ).fetchall()
+            updates = []
+            for row_id, ts in rows:
+                try:
+                    updates.append((_to_epoch_us(datetime.fromisoformat(ts)), row_id))
+                except ValueError:
+                    continue
+            if updates:
+                cursor.executemany(f"UPDATE {table} SET timestamp = ? WHERE id = ?", updates)
+                logger.info(f"Migrated {len(updates)} timestamps in {table}")
+    
+    def _fetchall(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Execute a query on the shared connection and fetch all rows."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+    
+    async def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a query in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(self._fetchall, sql, params)
+    
+    async def start(self):
+        """Start the background writer task (idempotent)."""
+        loop = asyncio.get_running_loop()
+        if (self._writer_task is not None and not self._writer_task.done()
+                and self._writer_task.get_loop() is loop):
+            return
+        self._write_q = asyncio.Queue(maxsize=1000)
+        self._writer_task = loop.create_task(self._drain())
+    
+    async def stop(self):
+        """Flush pending writes and stop the background writer."""
+        if self._writer_task is None:
+            return
+        if self._writer_task.get_loop() is asyncio.get_running_loop():
+            await self._write_q.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        self._writer_task = None
+        self._write_q = None
+    
+    async def _write(self, sql: str, params: tuple) -> int:
+        """
+        Queue an INSERT for the background writer.
+        
+        Returns:
+            Row ID of the inserted row, once committed
+        """
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._write_q.put((sql, params, future))
+        return await future
+    
+    async def _drain(self):
+        """Writer loop: commit all queued inserts in a single transaction."""
+        while True:
+            batch = [await self._write_q.get()]
+            while len(batch) < self.write_batch_size:
+                try:
+                    batch.append(self._write_q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                row_ids = await asyncio.to_thread(
+                    self._write_batch, [(sql, params) for sql, params, _ in batch]
+                )
+                for (_, _, future), row_id in zip(batch, row_ids):
+                    if not future.done():
+                        future.set_result(row_id)
+            except Exception as e:
+                logger.error(f"Error writing batch: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+            
+            self._writes_since_trim += len(batch)
+            if self._writes_since_trim >= self._trim_interval:
+                self._writes_since_trim = 0
+                try:
+                    await asyncio.to_thread(self._trim_history)
+                except Exception as e:
+                    logger.error(f"Error trimming history: {e}")
+    
+    def _write_batch(self, rows: List[tuple]) -> List[int]:
+        """
+        Execute (sql, params) rows in one transaction and return row IDs.
+        
+        Rows are grouped per statement and each group is inserted with a
+        single executemany. IDs within a group are consecutive because the
+        transaction holds the write lock.
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, (sql, _) in enumerate(rows):
+            groups.setdefault(sql, []).append(index)
+        
+        row_ids = [0] * len(rows)
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute('BEGIN')
+            try:
+                for sql, indexes in groups.items():
+                    cursor.executemany(sql, [rows[i][1] for i in indexes])
+                    last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                    first_id = last_id - len(indexes) + 1
+                    for offset, i in enumerate(indexes):
+                        row_ids[i] = first_id + offset
+                cursor.execute('COMMIT')
+            except Exception:
+                cursor.execute('ROLLBACK')
+                raise
+        return row_ids
+    
+    def _trim_history(self):
+        """Delete rows beyond max_history, keeping pending tasks."""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute('''
+                DELETE FROM interactions WHERE id NOT IN (
+                    SELECT id FROM interactions ORDER BY id DESC LIMIT ?
+                )
+            ''', (self.max_history,))
+            cursor.execute('''
+                DELETE FROM tasks WHERE status != 'pending' AND id NOT IN (
+                    SELECT id FROM tasks ORDER BY id DESC LIMIT ?
+                )
+            ''', (self.max_history,))
+            cursor.execute('''
+                DELETE FROM errors WHERE id NOT IN (
+                    SELECT id FROM errors ORDER BY id DESC LIMIT ?
+                )
+            ''', (self.max_history,))
+            cursor.execute('PRAGMA incremental_vacuum')
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
     async def add_interaction(self, input_text: str, parsed_result: Dict[str, Any], 
                             timestamp: Optional[datetime] = None) -> int:
         """
@@ -104,17 +440,10 @@ class MemoryManager:
         try:
             ts = timestamp or datetime.now()
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO interactions (timestamp, input_text, parsed_result)
-                VALUES (?, ?, ?)
-            ''', (ts.isoformat(), input_text, json.dumps(parsed_result)))
-            
-            interaction_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            interaction_id = await self._write(
+                self.SQL_ADD_INTERACTION,
+                (_to_epoch_us(ts), input_text, _dumps(parsed_result))
+            )
             
             logger.debug(f"Added interaction {interaction_id}")
             return interaction_id
@@ -137,26 +466,28 @@ class MemoryManager:
             return -1
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             status = 'completed' if result.get('success') else 'failed'
             
-            cursor.execute('''
-                INSERT INTO tasks (timestamp, intent, parameters, status, result, retry_count)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                datetime.now().isoformat(),
+            task_id = await self._write(self.SQL_ADD_TASK, (
+                _to_epoch_us(datetime.now()),
                 task.get('intent', 'unknown'),
-                json.dumps(task.get('parameters', {})),
+                _dumps(task.get('parameters', {})),
                 status,
-                json.dumps(result),
+                _dumps(result),
                 task.get('retry_count', 0)
             ))
             
-            task_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            if self._task_bank is not None and task_id > 0:
+                self._task_bank_pending.append((
+                    _embed(_task_text(task.get('intent', 'unknown'), task.get('parameters', {}))),
+                    {
+                        'id': task_id,
+                        'intent': task.get('intent', 'unknown'),
+                        'parameters': task.get('parameters', {}),
+                        'status': status
+                    }
+                ))
+            self.task_version += 1
             
             logger.debug(f"Added task result {task_id}")
             return task_id
@@ -179,17 +510,10 @@ class MemoryManager:
             return -1
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO errors (timestamp, error_message)
-                VALUES (?, ?)
-            ''', (datetime.now().isoformat(), error_message))
-            
-            error_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            error_id = await self._write(
+                self.SQL_ADD_ERROR,
+                (_to_epoch_us(datetime.now()), error_message)
+            )
             
             logger.debug(f"Added error {error_id}")
             return error_id
@@ -211,23 +535,13 @@ class MemoryManager:
             return -1
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO self_modifications (timestamp, modification_type, details, success)
-                VALUES (?, ?, ?, ?)
-            ''', (
-                datetime.now().isoformat(),
+            mod_id = await self._write(self.SQL_ADD_SELF_MODIFICATION, (
+                _to_epoch_us(datetime.now()),
                 modification.get('type', 'unknown'),
-                json.dumps(modification),
+                _dumps(modification),
                 1 if modification.get('success') else 0
             ))
             
-            mod_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            
             logger.debug(f"Added self-modification {mod_id}")
             return mod_id
         except Exception as e:
@@ -245,10 +559,7 @@ class MemoryManager:
             return []
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            rows = await self._query('''
                 SELECT id, intent, parameters, retry_count
                 FROM tasks
                 WHERE status = 'pending'
@@ -256,15 +567,12 @@ class MemoryManager:
                 LIMIT 10
             ''')
             
-            rows = cursor.fetchall()
-            conn.close()
-            
             tasks = []
             for row in rows:
                 tasks.append({
                     'id': row[0],
                     'intent': row[1],
-                    'parameters': json.loads(row[2]) if row[2] else {},
+                    'parameters': _loads(row[2]) if row[2] else {},
                     'retry_count': row[3]
                 })
             
@@ -287,25 +595,19 @@ class MemoryManager:
             return []
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
+            rows = await self._query('''
                 SELECT timestamp, input_text, parsed_result
                 FROM interactions
                 ORDER BY timestamp DESC
                 LIMIT ?
             ''', (limit,))
             
-            rows = cursor.fetchall()
-            conn.close()
-            
             interactions = []
             for row in rows:
                 interactions.append({
-                    'timestamp': row[0],
+                    'timestamp': _from_epoch_us(row[0]),
                     'input_text': row[1],
-                    'parsed_result': json.loads(row[2]) if row[2] else {}
+                    'parsed_result': _loads(row[2]) if row[2] else {}
                 })
             
             return interactions
@@ -313,6 +615,124 @@ class MemoryManager:
             logger.error(f"Error getting recent interactions: {e}")
             return []
     
+    def _load_task_bank(self):
+        """Build the task embedding bank from the most recent stored tasks."""
+        rows = self._fetchall('''
+            SELECT id, intent, parameters, status
+            FROM tasks
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (self.max_history,))
+        
+        meta = []
+        vectors = []
+        for row in reversed(rows):
+            parameters = _loads(row[2]) if row[2] else {}
+            meta.append({'id': row[0], 'intent': row[1], 'parameters': parameters, 'status': row[3]})
+            vectors.append(_embed(_task_text(row[1], parameters)))
+        
+        self._task_bank_meta = meta
+        self._task_bank = (np.vstack(vectors) if vectors
+                           else np.empty((0, EMBEDDING_DIM), dtype=np.float32))
+    
+    async def find_similar_tasks(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find past tasks whose intent and parameters resemble a query.
+        
+        Args:
+            query: Goal or task description
+            limit: Maximum number of tasks to return
+            
+        Returns:
+            Matching tasks, most similar first, each with a 'similarity' score
+        """
+        if not self.enabled or not NUMPY_AVAILABLE:
+            return []
+        
+        try:
+            if self._task_bank is None:
+                await asyncio.to_thread(self._load_task_bank)
+            
+            # Fold tasks recorded since the last search into the bank
+            if self._task_bank_pending:
+                pending, self._task_bank_pending = self._task_bank_pending, []
+                self._task_bank = np.vstack([self._task_bank] + [vec[None, :] for vec, _ in pending])
+                self._task_bank_meta.extend(meta for _, meta in pending)
+                if len(self._task_bank_meta) > self.max_history:
+                    self._task_bank = self._task_bank[-self.max_history:]
+                    self._task_bank_meta = self._task_bank_meta[-self.max_history:]
+            
+            if not self._task_bank_meta or limit <= 0:
+                return []
+            
+            query_vec = _embed(query)
+            if not query_vec.any():
+                return []
+            
+            idx, dists = _topk_l2(query_vec, self._task_bank, limit)
+            
+            # Unit vectors: squared L2 distance = 2 - 2 * cosine similarity
+            similar = []
+            for i, dist in zip(idx, dists):
+                similarity = 1.0 - float(dist) / 2.0
+                if similarity <= 0.0:
+                    continue
+                similar.append({**self._task_bank_meta[i], 'similarity': round(similarity, 4)})
+            
+            return similar
+        except Exception as e:
+            logger.error(f"Error finding similar tasks: {e}")
+            return []
+    
+    async def store_session_context(self, summary: Dict[str, Any]) -> int:
+        """
+        Store a session summary, serialized as a single BLOB.
+        
+        Args:
+            summary: Session summary (as produced by ContextManager.end_session)
+            
+        Returns:
+            Session record ID
+        """
+        if not self.enabled:
+            return -1
+        
+        try:
+            record_id = await self._write(
+                self.SQL_ADD_SESSION_CONTEXT,
+                (_to_epoch_us(datetime.now()), summary.get('session_id'), _dumps(summary))
+            )
+            
+            logger.debug(f"Stored session context {record_id}")
+            return record_id
+        except Exception as e:
+            logger.error(f"Error storing session context: {e}")
+            return -1
+    
+    async def get_previous_session_context(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the final context of the most recent stored session.
+        
+        Returns:
+            Context dictionary or None
+        """
+        if not self.enabled:
+            return None
+        
+        try:
+            rows = await self._query('''
+                SELECT summary FROM session_contexts
+                ORDER BY id DESC
+                LIMIT 1
+            ''')
+            
+            if not rows or not rows[0][0]:
+                return None
+            return _loads(rows[0][0]).get('final_context')
+        except Exception as e:
+            logger.error(f"Error getting previous session context: {e}")
+            return None
+    
     async def save_state(self):
         """Save current agent state to disk."""
         if not self.enabled:
@@ -326,8 +746,11 @@ class MemoryManager:
                 'recent_interactions': await self.get_recent_interactions(5)
             }
             
-            with open(state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2)
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(state, default=str, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(state, indent=2, default=_json_default).encode('utf-8')
+            await asyncio.to_thread(state_file.write_bytes, data)
             
             logger.info("Agent state saved")
         except Exception as e:
@@ -349,8 +772,7 @@ class MemoryManager:
             if not state_file.exists():
                 return None
             
-            with open(state_file, 'r', encoding='utf-8') as f:
-                state = json.load(f)
+            state = _loads(await asyncio.to_thread(state_file.read_bytes))
             
             logger.info("Agent state loaded")
             return state
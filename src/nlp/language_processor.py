@@ -1,18 +1,107 @@
 """Natural Language Processing module for understanding user commands."""
 
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 
+# RE2 matches in linear time (no catastrophic backtracking on hostile input);
+# intent patterns use no backreferences, so they compile under either engine
+try:
+    import re2 as regex_engine
+    RE2_AVAILABLE = True
+except ImportError:
+    regex_engine = re
+    RE2_AVAILABLE = False
+
+# Literal first word of an intent pattern, e.g. `otwórz` in `otwórz\s+(.+)`
+_LEADING_VERB_RE = re.compile(r'^(\w+)\\s')
+
+# Bullet or numbering character at the start of a plan line
+_LIST_MARKER_RE = re.compile(r'^[\d.\-*+]\s*')
+
 
 class LanguageProcessor:
     """Process natural language to extract intents and parameters."""
     
+    # Parameter name each intent's matched argument is stored under
+    _INTENT_PARAM_KEY = {
+        'open_application': 'application',
+        'close_application': 'application',
+        'click': 'target',
+        'move_mouse': 'target',
+        'type_text': 'text',
+        'read_file': 'file_path',
+        'write_file': 'file_path',
+        'modify_file': 'file_path',
+        'system_command': 'command',
+        'change_setting': 'setting',
+        'search': 'query',
+        'wait': 'duration'
+    }
+    
     def __init__(self, config, ai_engine=None):
         """Initialize the language processor."""
         self.config = config
         self.ai_engine = ai_engine
         self.intent_patterns = self._load_intent_patterns()
+        
+        # All patterns fused into one alternation, scanned once per parse
+        self._intent_regex, self._alternatives = self._build_intent_regex(self.intent_patterns)
+        
+        # Verbs whose pattern is just `verb\s+(.+)` resolve with a dict lookup
+        self._verb_to_intent = self._build_verb_index(self.intent_patterns)
+    
+    @staticmethod
+    def _build_verb_index(intent_patterns: Dict[str, List[str]]) -> Dict[str, str]:
+        """
+        Map leading verbs of plain `verb\\s+(.+)` patterns to their intent.
+        
+        A verb first seen in a pattern with optional words, quoted args or
+        digit captures is left out, so the fused regex keeps deciding it.
+        
+        Returns:
+            Dictionary of verb to intent
+        """
+        verbs: Dict[str, Optional[str]] = {}
+        for intent, patterns in intent_patterns.items():
+            for pattern in patterns:
+                leading = _LEADING_VERB_RE.match(pattern)
+                if not leading or leading.group(1) in verbs:
+                    continue
+                plain = pattern == leading.group(1) + r'\s+(.+)'
+                verbs[leading.group(1)] = intent if plain else None
+        
+        return {verb: intent for verb, intent in verbs.items() if intent}
+    
+    @staticmethod
+    def _build_intent_regex(
+        intent_patterns: Dict[str, List[str]]
+    ) -> Tuple[Any, Dict[str, Tuple[str, Optional[int]]]]:
+        """
+        Fuse intent patterns into a single regex of named alternatives.
+        
+        Returns:
+            Tuple of (compiled regex, mapping of alternative group name to
+            (intent, index of its argument group or None))
+        """
+        sources = []
+        arg_counts = {}
+        for intent, patterns in intent_patterns.items():
+            for i, pattern in enumerate(patterns):
+                name = f"{intent}__{i}"
+                sources.append(f"(?P<{name}>{pattern})")
+                arg_counts[name] = (intent, regex_engine.compile(pattern).groups)
+        
+        # Inline flag, since the re2 module has no IGNORECASE constant
+        regex = regex_engine.compile('(?i)' + '|'.join(sources))
+        
+        # An alternative's argument is the first group nested inside it
+        alternatives = {}
+        for name, (intent, groups) in arg_counts.items():
+            index = regex.groupindex[name]
+            alternatives[name] = (intent, index + 1 if groups else None)
+        
+        return regex, alternatives
     
     def _load_intent_patterns(self) -> Dict[str, List[str]]:
         """Load intent patterns for command recognition."""
@@ -100,49 +189,50 @@ class LanguageProcessor:
         """
         logger.debug(f"Parsing: {text}")
         
-        # Normalize text
-        normalized = text.strip().lower()
+        # Patterns are case-insensitive, so only surrounding whitespace is dropped
+        normalized = text.strip()
         
-        # Try to match intent patterns
-        for intent, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, normalized, re.IGNORECASE)
-                if match:
-                    logger.info(f"Matched intent: {intent}")
-                    return {
-                        'intent': intent,
-                        'parameters': self._extract_parameters(intent, match),
-                        'original_text': text,
-                        'confidence': 0.9
-                    }
+        # Fast path: a plain leading verb decides the intent on its own
+        parts = normalized.split(None, 1)
+        if len(parts) == 2 and '\n' not in parts[1]:
+            intent = self._verb_to_intent.get(parts[0].lower())
+            if intent:
+                logger.info(f"Matched intent: {intent}")
+                return {
+                    'intent': intent,
+                    'parameters': self._extract_parameters(intent, parts[1]),
+                    'original_text': text,
+                    'confidence': 0.9
+                }
+        
+        # Try to match intent patterns; commands almost always lead with the
+        # verb, so an anchored match usually settles it without a full scan
+        match = self._intent_regex.match(normalized) or self._intent_regex.search(normalized)
+        if match:
+            intent, arg_index = self._alternatives[match.lastgroup]
+            logger.info(f"Matched intent: {intent}")
+            return {
+                'intent': intent,
+                'parameters': self._extract_parameters(
+                    intent, match.group(arg_index) if arg_index else None
+                ),
+                'original_text': text,
+                'confidence': 0.9
+            }
         
         # If no pattern matched, try to use AI for complex parsing
         logger.info("No pattern matched, using AI-based parsing")
         return await self._ai_parse(text)
     
-    def _extract_parameters(self, intent: str, match: re.Match) -> Dict[str, Any]:
-        """Extract parameters from regex match based on intent."""
-        params = {}
-        
-        if match.groups():
-            if intent in ['open_application', 'close_application']:
-                params['application'] = match.group(1).strip()
-            elif intent in ['click', 'move_mouse']:
-                params['target'] = match.group(1).strip()
-            elif intent == 'type_text':
-                params['text'] = match.group(1).strip()
-            elif intent in ['read_file', 'write_file', 'modify_file']:
-                params['file_path'] = match.group(1).strip()
-            elif intent == 'system_command':
-                params['command'] = match.group(1).strip()
-            elif intent == 'change_setting':
-                params['setting'] = match.group(1).strip()
-            elif intent == 'search':
-                params['query'] = match.group(1).strip()
-            elif intent == 'wait':
-                params['duration'] = int(match.group(1))
-        
-        return params
+    def _extract_parameters(self, intent: str, arg: Optional[str]) -> Dict[str, Any]:
+        """Extract parameters from the matched argument based on intent."""
+        key = self._INTENT_PARAM_KEY.get(intent)
+        if arg is None or key is None:
+            return {}
+        
+        if intent == 'wait':
+            return {key: int(arg)}
+        return {key: arg.strip()}
     
     async def _ai_parse(self, text: str) -> Dict[str, Any]:
         """
@@ -200,7 +290,7 @@ class LanguageProcessor:
                 continue
             
             # Remove list markers
-            line = re.sub(r'^[\d\.\-\*\+]\s*', '', line)
+            line = _LIST_MARKER_RE.sub('', line)
             
             if line:
                 # Parse each line as a task
@@ -2,7 +2,7 @@
 Browser Automation Plugin for Cosik AI Agent.
 
 Features:
-- Web browser automation (Selenium)
+- Web browser automation (Playwright)
 - Page navigation and interaction
 - Form filling and submission
 - JavaScript execution
@@ -14,26 +14,84 @@ Features:
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import urlparse
 from loguru import logger
+import asyncio
+import importlib.util
 import time
 
-try:
-    from selenium import webdriver
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.common.keys import Keys
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.webdriver.common.action_chains import ActionChains
-    from selenium.common.exceptions import TimeoutException, NoSuchElementException
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
-    logger.warning("Selenium not available - Browser automation disabled. Install with: pip install selenium")
+# The async API takes ~70ms to import, so only its presence is checked here;
+# it is imported when the first browser launches
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec('playwright') is not None
+if not PLAYWRIGHT_AVAILABLE:
+    logger.warning("Playwright not available - Browser automation disabled. Install with: pip install playwright && playwright install")
+
+
+class _NotLoaded(Exception):
+    """Stands in for Playwright's exceptions until the API is imported; never raised."""
+
+
+async_playwright = None
+PlaywrightError = PlaywrightTimeoutError = _NotLoaded
+
+
+def _load_playwright():
+    """Import the Playwright async API on first use."""
+    global async_playwright, PlaywrightError, PlaywrightTimeoutError
+    if async_playwright is None:
+        from playwright.async_api import async_playwright as api_entry
+        from playwright.async_api import Error, TimeoutError
+        PlaywrightError, PlaywrightTimeoutError = Error, TimeoutError
+        async_playwright = api_entry
+
+# Wraps a Selenium-style script body (`arguments[i]`, `return ...`) as a
+# function Playwright can evaluate, so existing scripts keep working
+_SCRIPT_WRAPPER = "args => (function () {{\n{}\n}}).apply(null, args)"
+
+# Submits the element's form, or the element itself when it is a form
+_SUBMIT_SCRIPT = "el => (el.form || el).submit()"
+
+# Runs a list of steps in-page so a whole sequence costs one driver round-trip.
+# Selectors are CSS and resolved client-side; each step yields its own result.
+_BATCH_SCRIPT = """
+const steps = arguments[0];
+const results = [];
+for (const step of steps) {
+    const el = document.querySelector(step.selector);
+    if (!el) {
+        results.push({success: false, error: 'Element not found: ' + step.selector});
+        continue;
+    }
+    switch (step.action) {
+        case 'click':
+            el.click();
+            results.push({success: true, selector: step.selector});
+            break;
+        case 'type':
+            if (step.clear_first !== false) { el.value = ''; }
+            el.value += step.text || '';
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+            results.push({success: true, selector: step.selector});
+            break;
+        case 'submit':
+            (el.form || el).submit();
+            results.push({success: true, selector: step.selector});
+            break;
+        case 'get_text':
+            results.push({success: true, text: el.innerText});
+            break;
+        default:
+            results.push({success: false, error: 'Unknown batch action: ' + step.action});
+    }
+}
+return results;
+"""
 
 
 class BrowserAutomationPlugin:
     """
-    Browser automation plugin using Selenium WebDriver.
+    Browser automation plugin using Playwright.
     
     Features:
     - Multi-browser support
@@ -43,6 +101,18 @@ class BrowserAutomationPlugin:
     - Screenshot capture
     """
     
+    # Selector strategy names to Playwright selector templates
+    _BY_MAP = {
+        'id': 'id={}',
+        'name': '[name="{}"]',
+        'xpath': 'xpath={}',
+        'css': 'css={}',
+        'class': '.{}',
+        'tag': 'css={}',
+        'link_text': 'a:text-is("{}")',
+        'partial_link_text': 'a:has-text("{}")'
+    }
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize browser automation plugin.
@@ -56,6 +126,43 @@ class BrowserAutomationPlugin:
         # Active browser sessions
         self.browsers = {}
         
+        # Playwright driver, started with the first browser session, and the
+        # loop its objects are bound to
+        self._playwright = None
+        self._playwright_loop = None
+        # Shutdown scheduled by cleanup; the loop only keeps a weak reference
+        self._shutdown_task = None
+        
+        # Launched browser processes are shared by all sessions of the same
+        # (browser_type, headless) key; stopped sessions keep their context
+        # idle in a per-key pool so the next start skips the cold launch
+        self._launched = {}
+        self._pool = {}
+        self.pool_size = self.browser_config.get('pool_size', 2)
+        self._launch_lock = asyncio.Lock()
+        
+        # Action name to handler, resolved with one lookup per call
+        self._actions = {
+            'start': self._start_browser,
+            'stop': self._stop_browser,
+            'navigate': self._navigate,
+            'click': self._click,
+            'type': self._type,
+            'submit': self._submit,
+            'get_text': self._get_text,
+            'screenshot': self._screenshot,
+            'execute_js': self._execute_js,
+            'wait_for': self._wait_for,
+            'get_cookies': self._get_cookies,
+            'set_cookie': self._set_cookie,
+            'back': self._back,
+            'forward': self._forward,
+            'refresh': self._refresh,
+            'batch': self._batch,
+            'warmup': self._warmup,
+            'shutdown': self._shutdown
+        }
+        
         logger.info("Browser automation plugin initialized")
     
     async def execute(self, command: str, **kwargs) -> Dict[str, Any]:
@@ -69,50 +176,22 @@ class BrowserAutomationPlugin:
         Returns:
             Operation result
         """
-        if not SELENIUM_AVAILABLE:
+        if not PLAYWRIGHT_AVAILABLE:
             return {
                 'success': False,
-                'error': 'Selenium not available'
+                'error': 'Playwright not available'
             }
         
         action = kwargs.pop('action', 'navigate')
         
         try:
-            if action == 'start':
-                return await self._start_browser(**kwargs)
-            elif action == 'stop':
-                return await self._stop_browser(**kwargs)
-            elif action == 'navigate':
-                return await self._navigate(**kwargs)
-            elif action == 'click':
-                return await self._click(**kwargs)
-            elif action == 'type':
-                return await self._type(**kwargs)
-            elif action == 'submit':
-                return await self._submit(**kwargs)
-            elif action == 'get_text':
-                return await self._get_text(**kwargs)
-            elif action == 'screenshot':
-                return await self._screenshot(**kwargs)
-            elif action == 'execute_js':
-                return await self._execute_js(**kwargs)
-            elif action == 'wait_for':
-                return await self._wait_for(**kwargs)
-            elif action == 'get_cookies':
-                return await self._get_cookies(**kwargs)
-            elif action == 'set_cookie':
-                return await self._set_cookie(**kwargs)
-            elif action == 'back':
-                return await self._back(**kwargs)
-            elif action == 'forward':
-                return await self._forward(**kwargs)
-            elif action == 'refresh':
-                return await self._refresh(**kwargs)
-            else:
+            handler = self._actions.get(action)
+            if handler is None:
                 return {
                     'success': False,
                     'error': f'Unknown action: {action}'
                 }
+            return await handler(**kwargs)
         except Exception as e:
             logger.error(f"Browser automation failed: {e}")
             return {
@@ -120,6 +199,31 @@ class BrowserAutomationPlugin:
                 'error': str(e)
             }
     
+    async def execute_many(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute several operations, running different sessions concurrently.
+        
+        Operations on the same session keep their order, since they share
+        one page; operations on different sessions are awaited together.
+        
+        Args:
+            actions: Operation parameters as passed to execute, including 'action'
+            
+        Returns:
+            Operation results in the same order as actions
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(actions)
+        by_session: Dict[str, List[int]] = {}
+        for index, params in enumerate(actions):
+            by_session.setdefault(params.get('session_name', 'default'), []).append(index)
+        
+        async def run_session(indices: List[int]):
+            for index in indices:
+                results[index] = await self.execute('', **actions[index])
+        
+        await asyncio.gather(*(run_session(indices) for indices in by_session.values()))
+        return results
+    
     async def _start_browser(self, browser_type: str = 'chrome',
                             session_name: str = 'default',
                             headless: bool = False,
@@ -132,42 +236,30 @@ class BrowserAutomationPlugin:
                     'error': f'Browser session already exists: {session_name}'
                 }
             
-            # Create browser instance
-            if browser_type.lower() == 'chrome':
-                options = webdriver.ChromeOptions()
-                if headless:
-                    options.add_argument('--headless')
-                options.add_argument('--no-sandbox')
-                options.add_argument('--disable-dev-shm-usage')
-                driver = webdriver.Chrome(options=options)
-            
-            elif browser_type.lower() == 'firefox':
-                options = webdriver.FirefoxOptions()
-                if headless:
-                    options.add_argument('--headless')
-                driver = webdriver.Firefox(options=options)
-            
-            elif browser_type.lower() == 'edge':
-                options = webdriver.EdgeOptions()
-                if headless:
-                    options.add_argument('--headless')
-                driver = webdriver.Edge(options=options)
-            
-            else:
+            key = (browser_type.lower(), headless)
+            browser = await self._launch(key)
+            if browser is None:
                 return {
                     'success': False,
                     'error': f'Unsupported browser: {browser_type}'
                 }
             
-            # Set window size if specified
+            context, page = await self._acquire(key, browser)
+            
+            # Set window size if specified, otherwise let the window decide
             if window_size:
-                driver.set_window_size(window_size[0], window_size[1])
-            else:
-                driver.maximize_window()
+                await page.set_viewport_size(
+                    {'width': window_size[0], 'height': window_size[1]}
+                )
             
             self.browsers[session_name] = {
-                'driver': driver,
+                'browser': browser,
+                'context': context,
+                'page': page,
                 'type': browser_type,
+                'key': key,
+                'pooled': not window_size,
+                'element_cache': {},
                 'started_at': datetime.now()
             }
             
@@ -194,9 +286,7 @@ class BrowserAutomationPlugin:
                     'error': f'Browser session not found: {session_name}'
                 }
             
-            browser = self.browsers[session_name]
-            browser['driver'].quit()
-            del self.browsers[session_name]
+            await self._release(self.browsers.pop(session_name))
             
             logger.info(f"Browser stopped: {session_name}")
             return {
@@ -211,6 +301,128 @@ class BrowserAutomationPlugin:
                 'error': str(e)
             }
     
+    async def _warmup(self, browser_type: str = 'chrome', headless: bool = False,
+                      count: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Launch a browser and pre-create idle sessions for later starts.
+        
+        Args:
+            browser_type: Browser to launch
+            headless: Must match the headless flag later sessions start with
+            count: Idle sessions to keep ready (defaults to pool_size)
+            
+        Returns:
+            Operation result with the number of ready sessions
+        """
+        try:
+            key = (browser_type.lower(), headless)
+            browser = await self._launch(key)
+            if browser is None:
+                return {
+                    'success': False,
+                    'error': f'Unsupported browser: {browser_type}'
+                }
+            
+            idle = self._pool.setdefault(key, [])
+            target = self.pool_size if count is None else count
+            while len(idle) < target:
+                context = await browser.new_context(no_viewport=True)
+                idle.append((context, await context.new_page()))
+            
+            logger.info(f"Browser pool warmed: {browser_type} ({len(idle)} ready)")
+            return {
+                'success': True,
+                'browser': browser_type,
+                'ready': len(idle)
+            }
+        
+        except Exception as e:
+            logger.error(f"Warmup failed: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def _shutdown(self) -> Dict[str, Any]:
+        """Close every session, pooled context and browser process."""
+        try:
+            # Closing a browser also closes all of its contexts
+            for browser in self._launched.values():
+                await browser.close()
+            
+            self._launched.clear()
+            self._pool.clear()
+            self.browsers.clear()
+            
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+                self._playwright_loop = None
+            
+            logger.info("Browser automation shut down")
+            return {'success': True}
+        
+        except Exception as e:
+            logger.error(f"Shutdown failed: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def _launch(self, key: tuple):
+        """Return the shared browser for a key, launching it on first use."""
+        if key in self._launched:
+            return self._launched[key]
+        
+        browser_type, headless = key
+        if browser_type == 'chrome':
+            launcher_name = 'chromium'
+            launch_options = {'args': ['--start-maximized']}
+        elif browser_type == 'firefox':
+            launcher_name = 'firefox'
+            launch_options = {}
+        elif browser_type == 'edge':
+            launcher_name = 'chromium'
+            launch_options = {'channel': 'msedge', 'args': ['--start-maximized']}
+        else:
+            return None
+        
+        # Sessions started concurrently must not launch the same browser twice
+        async with self._launch_lock:
+            if key in self._launched:
+                return self._launched[key]
+            
+            if self._playwright is None:
+                _load_playwright()
+                self._playwright = await async_playwright().start()
+                self._playwright_loop = asyncio.get_running_loop()
+            
+            launcher = getattr(self._playwright, launcher_name)
+            browser = await launcher.launch(headless=headless, **launch_options)
+            self._launched[key] = browser
+            return browser
+    
+    async def _acquire(self, key: tuple, browser) -> tuple:
+        """Take an idle (context, page) from the pool or create a new one."""
+        idle = self._pool.get(key)
+        if idle:
+            return idle.pop()
+        
+        context = await browser.new_context(no_viewport=True)
+        return context, await context.new_page()
+    
+    async def _release(self, session: Dict[str, Any]):
+        """Reset a stopped session into the pool, or close it if the pool is full."""
+        idle = self._pool.setdefault(session['key'], [])
+        
+        # Sessions with an emulated viewport can't go back to window sizing
+        if session['pooled'] and len(idle) < self.pool_size:
+            await session['page'].goto('about:blank')
+            await session['context'].clear_cookies()
+            idle.append((session['context'], session['page']))
+        else:
+            await session['context'].close()
+    
     async def _navigate(self, url: str, session_name: str = 'default') -> Dict[str, Any]:
         """Navigate to URL."""
         try:
@@ -218,14 +430,17 @@ class BrowserAutomationPlugin:
                 # Auto-start browser
                 await self._start_browser(session_name=session_name)
             
-            driver = self.browsers[session_name]['driver']
-            driver.get(url)
+            session = self.browsers[session_name]
+            session['element_cache'].clear()
+            
+            page = session['page']
+            await page.goto(url)
             
             logger.info(f"Navigated to: {url}")
             return {
                 'success': True,
                 'url': url,
-                'title': driver.title
+                'title': await page.title()
             }
         
         except Exception as e:
@@ -236,20 +451,19 @@ class BrowserAutomationPlugin:
             }
     
     async def _click(self, selector: str, by: str = 'css',
-                    session_name: str = 'default', timeout: int = 10) -> Dict[str, Any]:
+                    session_name: str = 'default', timeout: int = 10,
+                    wait: bool = True) -> Dict[str, Any]:
         """Click element."""
         try:
-            driver = self.browsers[session_name]['driver']
-            
-            # Map by method
-            by_method = self._get_by_method(by)
+            session = self.browsers[session_name]
+            page = session['page']
+            target = self._to_selector(selector, by)
             
-            # Wait for element
-            element = WebDriverWait(driver, timeout).until(
-                EC.element_to_be_clickable((by_method, selector))
-            )
-            
-            element.click()
+            # Playwright waits for the element to be actionable before clicking
+            if wait:
+                await page.click(target, timeout=timeout * 1000)
+            else:
+                await self._on_element(session, target, lambda el: el.click(force=True))
             
             logger.info(f"Clicked element: {selector}")
             return {
@@ -266,20 +480,22 @@ class BrowserAutomationPlugin:
     
     async def _type(self, selector: str, text: str, by: str = 'css',
                    session_name: str = 'default', timeout: int = 10,
-                   clear_first: bool = True) -> Dict[str, Any]:
+                   clear_first: bool = True, wait: bool = True) -> Dict[str, Any]:
         """Type text into element."""
         try:
-            driver = self.browsers[session_name]['driver']
-            by_method = self._get_by_method(by)
-            
-            element = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((by_method, selector))
-            )
-            
-            if clear_first:
-                element.clear()
-            
-            element.send_keys(text)
+            session = self.browsers[session_name]
+            page = session['page']
+            target = self._to_selector(selector, by)
+            
+            if not wait:
+                if clear_first:
+                    await self._on_element(session, target, lambda el: el.fill(text, force=True))
+                else:
+                    await self._on_element(session, target, lambda el: el.type(text))
+            elif clear_first:
+                await page.fill(target, text, timeout=timeout * 1000)
+            else:
+                await page.type(target, text, timeout=timeout * 1000)
             
             logger.info(f"Typed text into: {selector}")
             return {
@@ -296,17 +512,21 @@ class BrowserAutomationPlugin:
             }
     
     async def _submit(self, selector: str, by: str = 'css',
-                     session_name: str = 'default', timeout: int = 10) -> Dict[str, Any]:
+                     session_name: str = 'default', timeout: int = 10,
+                     wait: bool = True) -> Dict[str, Any]:
         """Submit form."""
         try:
-            driver = self.browsers[session_name]['driver']
-            by_method = self._get_by_method(by)
+            session = self.browsers[session_name]
+            page = session['page']
+            target = self._to_selector(selector, by)
             
-            element = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((by_method, selector))
-            )
-            
-            element.submit()
+            if wait:
+                element = await page.wait_for_selector(
+                    target, state='attached', timeout=timeout * 1000
+                )
+                await element.evaluate(_SUBMIT_SCRIPT)
+            else:
+                await self._on_element(session, target, lambda el: el.evaluate(_SUBMIT_SCRIPT))
             
             logger.info(f"Form submitted: {selector}")
             return {
@@ -322,17 +542,18 @@ class BrowserAutomationPlugin:
             }
     
     async def _get_text(self, selector: str, by: str = 'css',
-                       session_name: str = 'default', timeout: int = 10) -> Dict[str, Any]:
+                       session_name: str = 'default', timeout: int = 10,
+                       wait: bool = True) -> Dict[str, Any]:
         """Get element text."""
         try:
-            driver = self.browsers[session_name]['driver']
-            by_method = self._get_by_method(by)
-            
-            element = WebDriverWait(driver, timeout).until(
-                EC.presence_of_element_located((by_method, selector))
-            )
+            session = self.browsers[session_name]
+            page = session['page']
+            target = self._to_selector(selector, by)
             
-            text = element.text
+            if wait:
+                text = await page.inner_text(target, timeout=timeout * 1000)
+            else:
+                text = await self._on_element(session, target, lambda el: el.inner_text())
             
             return {
                 'success': True,
@@ -346,26 +567,54 @@ class BrowserAutomationPlugin:
                 'error': str(e)
             }
     
+    async def _batch(self, steps: List[Dict[str, Any]],
+                     session_name: str = 'default') -> Dict[str, Any]:
+        """
+        Run several element steps in a single driver call.
+        
+        Args:
+            steps: Dicts with 'action' (click, type, submit, get_text),
+                a CSS 'selector' and, for type, 'text' and 'clear_first'
+            session_name: Browser session to run in
+            
+        Returns:
+            Operation result with one entry per step
+        """
+        try:
+            page = self.browsers[session_name]['page']
+            results = await self._run_script(page, _BATCH_SCRIPT, steps)
+            
+            logger.info(f"Batch executed: {len(steps)} steps")
+            return {
+                'success': all(r.get('success') for r in results),
+                'results': results
+            }
+        
+        except Exception as e:
+            logger.error(f"Batch failed: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
     async def _screenshot(self, session_name: str = 'default',
                          filename: Optional[str] = None,
                          element_selector: Optional[str] = None) -> Dict[str, Any]:
         """Take screenshot."""
         try:
-            driver = self.browsers[session_name]['driver']
+            page = self.browsers[session_name]['page']
             
             if not filename:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f'./data/screenshots/browser_{timestamp}.png'
+                filename = f'./data/screenshots/browser_{time.time_ns()}.png'
             
             Path(filename).parent.mkdir(parents=True, exist_ok=True)
             
             if element_selector:
                 # Screenshot specific element
-                element = driver.find_element(By.CSS_SELECTOR, element_selector)
-                element.screenshot(filename)
+                await page.locator(element_selector).first.screenshot(path=filename)
             else:
                 # Full page screenshot
-                driver.save_screenshot(filename)
+                await page.screenshot(path=filename)
             
             logger.info(f"Screenshot saved: {filename}")
             return {
@@ -384,8 +633,8 @@ class BrowserAutomationPlugin:
                          *args) -> Dict[str, Any]:
         """Execute JavaScript."""
         try:
-            driver = self.browsers[session_name]['driver']
-            result = driver.execute_script(script, *args)
+            page = self.browsers[session_name]['page']
+            result = await self._run_script(page, script, *args)
             
             logger.info("JavaScript executed")
             return {
@@ -405,21 +654,13 @@ class BrowserAutomationPlugin:
                        condition: str = 'present') -> Dict[str, Any]:
         """Wait for element."""
         try:
-            driver = self.browsers[session_name]['driver']
-            by_method = self._get_by_method(by)
+            page = self.browsers[session_name]['page']
             
-            if condition == 'present':
-                WebDriverWait(driver, timeout).until(
-                    EC.presence_of_element_located((by_method, selector))
-                )
-            elif condition == 'visible':
-                WebDriverWait(driver, timeout).until(
-                    EC.visibility_of_element_located((by_method, selector))
-                )
-            elif condition == 'clickable':
-                WebDriverWait(driver, timeout).until(
-                    EC.element_to_be_clickable((by_method, selector))
-                )
+            # Playwright checks enabled state when acting, so clickable waits for visible
+            state = 'attached' if condition == 'present' else 'visible'
+            await page.wait_for_selector(
+                self._to_selector(selector, by), state=state, timeout=timeout * 1000
+            )
             
             logger.info(f"Wait completed: {selector}")
             return {
@@ -427,7 +668,7 @@ class BrowserAutomationPlugin:
                 'selector': selector
             }
         
-        except TimeoutException:
+        except PlaywrightTimeoutError:
             return {
                 'success': False,
                 'error': f'Timeout waiting for element: {selector}'
@@ -442,8 +683,7 @@ class BrowserAutomationPlugin:
     async def _get_cookies(self, session_name: str = 'default') -> Dict[str, Any]:
         """Get all cookies."""
         try:
-            driver = self.browsers[session_name]['driver']
-            cookies = driver.get_cookies()
+            cookies = await self.browsers[session_name]['context'].cookies()
             
             return {
                 'success': True,
@@ -462,8 +702,16 @@ class BrowserAutomationPlugin:
                          session_name: str = 'default') -> Dict[str, Any]:
         """Set cookie."""
         try:
-            driver = self.browsers[session_name]['driver']
-            driver.add_cookie(cookie)
+            browser = self.browsers[session_name]
+            
+            # Like Selenium, default to the current page's domain
+            if 'url' not in cookie and 'domain' not in cookie:
+                cookie = {
+                    'domain': urlparse(browser['page'].url).hostname,
+                    'path': '/',
+                    **cookie
+                }
+            await browser['context'].add_cookies([cookie])
             
             logger.info(f"Cookie set: {cookie.get('name')}")
             return {
@@ -481,8 +729,9 @@ class BrowserAutomationPlugin:
     async def _back(self, session_name: str = 'default') -> Dict[str, Any]:
         """Go back."""
         try:
-            driver = self.browsers[session_name]['driver']
-            driver.back()
+            session = self.browsers[session_name]
+            session['element_cache'].clear()
+            await session['page'].go_back()
             
             return {'success': True}
         except Exception as e:
@@ -491,8 +740,9 @@ class BrowserAutomationPlugin:
     async def _forward(self, session_name: str = 'default') -> Dict[str, Any]:
         """Go forward."""
         try:
-            driver = self.browsers[session_name]['driver']
-            driver.forward()
+            session = self.browsers[session_name]
+            session['element_cache'].clear()
+            await session['page'].go_forward()
             
             return {'success': True}
         except Exception as e:
@@ -501,40 +751,72 @@ class BrowserAutomationPlugin:
     async def _refresh(self, session_name: str = 'default') -> Dict[str, Any]:
         """Refresh page."""
         try:
-            driver = self.browsers[session_name]['driver']
-            driver.refresh()
+            session = self.browsers[session_name]
+            session['element_cache'].clear()
+            await session['page'].reload()
             
             return {'success': True}
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def _get_by_method(self, by: str):
-        """Map by string to Selenium By method."""
-        by_map = {
-            'id': By.ID,
-            'name': By.NAME,
-            'xpath': By.XPATH,
-            'css': By.CSS_SELECTOR,
-            'class': By.CLASS_NAME,
-            'tag': By.TAG_NAME,
-            'link_text': By.LINK_TEXT,
-            'partial_link_text': By.PARTIAL_LINK_TEXT
-        }
-        return by_map.get(by.lower(), By.CSS_SELECTOR)
+    async def _on_element(self, session: Dict[str, Any], target: str, action):
+        """
+        Run an action on an element without waiting, for pages known to be settled.
+        
+        Element handles are cached per session until the page navigates; a
+        cached handle whose element has since been detached is looked up again.
+        
+        Raises:
+            LookupError: If no element matches
+        """
+        cache = session['element_cache']
+        element = cache.get(target)
+        if element is not None:
+            try:
+                return await action(element)
+            except PlaywrightError as e:
+                if 'not attached' not in str(e):
+                    raise
+        
+        element = await session['page'].query_selector(target)
+        if element is None:
+            cache.pop(target, None)
+            raise LookupError(f'Element not found: {target}')
+        
+        cache[target] = element
+        return await action(element)
+    
+    async def _run_script(self, page, script: str, *args) -> Any:
+        """Evaluate a Selenium-style script body in the page."""
+        return await page.evaluate(_SCRIPT_WRAPPER.format(script), list(args))
+    
+    def _to_selector(self, selector: str, by: str) -> str:
+        """Map a selector and its by strategy to a Playwright selector."""
+        return self._BY_MAP.get(by.lower(), 'css={}').format(selector)
+    
+    def cleanup(self):
+        """Cleanup when plugin is unloaded."""
+        # Playwright objects are bound to the loop that created them
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None:
+            self._shutdown_task = loop.create_task(self._shutdown())
+        elif (self._playwright_loop is not None and not self._playwright_loop.is_closed()
+              and not self._playwright_loop.is_running()):
+            self._playwright_loop.run_until_complete(self._shutdown())
+        logger.info("Browser automation plugin cleaned up")
     
     def get_capabilities(self) -> Dict[str, Any]:
         """Get plugin capabilities."""
         return {
             'name': 'browser',
             'version': '1.0.0',
-            'description': 'Browser automation (Selenium)',
-            'actions': [
-                'start', 'stop', 'navigate', 'click', 'type',
-                'submit', 'get_text', 'screenshot', 'execute_js',
-                'wait_for', 'get_cookies', 'set_cookie',
-                'back', 'forward', 'refresh'
-            ],
-            'browsers': ['chrome', 'firefox', 'edge'] if SELENIUM_AVAILABLE else []
+            'description': 'Browser automation (Playwright)',
+            'actions': list(self._actions),
+            'browsers': ['chrome', 'firefox', 'edge'] if PLAYWRIGHT_AVAILABLE else []
         }
 
 
@@ -543,7 +825,7 @@ PLUGIN_INFO = {
     'name': 'browser',
     'version': '1.0.0',
     'class': BrowserAutomationPlugin,
-    'description': 'Web browser automation (Selenium)',
+    'description': 'Web browser automation (Playwright)',
     'author': 'Finder995',
-    'requires': ['selenium']
+    'requires': ['playwright']
 }
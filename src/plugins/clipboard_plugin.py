@@ -4,7 +4,20 @@ Allows the AI agent to read, write, and monitor clipboard content.
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import re
+import select
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 from loguru import logger
 
@@ -15,6 +28,180 @@ except ImportError:
     CLIPBOARD_AVAILABLE = False
     logger.warning("pyperclip not installed. Install with: pip install pyperclip")
 
+# macOS exposes a change counter but no change events
+NSPasteboard = None
+if sys.platform == 'darwin':
+    try:
+        from AppKit import NSPasteboard
+    except ImportError:
+        logger.debug("pyobjc not installed, clipboard polling will read content every tick")
+
+WM_QUIT = 0x0012
+WM_CLIPBOARDUPDATE = 0x031D
+XFIXES_SET_SELECTION_OWNER_NOTIFY_MASK = 1
+
+
+def _get_clipboard_sequence() -> Optional[int]:
+    """
+    Read the OS clipboard change counter, which is far cheaper than
+    fetching the content.
+    
+    Returns:
+        Counter that changes with every copy, or None where there is none
+    """
+    if sys.platform == 'win32':
+        # 0 means no access to the clipboard's window station
+        return ctypes.windll.user32.GetClipboardSequenceNumber() or None
+    if NSPasteboard is not None:
+        return NSPasteboard.generalPasteboard().changeCount()
+    return None
+
+
+def _content_digest(content: str) -> bytes:
+    """Digest to compare clipboard content without keeping a copy of it."""
+    return hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+# Spill files are named by the hex form of _content_digest
+_SPILL_NAME = re.compile(r'[0-9a-f]{32}')
+
+
+def _format_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a history entry with its ts_ns turned into an ISO timestamp."""
+    item = dict(entry)
+    item['timestamp'] = datetime.fromtimestamp(item.pop('ts_ns') / 1e9).isoformat()
+    return item
+
+
+class _ClipboardWatcher:
+    """
+    Background thread that calls notify() whenever the OS reports a
+    clipboard change, so monitoring doesn't have to read it on a timer.
+    
+    Uses AddClipboardFormatListener on Windows and XFixes selection
+    events on X11; start() returns False where neither is available.
+    """
+    
+    def __init__(self, notify: Callable[[], None]):
+        self.notify = notify
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._ok = False
+        self._thread = None
+        self._thread_id = None
+    
+    def start(self, timeout: float = 2.0) -> bool:
+        """Start the listener thread; returns whether it is receiving events."""
+        if sys.platform == 'win32':
+            target = self._run_windows
+        elif sys.platform.startswith('linux') and os.environ.get('DISPLAY'):
+            target = self._run_x11
+        else:
+            return False
+        
+        self._thread = threading.Thread(target=target, name='clipboard-watcher', daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        return self._ok
+    
+    def stop(self):
+        """Ask the listener thread to exit."""
+        self._stop.set()
+        if self._thread_id is not None:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+    
+    def _run_windows(self):
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        user32.CreateWindowExW.restype = wintypes.HWND
+        user32.CreateWindowExW.argtypes = [
+            wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+            ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID
+        ]
+        
+        # Message-only window (parent HWND_MESSAGE) just to receive WM_CLIPBOARDUPDATE
+        hwnd = user32.CreateWindowExW(0, 'STATIC', None, 0, 0, 0, 0, 0,
+                                      wintypes.HWND(-3), None, None, None)
+        if not hwnd or not user32.AddClipboardFormatListener(hwnd):
+            logger.debug("Clipboard format listener unavailable")
+            self._ready.set()
+            return
+        
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+        self._ok = True
+        self._ready.set()
+        
+        msg = wintypes.MSG()
+        try:
+            while not self._stop.is_set() and user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                if msg.message == WM_CLIPBOARDUPDATE:
+                    self.notify()
+        finally:
+            user32.RemoveClipboardFormatListener(hwnd)
+            user32.DestroyWindow(hwnd)
+    
+    def _run_x11(self):
+        x11_path = ctypes.util.find_library('X11')
+        xfixes_path = ctypes.util.find_library('Xfixes')
+        if not x11_path or not xfixes_path:
+            logger.debug("libX11/libXfixes not found for clipboard events")
+            self._ready.set()
+            return
+        
+        xlib = ctypes.CDLL(x11_path)
+        xfixes = ctypes.CDLL(xfixes_path)
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+        xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        xlib.XInternAtom.restype = ctypes.c_ulong
+        xlib.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        xlib.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        xlib.XPending.argtypes = [ctypes.c_void_p]
+        xlib.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xfixes.XFixesQueryExtension.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)
+        ]
+        xfixes.XFixesSelectSelectionInput.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong
+        ]
+        
+        display = xlib.XOpenDisplay(None)
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        if not display or not xfixes.XFixesQueryExtension(
+                display, ctypes.byref(event_base), ctypes.byref(error_base)):
+            logger.debug("XFixes extension unavailable for clipboard events")
+            if display:
+                xlib.XCloseDisplay(display)
+            self._ready.set()
+            return
+        
+        clipboard = xlib.XInternAtom(display, b'CLIPBOARD', 0)
+        xfixes.XFixesSelectSelectionInput(
+            display, xlib.XDefaultRootWindow(display), clipboard,
+            XFIXES_SET_SELECTION_OWNER_NOTIFY_MASK
+        )
+        fd = xlib.XConnectionNumber(display)
+        self._ok = True
+        self._ready.set()
+        
+        # XEvent is a union padded to 24 longs; its first int is the type
+        event = (ctypes.c_long * 24)()
+        selection_notify = event_base.value  # XFixesSelectionNotify == 0
+        try:
+            while not self._stop.is_set():
+                if not xlib.XPending(display):
+                    # Wake up periodically so stop() is honoured
+                    select.select([fd], [], [], 0.5)
+                    continue
+                xlib.XNextEvent(display, event)
+                if ctypes.cast(event, ctypes.POINTER(ctypes.c_int))[0] == selection_notify:
+                    self.notify()
+        finally:
+            xlib.XCloseDisplay(display)
+
 
 class ClipboardPlugin:
     """Plugin for clipboard management and monitoring."""
@@ -22,10 +209,43 @@ class ClipboardPlugin:
     def __init__(self, config):
         """Initialize clipboard plugin."""
         self.config = config
-        self.history = []
         self.max_history = config.get('plugins.clipboard.max_history', 100)
-        self.monitoring = False
-        self.monitor_task = None
+        # Oldest entries fall off on append, without copying the rest
+        self.history = deque(maxlen=self.max_history)
+        
+        # Entries larger than this keep only a preview in memory; the full
+        # content goes to a content-addressed file in spill_dir
+        self.spill_threshold = config.get('plugins.clipboard.spill_threshold', 4096)
+        self.spill_dir = Path(config.get('plugins.clipboard.spill_dir', './data/clipboard'))
+        self.preview_len = 256
+        
+        # Polling backs off from min_interval towards max_interval while idle
+        self.min_interval = config.get('plugins.clipboard.min_interval', 0.1)
+        self.max_interval = config.get('plugins.clipboard.max_interval', 5.0)
+        # The task is the single source of truth for whether monitoring runs;
+        # the lock keeps concurrent start/stop calls from racing on it
+        self.monitor_task: Optional[asyncio.Task] = None
+        self._monitor_stop: Optional[asyncio.Event] = None
+        self._monitor_lock = asyncio.Lock()
+        # History updates await spill-file I/O; the lock keeps a concurrent
+        # eviction from unlinking a file that a pending entry still needs
+        self._history_lock = asyncio.Lock()
+        
+        # pyperclip shells out to xclip/wl-copy or calls the WinAPI, which can
+        # take hundreds of ms; one worker keeps that off the event loop and
+        # serializes access, since those backends misbehave when used concurrently
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='clipboard')
+        
+        # Command name to handler, resolved with one lookup per call
+        self._actions = {
+            'copy': self._copy,
+            'paste': self._paste,
+            'history': self._get_history,
+            'get_full': self._get_full,
+            'clear': self._clear,
+            'monitor_start': self._start_monitoring,
+            'monitor_stop': self._stop_monitoring
+        }
         
         if not CLIPBOARD_AVAILABLE:
             logger.warning("Clipboard plugin initialized but pyperclip is not available")
@@ -38,6 +258,7 @@ class ClipboardPlugin:
         - copy: Copy text to clipboard
         - paste: Get current clipboard content
         - history: Get clipboard history
+        - get_full: Get the full content of a spilled history entry
         - clear: Clear clipboard
         - monitor_start: Start monitoring clipboard changes
         - monitor_stop: Stop monitoring clipboard changes
@@ -50,24 +271,14 @@ class ClipboardPlugin:
             }
         
         try:
-            if command == 'copy':
-                return await self._copy(**kwargs)
-            elif command == 'paste':
-                return await self._paste(**kwargs)
-            elif command == 'history':
-                return await self._get_history(**kwargs)
-            elif command == 'clear':
-                return await self._clear(**kwargs)
-            elif command == 'monitor_start':
-                return await self._start_monitoring(**kwargs)
-            elif command == 'monitor_stop':
-                return await self._stop_monitoring(**kwargs)
-            else:
+            handler = self._actions.get(command)
+            if handler is None:
                 return {
                     'success': False,
                     'error': f'Unknown command: {command}',
                     'available_commands': self.get_capabilities()
                 }
+            return await handler(**kwargs)
         except Exception as e:
             logger.error(f"Clipboard plugin error: {e}")
             return {
@@ -78,8 +289,8 @@ class ClipboardPlugin:
     async def _copy(self, text: str, **kwargs) -> Dict[str, Any]:
         """Copy text to clipboard."""
         try:
-            pyperclip.copy(text)
-            self._add_to_history(text, 'copy')
+            await self._copy_async(text)
+            await self._add_to_history(text, 'copy')
             
             logger.info(f"Copied to clipboard: {text[:50]}...")
             return {
@@ -96,8 +307,8 @@ class ClipboardPlugin:
     async def _paste(self, **kwargs) -> Dict[str, Any]:
         """Get current clipboard content."""
         try:
-            content = pyperclip.paste()
-            self._add_to_history(content, 'paste')
+            content = await self._paste_async()
+            await self._add_to_history(content, 'paste')
             
             logger.info(f"Retrieved from clipboard: {content[:50]}...")
             return {
@@ -113,7 +324,8 @@ class ClipboardPlugin:
     
     async def _get_history(self, limit: int = 10, **kwargs) -> Dict[str, Any]:
         """Get clipboard history."""
-        history_items = self.history[-limit:] if limit > 0 else self.history
+        start = max(0, len(self.history) - limit) if limit > 0 else 0
+        history_items = [_format_entry(entry) for entry in islice(self.history, start, None)]
         
         return {
             'success': True,
@@ -122,11 +334,37 @@ class ClipboardPlugin:
             'returned_items': len(history_items)
         }
     
+    async def _get_full(self, content_hash: str, **kwargs) -> Dict[str, Any]:
+        """Get the full content of a history entry that was spilled to disk."""
+        # Only a bare digest may name a file, never a path out of spill_dir
+        if not isinstance(content_hash, str) or not _SPILL_NAME.fullmatch(content_hash):
+            return {
+                'success': False,
+                'error': f'Invalid content hash: {content_hash!r}'
+            }
+        
+        path = self.spill_dir / content_hash
+        try:
+            content = await asyncio.to_thread(
+                path.read_text, encoding='utf-8', errors='surrogatepass'
+            )
+        except FileNotFoundError:
+            return {
+                'success': False,
+                'error': f'No spilled content for hash: {content_hash}'
+            }
+        
+        return {
+            'success': True,
+            'content': content,
+            'length': len(content)
+        }
+    
     async def _clear(self, **kwargs) -> Dict[str, Any]:
         """Clear clipboard."""
         try:
-            pyperclip.copy('')
-            self._add_to_history('', 'clear')
+            await self._copy_async('')
+            await self._add_to_history('', 'clear')
             
             logger.info("Clipboard cleared")
             return {
@@ -139,38 +377,56 @@ class ClipboardPlugin:
                 'error': f'Failed to clear clipboard: {e}'
             }
     
-    async def _start_monitoring(self, interval: float = 1.0, **kwargs) -> Dict[str, Any]:
-        """Start monitoring clipboard for changes."""
-        if self.monitoring:
-            return {
-                'success': False,
-                'message': 'Monitoring already active'
-            }
+    async def _start_monitoring(self, interval: Optional[float] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Start monitoring clipboard for changes.
         
-        self.monitoring = True
-        self.monitor_task = asyncio.create_task(self._monitor_loop(interval))
+        Args:
+            interval: Fixed polling interval; by default polling adapts
+                between min_interval and max_interval
+        """
+        async with self._monitor_lock:
+            if self.monitoring:
+                return {
+                    'success': False,
+                    'message': 'Monitoring already active'
+                }
+            
+            if interval:
+                min_interval = max_interval = interval
+                schedule = f'every {interval}s'
+            else:
+                min_interval, max_interval = self.min_interval, self.max_interval
+                schedule = f'every {min_interval}-{max_interval}s'
+            
+            self._monitor_stop = asyncio.Event()
+            self.monitor_task = asyncio.create_task(
+                self._monitor_loop(self._monitor_stop, min_interval, max_interval)
+            )
         
-        logger.info(f"Started clipboard monitoring (interval: {interval}s)")
+        logger.info(f"Started clipboard monitoring ({schedule})")
         return {
             'success': True,
-            'message': f'Started monitoring clipboard every {interval}s'
+            'message': f'Started monitoring clipboard {schedule}'
         }
     
     async def _stop_monitoring(self, **kwargs) -> Dict[str, Any]:
         """Stop monitoring clipboard."""
-        if not self.monitoring:
-            return {
-                'success': False,
-                'message': 'Monitoring not active'
-            }
-        
-        self.monitoring = False
-        if self.monitor_task:
-            self.monitor_task.cancel()
+        async with self._monitor_lock:
+            if not self.monitoring:
+                return {
+                    'success': False,
+                    'message': 'Monitoring not active'
+                }
+            
+            task = self.monitor_task
+            self._monitor_stop.set()
+            task.cancel()
             try:
-                await self.monitor_task
+                await task
             except asyncio.CancelledError:
                 pass
+            self.monitor_task = None
         
         logger.info("Stopped clipboard monitoring")
         return {
@@ -178,62 +434,164 @@ class ClipboardPlugin:
             'message': 'Stopped clipboard monitoring'
         }
     
-    async def _monitor_loop(self, interval: float):
-        """Monitor clipboard for changes."""
-        last_content = ""
+    @property
+    def monitoring(self) -> bool:
+        """Whether a monitor task is currently running."""
+        return self.monitor_task is not None and not self.monitor_task.done()
+    
+    async def _monitor_loop(self, stop: asyncio.Event, min_interval: float, max_interval: float):
+        """Monitor clipboard for changes until stop is set."""
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        watcher = _ClipboardWatcher(lambda: loop.call_soon_threadsafe(changed.set))
+        
+        if await asyncio.to_thread(watcher.start):
+            logger.debug("Clipboard monitoring driven by OS change events")
+            try:
+                await self._event_loop(stop, changed)
+            finally:
+                watcher.stop()
+        else:
+            await self._poll_loop(stop, min_interval, max_interval)
+    
+    async def _event_loop(self, stop: asyncio.Event, changed: asyncio.Event):
+        """Read the clipboard only when the OS reports a change."""
+        last_digest = _content_digest("")
         
         try:
-            while self.monitoring:
+            while not stop.is_set():
+                await changed.wait()
+                changed.clear()
+                
                 try:
-                    current_content = pyperclip.paste()
+                    current_content = await self._paste_async()
+                    digest = _content_digest(current_content)
                     
-                    if current_content != last_content and current_content:
+                    if digest != last_digest and current_content:
                         logger.info(f"Clipboard changed: {current_content[:50]}...")
-                        self._add_to_history(current_content, 'detected')
-                        last_content = current_content
-                    
-                    await asyncio.sleep(interval)
+                        await self._add_to_history(current_content, 'detected')
+                        last_digest = digest
                     
                 except Exception as e:
                     logger.error(f"Error in clipboard monitoring: {e}")
-                    await asyncio.sleep(interval)
                     
         except asyncio.CancelledError:
             logger.info("Clipboard monitoring cancelled")
     
-    def _add_to_history(self, content: str, operation: str):
-        """Add item to clipboard history."""
-        entry = {
-            'content': content,
-            'operation': operation,
-            'timestamp': datetime.now().isoformat(),
-            'length': len(content)
-        }
+    async def _poll_loop(self, stop: asyncio.Event, min_interval: float, max_interval: float):
+        """
+        Poll the clipboard where no change events are available.
         
-        self.history.append(entry)
+        The interval resets to min_interval after a change and doubles up
+        to max_interval while the clipboard stays idle.
+        """
+        last_digest = _content_digest("")
+        last_sequence = None
+        interval = min_interval
         
-        # Trim history if it exceeds max size
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
+        try:
+            while not stop.is_set():
+                try:
+                    changed = False
+                    
+                    # Only fetch the content once the change counter moves
+                    sequence = _get_clipboard_sequence()
+                    if sequence is None or sequence != last_sequence:
+                        last_sequence = sequence
+                        current_content = await self._paste_async()
+                        digest = _content_digest(current_content)
+                        
+                        if digest != last_digest and current_content:
+                            logger.info(f"Clipboard changed: {current_content[:50]}...")
+                            await self._add_to_history(current_content, 'detected')
+                            last_digest = digest
+                            changed = True
+                    
+                    interval = min_interval if changed else min(interval * 2, max_interval)
+                    await self._wait_stop(stop, interval)
+                    
+                except Exception as e:
+                    logger.error(f"Error in clipboard monitoring: {e}")
+                    await self._wait_stop(stop, interval)
+                    
+        except asyncio.CancelledError:
+            logger.info("Clipboard monitoring cancelled")
+    
+    @staticmethod
+    async def _wait_stop(stop: asyncio.Event, timeout: float):
+        """Sleep for timeout seconds, waking early once stop is set."""
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def _paste_async(self) -> str:
+        """Read the clipboard on the clipboard worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, pyperclip.paste)
+    
+    async def _copy_async(self, text: str):
+        """Write the clipboard on the clipboard worker thread."""
+        await asyncio.get_running_loop().run_in_executor(self._executor, pyperclip.copy, text)
+    
+    async def _add_to_history(self, content: str, operation: str):
+        """Add item to clipboard history."""
+        async with self._history_lock:
+            if len(content) > self.spill_threshold:
+                identity = ('content_hash', _content_digest(content).hex())
+            else:
+                identity = ('content', content)
+            
+            # Repeats of the last entry only bump its count and timestamp
+            if self.history:
+                last = self.history[-1]
+                if last['operation'] == operation and last.get(identity[0]) == identity[1]:
+                    last['ts_ns'] = time.time_ns()
+                    last['count'] += 1
+                    return
+            
+            entry = {
+                identity[0]: identity[1],
+                'operation': operation,
+                # Formatted to an ISO timestamp only when history is read
+                'ts_ns': time.time_ns(),
+                'length': len(content),
+                'count': 1
+            }
+            if identity[0] == 'content_hash':
+                await asyncio.to_thread(self._spill, identity[1], content)
+                entry['preview'] = content[:self.preview_len]
+                entry['spilled'] = True
+            
+            evicted = self.history[0] if len(self.history) == self.history.maxlen else None
+            self.history.append(entry)
+            
+            # Drop a spill file once no remaining entry refers to it
+            if evicted and evicted.get('spilled'):
+                content_hash = evicted['content_hash']
+                if not any(e.get('content_hash') == content_hash for e in self.history):
+                    await asyncio.to_thread(
+                        (self.spill_dir / content_hash).unlink, missing_ok=True
+                    )
+    
+    def _spill(self, content_hash: str, content: str):
+        """Write large content to its content-addressed spill file (blocking)."""
+        path = self.spill_dir / content_hash
+        if not path.exists():
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding='utf-8', errors='surrogatepass')
     
     def get_capabilities(self) -> List[str]:
         """Return list of available commands."""
-        return [
-            'copy',
-            'paste',
-            'history',
-            'clear',
-            'monitor_start',
-            'monitor_stop'
-        ]
+        return list(self._actions)
     
     def cleanup(self):
         """Cleanup when plugin is unloaded."""
         if self.monitoring:
-            self.monitoring = False
-            if self.monitor_task:
-                self.monitor_task.cancel()
+            self._monitor_stop.set()
+            self.monitor_task.cancel()
+        self.monitor_task = None
         
+        self._executor.shutdown(wait=False)
         logger.info("Clipboard plugin cleaned up")
 
 
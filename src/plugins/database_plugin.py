@@ -11,22 +11,109 @@ Features:
 - Query builder helpers
 """
 
+import re
+import hashlib
 import sqlite3
 import json
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, AsyncIterator
+from itertools import count
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
+from functools import lru_cache
 import asyncio
+import threading
+import time
 
 try:
     import psycopg2
     import psycopg2.pool
+    import psycopg2.extras
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
     logger.warning("psycopg2 not available - PostgreSQL support disabled")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Statements sqlite3 keeps compiled per connection (the default is 128)
+SQLITE_CACHED_STATEMENTS = 256
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize query results to UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NAIVE_UTC)
+    return json.dumps(obj, default=str).encode('utf-8')
+
+
+def _sql_sha256(value: Any) -> Optional[str]:
+    """sha256(x) SQL function: hex digest of a text or blob value."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    elif not isinstance(value, bytes):
+        value = str(value).encode('utf-8')
+    return hashlib.sha256(value).hexdigest()
+
+
+def _sql_regexp(pattern: str, value: Any) -> Optional[bool]:
+    """Backs SQLite's `value REGEXP pattern` operator."""
+    if pattern is None or value is None:
+        return None
+    return _compile_regexp(pattern).search(str(value)) is not None
+
+
+@lru_cache(maxsize=128)
+def _compile_regexp(pattern: str):
+    return re.compile(pattern)
+
+
+# Statements SQLite refuses inside a transaction, or that manage transactions
+# themselves; execute runs these on the connection instead of in a write batch
+_DIRECT_SQL = re.compile(
+    r'\s*(VACUUM|ATTACH|DETACH|BEGIN|COMMIT|END|ROLLBACK|PRAGMA\s+(\w+\s*\.\s*)?journal_mode)\b',
+    re.IGNORECASE
+)
+
+
+# Table and column names are interpolated into SQL, so only plain identifiers pass
+_IDENT = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _check_identifiers(*names: str) -> None:
+    """Raise ValueError for any name that is not a plain SQL identifier."""
+    for name in names:
+        if not isinstance(name, str) or not _IDENT.match(name):
+            raise ValueError(f"Invalid SQL identifier: {name!r}")
+
+
+@lru_cache(maxsize=256)
+def _placeholders(placeholder: str, n: int) -> str:
+    """Comma-separated list of n parameter placeholders."""
+    return ', '.join([placeholder] * n)
+
+
+@lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: tuple, placeholder: str) -> str:
+    """Build an INSERT statement; identical inputs reuse the same text."""
+    _check_identifiers(table, *columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({_placeholders(placeholder, len(columns))})"
+
+
+@lru_cache(maxsize=256)
+def _update_sql(table: str, columns: tuple, placeholder: str, where: str) -> str:
+    """Build an UPDATE statement; identical inputs reuse the same text."""
+    _check_identifiers(table, *columns)
+    set_clause = ', '.join(f"{column} = {placeholder}" for column in columns)
+    return f"UPDATE {table} SET {set_clause} WHERE {where}"
+
 
 class DatabasePlugin:
     """
@@ -51,6 +138,43 @@ class DatabasePlugin:
         self.db_config = config.get('plugins', {}).get('database', {})
         self.connections = {}
         self.postgres_pools = {}
+        self._connect_locks = defaultdict(asyncio.Lock)
+        
+        # Server-side prepared INSERTs for PostgreSQL: (name, PREPARE, EXECUTE)
+        # per (table, columns), and the names already prepared per pooled connection
+        self._pg_statements = {}
+        self._pg_prepared = {}
+        
+        # Unique names for PostgreSQL server-side (streaming) cursors
+        self._pg_cursor_ids = count()
+        
+        # One writer task per SQLite database groups queued writes into a
+        # single transaction instead of contending for the file lock
+        self._write_queues: Dict[str, asyncio.Queue] = {}
+        self._writer_tasks: Dict[str, asyncio.Task] = {}
+        self.write_batch_size = self.db_config.get('sqlite', {}).get('write_batch_size', 100)
+        
+        # SQLite databases with an explicit transaction open; their writes
+        # are only committed by the commit action
+        self._in_txn = set()
+        
+        # Action name to handler, resolved with one lookup per call
+        self._actions = {
+            'connect': self._connect,
+            'disconnect': self._disconnect,
+            'query': self._query,
+            'execute': self._execute,
+            'create_table': self._create_table,
+            'insert': self._insert,
+            'insert_many': self._insert_many,
+            'update': self._update,
+            'delete': self._delete,
+            'backup': self._backup,
+            'list_tables': self._list_tables,
+            'begin': self._begin,
+            'commit': self._commit,
+            'rollback': self._rollback
+        }
         
         logger.info("Database plugin initialized")
     
@@ -68,31 +192,13 @@ class DatabasePlugin:
         action = kwargs.pop('action', 'query')
         
         try:
-            if action == 'connect':
-                return await self._connect(**kwargs)
-            elif action == 'disconnect':
-                return await self._disconnect(**kwargs)
-            elif action == 'query':
-                return await self._query(**kwargs)
-            elif action == 'execute':
-                return await self._execute(**kwargs)
-            elif action == 'create_table':
-                return await self._create_table(**kwargs)
-            elif action == 'insert':
-                return await self._insert(**kwargs)
-            elif action == 'update':
-                return await self._update(**kwargs)
-            elif action == 'delete':
-                return await self._delete(**kwargs)
-            elif action == 'backup':
-                return await self._backup(**kwargs)
-            elif action == 'list_tables':
-                return await self._list_tables(**kwargs)
-            else:
+            handler = self._actions.get(action)
+            if handler is None:
                 return {
                     'success': False,
                     'error': f'Unknown action: {action}'
                 }
+            return await handler(**kwargs)
         except Exception as e:
             logger.error(f"Database operation failed: {e}")
             return {
@@ -109,12 +215,13 @@ class DatabasePlugin:
                 db_path = kwargs.get('path', './data/databases/default.db')
                 Path(db_path).parent.mkdir(parents=True, exist_ok=True)
                 
-                conn = sqlite3.connect(db_path)
-                conn.row_factory = sqlite3.Row
+                conn = await asyncio.to_thread(self._open_sqlite, db_path)
                 self.connections[db_name] = {
                     'type': 'sqlite',
                     'connection': conn,
-                    'path': db_path
+                    'path': db_path,
+                    # Worker threads take turns on the shared connection
+                    'lock': threading.Lock()
                 }
                 
                 logger.info(f"Connected to SQLite database: {db_path}")
@@ -132,7 +239,8 @@ class DatabasePlugin:
                 password = kwargs.get('password', '')
                 database = kwargs.get('dbname', 'postgres')
                 
-                pool = psycopg2.pool.SimpleConnectionPool(
+                pool = await asyncio.to_thread(
+                    psycopg2.pool.ThreadedConnectionPool,
                     minconn=1,
                     maxconn=10,
                     host=host,
@@ -165,10 +273,40 @@ class DatabasePlugin:
                 'error': str(e)
             }
     
+    async def _auto_connect(self, database: str):
+        """Open the default connection for database unless another call already has."""
+        async with self._connect_locks[database]:
+            if database not in self.connections and database not in self.postgres_pools:
+                await self._connect(database=database)
+    
+    def _open_sqlite(self, db_path: str) -> sqlite3.Connection:
+        """Open a SQLite connection usable from worker threads."""
+        conn = sqlite3.connect(db_path, cached_statements=SQLITE_CACHED_STATEMENTS,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        
+        # WAL lets readers run alongside the writer and, with NORMAL
+        # sync, only fsyncs at checkpoints instead of every commit
+        if self.db_config.get('sqlite', {}).get('wal', True):
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA busy_timeout=5000")
+        
+        # Helpers evaluated inside the engine, so queries can filter and
+        # transform rows without pulling them into Python first. JSON
+        # functions (json_extract etc.) are built into SQLite already.
+        conn.create_function("sha256", 1, _sql_sha256, deterministic=True)
+        conn.create_function("regexp", 2, _sql_regexp, deterministic=True)
+        return conn
+    
     async def _disconnect(self, database: str = 'default') -> Dict[str, Any]:
         """Disconnect from database."""
         try:
             if database in self.connections:
+                await self._stop_writer(database)
+                self._in_txn.discard(database)
                 conn_info = self.connections[database]
                 if conn_info['type'] == 'sqlite':
                     conn_info['connection'].close()
@@ -179,6 +317,9 @@ class DatabasePlugin:
             if database in self.postgres_pools:
                 self.postgres_pools[database].closeall()
                 del self.postgres_pools[database]
+                self._pg_prepared = {
+                    key: names for key, names in self._pg_prepared.items() if key[0] != database
+                }
             
             return {'success': True}
         
@@ -186,68 +327,51 @@ class DatabasePlugin:
             logger.error(f"Disconnect failed: {e}")
             return {'success': False, 'error': str(e)}
     
-    async def _query(self, sql: str, database: str = 'default', params: tuple = None) -> Dict[str, Any]:
-        """Execute SELECT query."""
+    async def _query(self, sql: str, database: str = 'default', params: tuple = None,
+                     limit: Optional[int] = None, stream: bool = False,
+                     chunk_size: int = 1000, format: str = 'rows',
+                     as_json: bool = False) -> Dict[str, Any]:
+        """
+        Execute SELECT query.
+        
+        Args:
+            limit: Fetch at most this many rows instead of the whole result
+            stream: Return an async iterator of row chunks under 'stream'
+                instead of materializing every row
+            chunk_size: Rows per chunk when streaming
+            format: 'rows' for a list of dicts, or 'columnar' for
+                {'columns': [...], 'data': [column_values, ...]}
+            as_json: Return the rows (or columns and data) already serialized
+                as JSON bytes under 'json'
+        """
         try:
             # Auto-connect if not connected
             if database not in self.connections and database not in self.postgres_pools:
-                await self._connect(database=database)
+                await self._auto_connect(database)
             
-            if database in self.connections:
-                # SQLite
-                conn = self.connections[database]['connection']
-                cursor = conn.cursor()
-                
-                if params:
-                    cursor.execute(sql, params)
-                else:
-                    cursor.execute(sql)
-                
-                rows = cursor.fetchall()
-                
-                # Convert to list of dicts
-                result = []
-                for row in rows:
-                    result.append(dict(row))
-                
+            if stream:
+                if database not in self.connections and database not in self.postgres_pools:
+                    return {
+                        'success': False,
+                        'error': f'No connection for database: {database}'
+                    }
                 return {
                     'success': True,
-                    'rows': result,
-                    'row_count': len(result)
+                    'stream': self._query_stream(sql, database, params, chunk_size)
                 }
             
-            elif database in self.postgres_pools:
-                # PostgreSQL
-                pool = self.postgres_pools[database]
-                conn = pool.getconn()
-                
-                try:
-                    cursor = conn.cursor()
-                    if params:
-                        cursor.execute(sql, params)
-                    else:
-                        cursor.execute(sql)
-                    
-                    rows = cursor.fetchall()
-                    columns = [desc[0] for desc in cursor.description]
-                    
-                    result = []
-                    for row in rows:
-                        result.append(dict(zip(columns, row)))
-                    
-                    return {
-                        'success': True,
-                        'rows': result,
-                        'row_count': len(result)
-                    }
-                finally:
-                    pool.putconn(conn)
-            
-            else:
+            if database not in self.connections and database not in self.postgres_pools:
                 return {
                     'success': False,
                     'error': f'No connection for database: {database}'
                 }
+            
+            # The drivers block, so keep them off the event loop
+            if as_json:
+                return await asyncio.to_thread(
+                    self._run_query_json, sql, database, params, limit, format
+                )
+            return await asyncio.to_thread(self._run_query, sql, database, params, limit, format)
         
         except Exception as e:
             logger.error(f"Query failed: {e}")
@@ -256,56 +380,167 @@ class DatabasePlugin:
                 'error': str(e)
             }
     
-    async def _execute(self, sql: str, database: str = 'default', params: tuple = None) -> Dict[str, Any]:
-        """Execute INSERT/UPDATE/DELETE query."""
-        try:
-            if database not in self.connections and database not in self.postgres_pools:
-                await self._connect(database=database)
-            
-            if database in self.connections:
-                # SQLite
-                conn = self.connections[database]['connection']
-                cursor = conn.cursor()
+    def _run_query(self, sql: str, database: str, params: Optional[tuple],
+                   limit: Optional[int], format: str) -> Dict[str, Any]:
+        """Blocking part of _query, run in a worker thread."""
+        if database in self.connections:
+            # SQLite
+            conn_info = self.connections[database]
+            with conn_info['lock']:
+                cursor = conn_info['connection'].cursor()
                 
                 if params:
                     cursor.execute(sql, params)
                 else:
                     cursor.execute(sql)
                 
-                conn.commit()
-                
-                return {
-                    'success': True,
-                    'affected_rows': cursor.rowcount,
-                    'last_id': cursor.lastrowid
-                }
+                rows = cursor.fetchmany(limit) if limit else cursor.fetchall()
             
-            elif database in self.postgres_pools:
-                # PostgreSQL
-                pool = self.postgres_pools[database]
-                conn = pool.getconn()
-                
-                try:
-                    cursor = conn.cursor()
-                    if params:
-                        cursor.execute(sql, params)
-                    else:
-                        cursor.execute(sql)
-                    
-                    conn.commit()
-                    
-                    return {
-                        'success': True,
-                        'affected_rows': cursor.rowcount
-                    }
-                finally:
-                    pool.putconn(conn)
+            if format == 'columnar':
+                columns = [desc[0] for desc in cursor.description]
+                return self._columnar_result(columns, rows)
             
+            # Convert to list of dicts
+            result = []
+            for row in rows:
+                result.append(dict(row))
+            
+            return {
+                'success': True,
+                'rows': result,
+                'row_count': len(result)
+            }
+        
+        # PostgreSQL
+        pool = self.postgres_pools[database]
+        conn = pool.getconn()
+        
+        try:
+            cursor = conn.cursor()
+            if params:
+                cursor.execute(sql, params)
             else:
+                cursor.execute(sql)
+            
+            rows = cursor.fetchmany(limit) if limit else cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description]
+            
+            if format == 'columnar':
+                return self._columnar_result(columns, rows)
+            
+            result = []
+            for row in rows:
+                result.append(dict(zip(columns, row)))
+            
+            return {
+                'success': True,
+                'rows': result,
+                'row_count': len(result)
+            }
+        finally:
+            pool.putconn(conn)
+    
+    def _run_query_json(self, sql: str, database: str, params: Optional[tuple],
+                        limit: Optional[int], format: str) -> Dict[str, Any]:
+        """_run_query with the payload serialized in the same worker thread."""
+        result = self._run_query(sql, database, params, limit, format)
+        if format == 'columnar':
+            payload = {'columns': result.pop('columns'), 'data': result.pop('data')}
+        else:
+            payload = result.pop('rows')
+        result['json'] = _dumps(payload)
+        return result
+    
+    @staticmethod
+    def _columnar_result(columns: List[str], rows: List[Any]) -> Dict[str, Any]:
+        """Transpose fetched rows into one list per column."""
+        data = [list(values) for values in zip(*rows)] if rows else [[] for _ in columns]
+        return {
+            'success': True,
+            'columns': columns,
+            'data': data,
+            'row_count': len(rows)
+        }
+    
+    async def _query_stream(self, sql: str, database: str = 'default', params: tuple = None,
+                            chunk_size: int = 1000) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream a SELECT result in chunks of row dicts, holding only one
+        chunk in memory at a time.
+        
+        Yields:
+            Lists of up to chunk_size rows
+        """
+        if database in self.connections:
+            # SQLite
+            conn_info = self.connections[database]
+            
+            def fetch(cursor=None):
+                with conn_info['lock']:
+                    if cursor is None:
+                        cursor = conn_info['connection'].execute(sql, params or ())
+                    return cursor, cursor.fetchmany(chunk_size)
+            
+            cursor, rows = await asyncio.to_thread(fetch)
+            try:
+                while rows:
+                    yield [dict(row) for row in rows]
+                    cursor, rows = await asyncio.to_thread(fetch, cursor)
+            finally:
+                cursor.close()
+        
+        elif database in self.postgres_pools:
+            # PostgreSQL; a named cursor keeps the result on the server
+            pool = self.postgres_pools[database]
+            conn = await asyncio.to_thread(pool.getconn)
+            
+            try:
+                cursor = conn.cursor(name=f"cosik_stream_{next(self._pg_cursor_ids)}")
+                cursor.itersize = chunk_size
+                await asyncio.to_thread(cursor.execute, sql, params)
+                
+                columns = None
+                while True:
+                    rows = await asyncio.to_thread(cursor.fetchmany, chunk_size)
+                    if not rows:
+                        break
+                    if columns is None:
+                        columns = [desc[0] for desc in cursor.description]
+                    yield [dict(zip(columns, row)) for row in rows]
+                
+                cursor.close()
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                pool.putconn(conn)
+    
+    async def _execute(self, sql: str, database: str = 'default', params: tuple = None,
+                       prepare: Optional[tuple] = None) -> Dict[str, Any]:
+        """
+        Execute INSERT/UPDATE/DELETE query.
+        
+        Args:
+            prepare: PostgreSQL only, (name, PREPARE statement) that must have
+                run on the connection before sql EXECUTEs it
+        """
+        try:
+            if database not in self.connections and database not in self.postgres_pools:
+                await self._auto_connect(database)
+            
+            if database not in self.connections and database not in self.postgres_pools:
                 return {
                     'success': False,
                     'error': f'No connection for database: {database}'
                 }
+            
+            if database in self.connections:
+                if _DIRECT_SQL.match(sql):
+                    return await self._execute_direct(database, sql, params)
+                return await self._write(database, sql, params)
+            
+            return await asyncio.to_thread(self._run_execute, sql, database, params, prepare)
         
         except Exception as e:
             logger.error(f"Execute failed: {e}")
@@ -314,10 +549,238 @@ class DatabasePlugin:
                 'error': str(e)
             }
     
+    async def _execute_direct(self, database: str, sql: str,
+                              params: Optional[tuple]) -> Dict[str, Any]:
+        """
+        Run a SQLite statement outside the batched writer.
+        
+        Queued writes are committed first. An explicit BEGIN, COMMIT or
+        ROLLBACK opens or ends a transaction that later writes join, as
+        with the begin/commit/rollback actions.
+        """
+        await self._flush_writes(database)
+        conn_info = self.connections[database]
+        
+        def run():
+            with conn_info['lock']:
+                conn = conn_info['connection']
+                cursor = conn.execute(sql, params or ())
+                return {
+                    'success': True,
+                    'affected_rows': cursor.rowcount,
+                    'last_id': cursor.lastrowid
+                }, conn.in_transaction
+        
+        result, in_transaction = await asyncio.to_thread(run)
+        if in_transaction:
+            self._in_txn.add(database)
+        else:
+            self._in_txn.discard(database)
+        return result
+    
+    def _run_execute(self, sql: str, database: str, params: Optional[tuple],
+                     prepare: Optional[tuple]) -> Dict[str, Any]:
+        """Blocking part of _execute for PostgreSQL, run in a worker thread."""
+        pool = self.postgres_pools[database]
+        conn = pool.getconn()
+        
+        try:
+            cursor = conn.cursor()
+            
+            if prepare:
+                # Prepared statements live as long as the pooled connection
+                prepared = self._pg_prepared.setdefault((database, id(conn)), set())
+                name, prepare_sql = prepare
+                if name not in prepared:
+                    cursor.execute(prepare_sql)
+                    prepared.add(name)
+            
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            
+            conn.commit()
+            
+            return {
+                'success': True,
+                'affected_rows': cursor.rowcount
+            }
+        finally:
+            pool.putconn(conn)
+    
+    async def _write(self, database: str, sql: str, params: Optional[tuple]) -> Dict[str, Any]:
+        """
+        Queue a SQLite write for the database's writer task.
+        
+        Returns:
+            Execute result, once the write is committed
+        """
+        queue = self._write_queues.get(database)
+        task = self._writer_tasks.get(database)
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            queue = self._write_queues[database] = asyncio.Queue(maxsize=1000)
+            self._writer_tasks[database] = loop.create_task(self._writer_loop(database, queue))
+        
+        future = loop.create_future()
+        await queue.put((sql, params, future))
+        return await future
+    
+    async def _writer_loop(self, database: str, queue: asyncio.Queue):
+        """Writer loop: commit all queued writes in a single transaction."""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.write_batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            try:
+                results = await asyncio.to_thread(
+                    self._write_batch, database, [(sql, params) for sql, params, _ in batch]
+                )
+                for (_, _, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            except Exception as e:
+                logger.error(f"Error writing batch: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    def _write_batch(self, database: str, writes: List[tuple]) -> List[Any]:
+        """
+        Execute (sql, params) writes in one transaction.
+        
+        Each write runs under its own savepoint, so a failing statement is
+        rolled back and reported on its own without aborting the batch.
+        Inside an explicit transaction the batch is left uncommitted.
+        
+        Returns:
+            Execute result or exception per write
+        """
+        conn_info = self.connections[database]
+        results = []
+        with conn_info['lock']:
+            conn = conn_info['connection']
+            cursor = conn.cursor()
+            if not conn.in_transaction:
+                cursor.execute('BEGIN')
+            try:
+                for sql, params in writes:
+                    cursor.execute('SAVEPOINT cosik_write')
+                    try:
+                        cursor.execute(sql, params or ())
+                    except Exception as e:
+                        cursor.execute('ROLLBACK TO cosik_write')
+                        results.append(e)
+                    else:
+                        results.append({
+                            'success': True,
+                            'affected_rows': cursor.rowcount,
+                            'last_id': cursor.lastrowid
+                        })
+                    cursor.execute('RELEASE cosik_write')
+                if database not in self._in_txn:
+                    conn.commit()
+            except Exception:
+                if database not in self._in_txn:
+                    conn.rollback()
+                raise
+        return results
+    
+    async def _stop_writer(self, database: str):
+        """Flush pending writes for database and stop its writer task."""
+        task = self._writer_tasks.pop(database, None)
+        queue = self._write_queues.pop(database, None)
+        if task is None:
+            return
+        if task.get_loop() is asyncio.get_running_loop():
+            await queue.join()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    async def _begin(self, database: str = 'default') -> Dict[str, Any]:
+        """
+        Open an explicit transaction on a SQLite database.
+        
+        Writes from every caller on this database join the transaction
+        until the commit or rollback action, so a burst of writes costs
+        a single commit.
+        """
+        if database not in self.connections:
+            return {
+                'success': False,
+                'error': 'Explicit transactions are only supported for SQLite'
+            }
+        if database in self._in_txn:
+            return {'success': False, 'error': f'Transaction already open on: {database}'}
+        
+        await self._flush_writes(database)
+        conn_info = self.connections[database]
+        
+        def begin():
+            with conn_info['lock']:
+                conn = conn_info['connection']
+                if conn.in_transaction:
+                    conn.commit()
+                conn.execute('BEGIN IMMEDIATE')
+        
+        await asyncio.to_thread(begin)
+        self._in_txn.add(database)
+        return {'success': True, 'database': database}
+    
+    async def _commit(self, database: str = 'default') -> Dict[str, Any]:
+        """Commit the explicit transaction opened by begin."""
+        return await self._end_transaction(database, 'commit')
+    
+    async def _rollback(self, database: str = 'default') -> Dict[str, Any]:
+        """Roll back the explicit transaction opened by begin."""
+        return await self._end_transaction(database, 'rollback')
+    
+    async def _end_transaction(self, database: str, how: str) -> Dict[str, Any]:
+        """Flush queued writes, then commit or roll back the open transaction."""
+        if database not in self._in_txn:
+            return {'success': False, 'error': f'No transaction open on: {database}'}
+        
+        await self._flush_writes(database)
+        conn_info = self.connections[database]
+        
+        def end():
+            with conn_info['lock']:
+                getattr(conn_info['connection'], how)()
+        
+        try:
+            await asyncio.to_thread(end)
+        finally:
+            self._in_txn.discard(database)
+        return {'success': True, 'database': database}
+    
+    async def _flush_writes(self, database: str):
+        """Wait until every write queued for database has run."""
+        queue = self._write_queues.get(database)
+        task = self._writer_tasks.get(database)
+        if queue is not None and task is not None and task.get_loop() is asyncio.get_running_loop():
+            await queue.join()
+    
     async def _create_table(self, table_name: str, schema: Dict[str, str], 
                            database: str = 'default') -> Dict[str, Any]:
         """Create table with schema."""
         try:
+            _check_identifiers(table_name, *schema.keys())
+            
             # Build CREATE TABLE statement
             columns = []
             for col_name, col_type in schema.items():
@@ -343,12 +806,19 @@ class DatabasePlugin:
                      database: str = 'default') -> Dict[str, Any]:
         """Insert data into table."""
         try:
-            columns = ', '.join(data.keys())
-            placeholders = ', '.join(['?' if database in self.connections else '%s'] * len(data))
+            columns = tuple(data.keys())
             values = tuple(data.values())
             
-            sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+            if database in self.postgres_pools:
+                # Parsed and planned once per connection, then only EXECUTEd
+                statements = self._pg_statements.get((table, columns))
+                if statements is None:
+                    statements = self._pg_insert_statements(table, columns)
+                name, prepare_sql, sql = statements
+                return await self._execute(sql, database=database, params=values,
+                                           prepare=(name, prepare_sql))
             
+            sql = _insert_sql(table, columns, '?')
             return await self._execute(sql, database=database, params=values)
         
         except Exception as e:
@@ -358,18 +828,113 @@ class DatabasePlugin:
                 'error': str(e)
             }
     
+    def _pg_insert_statements(self, table: str, columns: tuple) -> tuple:
+        """Build and remember the PREPARE/EXECUTE pair for a PostgreSQL INSERT shape."""
+        _check_identifiers(table, *columns)
+        name = f"cosik_insert_{len(self._pg_statements)}"
+        placeholders = ', '.join(f'${i}' for i in range(1, len(columns) + 1))
+        prepare_sql = (f"PREPARE {name} AS INSERT INTO {table} "
+                       f"({', '.join(columns)}) VALUES ({placeholders})")
+        sql = f"EXECUTE {name} ({_placeholders('%s', len(columns))})"
+        statements = self._pg_statements[(table, columns)] = (name, prepare_sql, sql)
+        return statements
+    
+    async def _insert_many(self, table: str, rows: List[Dict[str, Any]],
+                           database: str = 'default') -> Dict[str, Any]:
+        """
+        Insert many rows with one batched statement and a single commit.
+        
+        Args:
+            table: Target table
+            rows: Rows as dicts, all with the same columns
+            database: Database name
+            
+        Returns:
+            Operation result with the number of inserted rows
+        """
+        try:
+            if not rows:
+                return {'success': True, 'affected_rows': 0}
+            
+            columns = tuple(rows[0].keys())
+            if any(row.keys() != rows[0].keys() for row in rows):
+                return {
+                    'success': False,
+                    'error': 'All rows must have the same columns'
+                }
+            _check_identifiers(table, *columns)
+            values = [tuple(row[column] for column in columns) for row in rows]
+            
+            if database not in self.connections and database not in self.postgres_pools:
+                await self._auto_connect(database)
+            
+            if database not in self.connections and database not in self.postgres_pools:
+                return {
+                    'success': False,
+                    'error': f'No connection for database: {database}'
+                }
+            
+            return await asyncio.to_thread(self._run_insert_many, table, columns, values, database)
+        
+        except Exception as e:
+            logger.error(f"Insert many failed: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _run_insert_many(self, table: str, columns: tuple, values: List[tuple],
+                         database: str) -> Dict[str, Any]:
+        """Blocking part of _insert_many, run in a worker thread."""
+        if database in self.connections:
+            # SQLite; the context manager commits once, or rolls back on error
+            conn_info = self.connections[database]
+            with conn_info['lock']:
+                conn = conn_info['connection']
+                sql = _insert_sql(table, columns, '?')
+                if database in self._in_txn:
+                    cursor = conn.executemany(sql, values)
+                else:
+                    with conn:
+                        cursor = conn.executemany(sql, values)
+            
+            return {
+                'success': True,
+                'affected_rows': cursor.rowcount
+            }
+        
+        # PostgreSQL; execute_values sends rows as multi-row VALUES pages
+        pool = self.postgres_pools[database]
+        conn = pool.getconn()
+        
+        try:
+            cursor = conn.cursor()
+            psycopg2.extras.execute_values(
+                cursor,
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s",
+                values,
+                page_size=1000
+            )
+            conn.commit()
+            
+            return {
+                'success': True,
+                'affected_rows': len(values)
+            }
+        finally:
+            pool.putconn(conn)
+    
     async def _update(self, table: str, data: Dict[str, Any], where: str,
                      database: str = 'default', params: tuple = None) -> Dict[str, Any]:
         """Update table data."""
         try:
             placeholder = '?' if database in self.connections else '%s'
-            set_clause = ', '.join([f"{k} = {placeholder}" for k in data.keys()])
             values = tuple(data.values())
             
             if params:
                 values = values + params
             
-            sql = f"UPDATE {table} SET {set_clause} WHERE {where}"
+            sql = _update_sql(table, tuple(data.keys()), placeholder, where)
             
             return await self._execute(sql, database=database, params=values)
         
@@ -384,6 +949,7 @@ class DatabasePlugin:
                      params: tuple = None) -> Dict[str, Any]:
         """Delete from table."""
         try:
+            _check_identifiers(table)
             sql = f"DELETE FROM {table} WHERE {where}"
             return await self._execute(sql, database=database, params=params)
         
@@ -395,8 +961,14 @@ class DatabasePlugin:
             }
     
     async def _backup(self, database: str = 'default', 
-                     backup_path: Optional[str] = None) -> Dict[str, Any]:
-        """Backup database."""
+                     backup_path: Optional[str] = None, pages: int = 256) -> Dict[str, Any]:
+        """
+        Backup database.
+        
+        Args:
+            pages: Pages copied per step; SQLite releases its locks between
+                steps so other connections can keep writing
+        """
         try:
             if database not in self.connections:
                 return {
@@ -411,25 +983,28 @@ class DatabasePlugin:
                     'error': 'Only SQLite databases can be backed up'
                 }
             
+            if database in self._in_txn:
+                return {
+                    'success': False,
+                    'error': f'Cannot back up while a transaction is open on: {database}'
+                }
+            
             if not backup_path:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 backup_path = f"./data/backups/db_{database}_{timestamp}.db"
             
             Path(backup_path).parent.mkdir(parents=True, exist_ok=True)
             
-            # Create backup
-            source_conn = conn_info['connection']
-            backup_conn = sqlite3.connect(backup_path)
-            
-            with backup_conn:
-                source_conn.backup(backup_conn)
-            
-            backup_conn.close()
+            # Copying a large database takes a while, so do it off the event loop
+            total_pages = await asyncio.to_thread(
+                self._run_backup, conn_info, backup_path, pages
+            )
             
             logger.info(f"Database backed up to: {backup_path}")
             return {
                 'success': True,
-                'backup_path': backup_path
+                'backup_path': backup_path,
+                'pages': total_pages
             }
         
         except Exception as e:
@@ -439,6 +1014,34 @@ class DatabasePlugin:
                 'error': str(e)
             }
     
+    @staticmethod
+    def _run_backup(conn_info: Dict[str, Any], backup_path: str, pages: int) -> int:
+        """
+        Copy the connection into backup_path step by step, returning the page count.
+        
+        Each step runs under the connection lock, so it never copies a write
+        batch's uncommitted transaction; the lock is released between steps
+        so queued writes can run.
+        """
+        lock = conn_info['lock']
+        progress = {'total': 0}
+        
+        def report(status, remaining, total):
+            progress['total'] = total
+            logger.debug(f"Backup progress: {total - remaining}/{total} pages")
+            lock.release()
+            time.sleep(0)
+            lock.acquire()
+        
+        backup_conn = sqlite3.connect(backup_path)
+        try:
+            with backup_conn, lock:
+                conn_info['connection'].backup(backup_conn, pages=pages, progress=report)
+        finally:
+            backup_conn.close()
+        
+        return progress['total']
+    
     async def _list_tables(self, database: str = 'default') -> Dict[str, Any]:
         """List all tables in database."""
         try:
@@ -483,11 +1086,7 @@ class DatabasePlugin:
             'name': 'database',
             'version': '1.0.0',
             'description': 'Database operations (SQLite, PostgreSQL)',
-            'actions': [
-                'connect', 'disconnect', 'query', 'execute',
-                'create_table', 'insert', 'update', 'delete',
-                'backup', 'list_tables'
-            ],
+            'actions': list(self._actions),
             'supported_databases': ['sqlite', 'postgres'] if POSTGRES_AVAILABLE else ['sqlite']
         }
 
@@ -11,20 +11,122 @@ Features:
 - Email automation workflows
 """
 
+import asyncio
+import atexit
+import base64
+import os
+import select
 import smtplib
+import threading
+import time
 import imaplib
 import poplib
+import mimetypes
 import email
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+import email.policy
+from email.message import EmailMessage, MIMEPart
 from typing import Dict, List, Optional, Any, Union
-from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
 from loguru import logger
 import re
 
+try:
+    import jinja2
+    JINJA_AVAILABLE = True
+    # Shared environment; templates are compiled once in create_template and
+    # the resulting Template objects are reused for every render
+    _JINJA_ENV = jinja2.Environment(auto_reload=False, cache_size=400)
+except ImportError:
+    JINJA_AVAILABLE = False
+    _JINJA_ENV = None
+
+try:
+    import aiosmtplib
+    AIOSMTPLIB_AVAILABLE = True
+except ImportError:
+    AIOSMTPLIB_AVAILABLE = False
+
+# Attachment read size while encoding: 1024 base64 lines of 57 raw bytes each
+ATTACHMENT_CHUNK_SIZE = 57 * 1024
+
+# Body parts are encoded to 7-bit (quoted-printable/base64 for non-ASCII
+# text), which every SMTP server accepts without the 8BITMIME extension
+_BODY_POLICY = email.policy.default.clone(cte_type='7bit')
+
+# RFC 2177: servers may drop an IDLE after 30 minutes, so it is renewed before
+IDLE_RENEW_SECONDS = 29 * 60
+IDLE_RETRY_SECONDS = 30
+
+_IDLE_UPDATE_RE = re.compile(rb'^\* (\d+) (EXISTS|EXPUNGE)')
+
+# Content-Disposition of an attachment as it appears inside a BODYSTRUCTURE
+_ATTACHMENT_DISPOSITION_RE = re.compile(rb'\("attachment"', re.IGNORECASE)
+
+# IMAP SEARCH keys accepted in structured queries
+_SEARCH_KEYS = {'SUBJECT', 'FROM', 'TO', 'CC', 'BCC', 'BODY', 'TEXT', 'SINCE', 'BEFORE', 'ON'}
+_SEARCH_FLAGS = {'SEEN', 'UNSEEN', 'FLAGGED', 'UNFLAGGED', 'ANSWERED', 'UNANSWERED'}
+
+# Printable ASCII without quotes or backslashes, so a value cannot end its
+# quoted string and inject further search terms
+_SEARCH_VALUE_RE = re.compile(r'[ !#-\[\]-~]*')
+
+_UID_RE = re.compile(rb'\bUID (\d+)')
+
+
+def _as_list(addresses: Optional[Union[str, List[str]]]) -> List[str]:
+    """Normalize a to/cc/bcc argument (None, one address or a list) to a list."""
+    if addresses is None:
+        return []
+    if isinstance(addresses, str):
+        return [addresses]
+    return list(addresses)
+
+
+def _tail_ids(raw: bytes, limit: int) -> List[bytes]:
+    """
+    Return the last limit ids of a space-separated SEARCH response.
+    
+    Scans from the right, so a large mailbox does not allocate an object
+    per message just to keep the newest few. limit <= 0 returns every id.
+    """
+    if limit <= 0:
+        return raw.split()
+    
+    ids = []
+    end = len(raw)
+    while end > 0 and len(ids) < limit:
+        start = raw.rfind(b' ', 0, end)
+        if start + 1 < end:
+            ids.append(raw[start + 1:end])
+        end = start
+    ids.reverse()
+    return ids
+
+
+class _IdleIMAP4_SSL(imaplib.IMAP4_SSL):
+    """
+    IMAP4_SSL connection for IDLE watchers.
+    
+    imaplib reads responses through a buffered file, which can hold further
+    lines that select() on the socket never reports. Reading unbuffered
+    leaves only the TLS layer's buffer, which sock.pending() exposes. IDLE
+    traffic is a handful of short lines, so the per-byte reads cost little.
+    """
+    
+    def open(self, *args, **kwargs):
+        super().open(*args, **kwargs)
+        self.file = self.sock.makefile('rb', buffering=0)
+    
+    def read(self, size):
+        # A raw read may return short; literals must arrive whole
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.file.read(size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return bytes(data)
+
 
 class EmailPlugin:
     """
@@ -51,8 +153,15 @@ class EmailPlugin:
         # Email accounts
         self.accounts = {}
         
-        # Email templates
+        # IMAP IDLE watchers by account name
+        self._idle = {}
+        
+        # Email templates, and compiled Jinja templates by name
         self.templates = {}
+        self._compiled_templates = {}
+        
+        # Cached SMTP/IMAP sessions are logged out at interpreter exit
+        atexit.register(self._close_sessions)
         
         logger.info("Email plugin initialized")
     
@@ -74,6 +183,8 @@ class EmailPlugin:
                 return await self._send_email(**kwargs)
             elif action == 'receive':
                 return await self._receive_emails(**kwargs)
+            elif action == 'receive_multi':
+                return await self._receive_emails_multi(**kwargs)
             elif action == 'search':
                 return await self._search_emails(**kwargs)
             elif action == 'delete':
@@ -86,6 +197,12 @@ class EmailPlugin:
                 return await self._create_template(**kwargs)
             elif action == 'send_bulk':
                 return await self._send_bulk(**kwargs)
+            elif action == 'idle_start':
+                return await self._idle_start(**kwargs)
+            elif action == 'idle_stop':
+                return await self._idle_stop(**kwargs)
+            elif action == 'wait_new':
+                return await self._wait_new(**kwargs)
             else:
                 return {
                     'success': False,
@@ -111,7 +228,13 @@ class EmailPlugin:
                 'imap_port': imap_port or 993,
                 'username': username,
                 'password': password,
-                'use_tls': use_tls
+                'use_tls': use_tls,
+                # Guard the cached SMTP sessions kept under '_smtp' (smtplib,
+                # used from worker threads) and '_asmtp' (aiosmtplib)
+                '_smtp_lock': threading.Lock(),
+                '_asmtp_lock': asyncio.Lock(),
+                # Guards the cached IMAP connection kept under '_imap'
+                '_imap_lock': threading.Lock()
             }
             
             logger.info(f"Email account added: {name}")
@@ -151,67 +274,23 @@ class EmailPlugin:
                 }
             
             acc = self.accounts[account]
+            body = self._render_body(body, template, template_vars)
             
-            # Use template if provided
-            if template and template in self.templates:
-                body = self.templates[template]
-                if template_vars:
-                    body = body.format(**template_vars)
-            
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = acc['username']
-            msg['Subject'] = subject
-            
-            # Handle recipients
-            if isinstance(to, str):
-                to = [to]
-            msg['To'] = ', '.join(to)
-            
-            if cc:
-                if isinstance(cc, str):
-                    cc = [cc]
-                msg['Cc'] = ', '.join(cc)
-            
-            # Attach body
-            if html:
-                msg.attach(MIMEText(body, 'html'))
-            else:
-                msg.attach(MIMEText(body, 'plain'))
-            
-            # Attach files
-            if attachments:
-                for file_path in attachments:
-                    if not Path(file_path).exists():
-                        logger.warning(f"Attachment not found: {file_path}")
-                        continue
-                    
-                    with open(file_path, 'rb') as f:
-                        part = MIMEBase('application', 'octet-stream')
-                        part.set_payload(f.read())
-                    
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename= {Path(file_path).name}'
-                    )
-                    msg.attach(part)
+            to_list = _as_list(to)
+            cc_list = _as_list(cc)
+            bcc_list = _as_list(bcc)
+            
+            parts = self._build_parts(body, attachments, html)
+            msg = self._build_message(acc, to_list, subject, parts, cc_list)
             
             # Send email
-            recipients = to.copy()
-            if cc:
-                recipients.extend(cc)
-            if bcc:
-                if isinstance(bcc, str):
-                    bcc = [bcc]
-                recipients.extend(bcc)
-            
-            with smtplib.SMTP(acc['smtp_server'], acc['smtp_port']) as server:
-                if acc['use_tls']:
-                    server.starttls()
-                
-                server.login(acc['username'], acc['password'])
-                server.send_message(msg, acc['username'], recipients)
+            recipients = to_list + cc_list + bcc_list
+            
+            if AIOSMTPLIB_AVAILABLE:
+                await self._send_async(acc, msg, recipients)
+            else:
+                # smtplib blocks for the whole exchange
+                await asyncio.to_thread(self._send_once, acc, msg, recipients)
             
             logger.info(f"Email sent to {len(recipients)} recipients")
             return {
@@ -227,9 +306,162 @@ class EmailPlugin:
                 'error': str(e)
             }
     
+    def _render_body(self, body: str, template: Optional[str],
+                     template_vars: Optional[Dict[str, Any]]) -> str:
+        """Return the template text with template_vars applied, or body when no template is used."""
+        if template and template in self.templates:
+            compiled = self._compiled_templates.get(template)
+            if compiled is not None:
+                return compiled.render(**(template_vars or {}))
+            body = self.templates[template]
+            if template_vars:
+                body = body.format(**template_vars)
+        return body
+    
+    def _build_parts(self, body: str, attachments: Optional[List[str]] = None,
+                     html: bool = False) -> List[MIMEPart]:
+        """Encode the body and attachment parts of a message."""
+        # Attach body; set_content picks the charset and transfer encoding
+        text = MIMEPart(policy=_BODY_POLICY)
+        text.set_content(body, subtype='html' if html else 'plain')
+        parts = [text]
+        
+        # Attach files
+        if attachments:
+            found = [file_path for file_path in attachments if os.path.isfile(file_path)]
+            if len(found) < len(attachments):
+                missing = [file_path for file_path in attachments if file_path not in found]
+                logger.warning(f"Attachments not found: {', '.join(map(str, missing))}")
+            
+            for file_path in found:
+                # The payload is already base64 text from _encode_file, so the
+                # headers are set directly rather than through set_content,
+                # which would read and encode the whole file in one piece
+                content_type, _ = mimetypes.guess_type(file_path)
+                part = MIMEPart()
+                part['Content-Type'] = content_type or 'application/octet-stream'
+                part.add_header(
+                    'Content-Disposition', 'attachment',
+                    filename=os.path.basename(file_path)
+                )
+                part['Content-Transfer-Encoding'] = 'base64'
+                part.set_payload(self._encode_file(file_path))
+                parts.append(part)
+        
+        return parts
+    
+    @staticmethod
+    def _encode_file(file_path: str) -> str:
+        """
+        Base64-encode a file chunk by chunk.
+        
+        Chunks are a multiple of 57 bytes, one full 76-character base64
+        line, so the pieces join into the same text as encoding the whole
+        file, without holding the raw bytes in memory at once.
+        """
+        chunks = []
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(ATTACHMENT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(base64.encodebytes(chunk).decode('ascii'))
+        return ''.join(chunks)
+    
+    def _build_message(self, acc: Dict[str, Any], to: List[str], subject: str,
+                       parts: List[MIMEPart],
+                       cc: Optional[List[str]] = None) -> EmailMessage:
+        """
+        Wrap encoded parts in a message with its own headers.
+        
+        Parts are attached by reference, so messages for several recipients
+        can share the same (already encoded) body and attachments.
+        """
+        msg = EmailMessage()
+        msg['From'] = acc['username']
+        msg['Subject'] = subject
+        msg['To'] = ', '.join(to)
+        
+        if cc:
+            msg['Cc'] = ', '.join(cc)
+        
+        msg.make_mixed()
+        for part in parts:
+            msg.attach(part)
+        
+        return msg
+    
+    async def _send_async(self, acc: Dict[str, Any], msg: EmailMessage, recipients: List[str]):
+        """Send one message over the account's cached aiosmtplib session."""
+        async with acc['_asmtp_lock']:
+            smtp = acc.get('_asmtp')
+            if smtp is not None:
+                try:
+                    await smtp.noop()
+                except (aiosmtplib.SMTPException, OSError):
+                    smtp.close()
+                    smtp = None
+            
+            if smtp is None:
+                smtp = aiosmtplib.SMTP(
+                    hostname=acc['smtp_server'],
+                    port=acc['smtp_port'],
+                    start_tls=acc['use_tls']
+                )
+                await smtp.connect()
+                await smtp.login(acc['username'], acc['password'])
+                acc['_asmtp'] = smtp
+            
+            await smtp.send_message(msg, sender=acc['username'], recipients=recipients)
+    
+    def _send_once(self, acc: Dict[str, Any], msg: EmailMessage, recipients: List[str]):
+        """Send one message over the account's cached SMTP session."""
+        with acc['_smtp_lock']:
+            server = self._get_smtp(acc)
+            acc['_smtp'] = self._send_on(acc, server, msg, recipients)
+    
+    def _get_smtp(self, acc: Dict[str, Any]) -> smtplib.SMTP:
+        """
+        Return the account's cached SMTP session, opening a new one if needed.
+        
+        A NOOP checks the cached session first, so a connection the server
+        has timed out is replaced instead of failing the send.
+        """
+        server = acc.get('_smtp')
+        if server is not None:
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            server.close()
+        
+        server = acc['_smtp'] = self._open_smtp(acc)
+        return server
+    
+    def _open_smtp(self, acc: Dict[str, Any]) -> smtplib.SMTP:
+        """Open an SMTP connection for the account, with STARTTLS and login done."""
+        server = smtplib.SMTP(acc['smtp_server'], acc['smtp_port'])
+        try:
+            if acc['use_tls']:
+                server.starttls()
+            
+            server.login(acc['username'], acc['password'])
+        except Exception:
+            server.close()
+            raise
+        return server
+    
     async def _receive_emails(self, account: str, folder: str = 'INBOX',
-                             limit: int = 10, unread_only: bool = True) -> Dict[str, Any]:
-        """Receive emails from IMAP."""
+                             limit: int = 10, unread_only: bool = True,
+                             body: bool = False) -> Dict[str, Any]:
+        """
+        Receive emails from IMAP.
+        
+        Args:
+            body: Download whole messages and include their text; by default
+                only headers and the BODYSTRUCTURE are fetched
+        """
         try:
             if account not in self.accounts:
                 return {
@@ -245,41 +477,18 @@ class EmailPlugin:
                     'error': 'IMAP server not configured'
                 }
             
-            # Connect to IMAP
-            mail = imaplib.IMAP4_SSL(acc['imap_server'], acc['imap_port'])
-            mail.login(acc['username'], acc['password'])
-            mail.select(folder)
-            
-            # Search for emails
-            search_criteria = 'UNSEEN' if unread_only else 'ALL'
-            status, messages = mail.search(None, search_criteria)
-            
-            email_ids = messages[0].split()
-            email_ids = email_ids[-limit:]  # Get latest N emails
-            
-            emails = []
-            for email_id in email_ids:
-                status, msg_data = mail.fetch(email_id, '(RFC822)')
+            def receive(mail):
+                mail.select(folder)
+                
+                # Search for emails
+                search_criteria = 'UNSEEN' if unread_only else 'ALL'
+                status, messages = mail.search(None, search_criteria)
                 
-                for response_part in msg_data:
-                    if isinstance(response_part, tuple):
-                        msg = email.message_from_bytes(response_part[1])
-                        
-                        # Extract email details
-                        email_info = {
-                            'id': email_id.decode(),
-                            'from': msg['From'],
-                            'to': msg['To'],
-                            'subject': msg['Subject'],
-                            'date': msg['Date'],
-                            'body': self._get_email_body(msg),
-                            'has_attachments': self._has_attachments(msg)
-                        }
-                        
-                        emails.append(email_info)
-            
-            mail.close()
-            mail.logout()
+                email_ids = _tail_ids(messages[0], limit)  # Get latest N emails
+                
+                return self._fetch_emails(mail, email_ids, body)
+            
+            emails = await asyncio.to_thread(self._imap_call, acc, receive)
             
             logger.info(f"Retrieved {len(emails)} emails from {account}")
             return {
@@ -295,9 +504,48 @@ class EmailPlugin:
                 'error': str(e)
             }
     
-    async def _search_emails(self, account: str, query: str,
+    async def _receive_emails_multi(self, accounts: List[str], **kwargs) -> Dict[str, Any]:
+        """
+        Receive emails from several accounts concurrently.
+        
+        Each account has its own IMAP connection and runs in its own worker
+        thread, so the whole poll takes about as long as the slowest account.
+        
+        Args:
+            accounts: Account names; other arguments are passed to receive
+        """
+        results = await asyncio.gather(*[
+            self._receive_emails(account, **kwargs) for account in accounts
+        ], return_exceptions=True)
+        
+        by_account = {}
+        for account, result in zip(accounts, results):
+            if isinstance(result, BaseException):
+                result = {
+                    'success': False,
+                    'error': str(result)
+                }
+            by_account[account] = result
+        
+        return {
+            'success': True,
+            'results': by_account,
+            'count': sum(r.get('count', 0) for r in by_account.values())
+        }
+    
+    async def _search_emails(self, account: str, query: Union[str, Dict[str, Any]],
                             folder: str = 'INBOX', limit: int = 50) -> Dict[str, Any]:
-        """Search emails."""
+        """
+        Search emails on the server.
+        
+        Args:
+            query: Subject text, or a dict of IMAP search keys to values, e.g.
+                {'from': 'boss@example.com', 'since': date(2024, 1, 1),
+                'unseen': True}; flags such as 'unseen' take a boolean
+        
+        Returns:
+            Matches identified by 'uid', which stays valid across sessions
+        """
         try:
             if account not in self.accounts:
                 return {
@@ -307,36 +555,37 @@ class EmailPlugin:
             
             acc = self.accounts[account]
             
-            # Connect to IMAP
-            mail = imaplib.IMAP4_SSL(acc['imap_server'], acc['imap_port'])
-            mail.login(acc['username'], acc['password'])
-            mail.select(folder)
-            
-            # Build search query
-            # Simple query parsing (can be enhanced)
-            search_criteria = f'(SUBJECT "{query}")'
+            if isinstance(query, str):
+                query = {'subject': query}
+            search_criteria = self._search_criteria(query)
             
-            status, messages = mail.search(None, search_criteria)
-            email_ids = messages[0].split()
-            email_ids = email_ids[-limit:]
-            
-            emails = []
-            for email_id in email_ids:
-                status, msg_data = mail.fetch(email_id, '(RFC822)')
+            def search(mail):
+                mail.select(folder)
+                
+                # The server filters on every criterion; UIDs, unlike sequence
+                # numbers, are not shifted by other clients' expunges
+                status, messages = mail.uid('SEARCH', None, *search_criteria)
+                uids = _tail_ids(messages[0], limit)
                 
-                for response_part in msg_data:
-                    if isinstance(response_part, tuple):
-                        msg = email.message_from_bytes(response_part[1])
-                        
-                        emails.append({
-                            'id': email_id.decode(),
-                            'from': msg['From'],
-                            'subject': msg['Subject'],
-                            'date': msg['Date']
-                        })
-            
-            mail.close()
-            mail.logout()
+                # Only the listed headers are returned, so skip bodies and attachments
+                emails = []
+                for email_id, uid, raw in self._fetch_batch(
+                    mail, uids, '(BODY.PEEK[HEADER.FIELDS (FROM SUBJECT DATE)])', uid=True
+                ):
+                    msg = email.message_from_bytes(raw)
+                    
+                    # Both ids, so either can be passed to delete (with uid=True
+                    # for the UID) without confusing one for the other
+                    emails.append({
+                        'id': email_id,
+                        'uid': uid,
+                        'from': msg['From'],
+                        'subject': msg['Subject'],
+                        'date': msg['Date']
+                    })
+                return emails
+            
+            emails = await asyncio.to_thread(self._imap_call, acc, search)
             
             logger.info(f"Found {len(emails)} emails matching query")
             return {
@@ -352,9 +601,416 @@ class EmailPlugin:
                 'error': str(e)
             }
     
+    @staticmethod
+    def _search_criteria(query: Dict[str, Any]) -> List[str]:
+        """
+        Turn a structured query into IMAP SEARCH arguments.
+        
+        Raises:
+            ValueError: For unknown keys or values that are not safe to quote
+        """
+        criteria = []
+        for key, value in query.items():
+            key = key.upper()
+            
+            if key in _SEARCH_FLAGS:
+                if value:
+                    criteria.append(key)
+                continue
+            if key not in _SEARCH_KEYS:
+                raise ValueError(f'Unsupported search key: {key}')
+            
+            if isinstance(value, (date, datetime)):
+                value = value.strftime('%d-%b-%Y')
+            value = str(value)
+            if not _SEARCH_VALUE_RE.fullmatch(value):
+                raise ValueError(f'Unsupported characters in search value for {key}')
+            
+            criteria.extend([key, f'"{value}"'])
+        
+        return criteria or ['ALL']
+    
+    def _fetch_emails(self, mail: imaplib.IMAP4, email_ids: List[bytes],
+                      body: bool = True, uid: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch messages and extract their details.
+        
+        Args:
+            uid: email_ids are UIDs, returned under 'uid' next to the sequence
+                number under 'id'; only supported together with body
+        """
+        if not body:
+            return self._fetch_headers(mail, email_ids)
+        
+        emails = []
+        for email_id, email_uid, raw in self._fetch_batch(mail, email_ids, '(RFC822)', uid=uid):
+            msg = email.message_from_bytes(raw)
+            parsed = self._parse_msg(msg)
+            
+            # Extract email details
+            email_info = {
+                'id': email_id,
+                'from': msg['From'],
+                'to': msg['To'],
+                'subject': msg['Subject'],
+                'date': msg['Date'],
+                'body': parsed['body'],
+                'has_attachments': parsed['has_attachments']
+            }
+            if uid:
+                email_info['uid'] = email_uid
+            
+            emails.append(email_info)
+        return emails
+    
+    @staticmethod
+    def _fetch_headers(mail: imaplib.IMAP4, email_ids: List[bytes]) -> List[Dict[str, Any]]:
+        """
+        Fetch only headers and BODYSTRUCTURE, leaving bodies on the server.
+        
+        Attachments are detected from the dispositions in the BODYSTRUCTURE,
+        so nothing beyond the header block is transferred or decoded. The
+        header is fetched without PEEK, so the messages are marked seen as
+        with a full RFC822 fetch and an unread_only receive does not return
+        them again.
+        """
+        if not email_ids:
+            return []
+        
+        status, msg_data = mail.fetch(
+            b','.join(email_ids).decode(), '(BODY[HEADER] BODYSTRUCTURE)'
+        )
+        
+        emails = []
+        for index, response_part in enumerate(msg_data):
+            if not isinstance(response_part, tuple):
+                continue
+            
+            # BODYSTRUCTURE comes either before the header literal or in the
+            # b' BODYSTRUCTURE (...))' item that follows it
+            structure = response_part[0]
+            if index + 1 < len(msg_data) and isinstance(msg_data[index + 1], bytes):
+                structure += msg_data[index + 1]
+            
+            msg = email.message_from_bytes(response_part[1])
+            emails.append({
+                'id': response_part[0].split(None, 1)[0].decode(),
+                'from': msg['From'],
+                'to': msg['To'],
+                'subject': msg['Subject'],
+                'date': msg['Date'],
+                'has_attachments': bool(_ATTACHMENT_DISPOSITION_RE.search(structure))
+            })
+        return emails
+    
+    def _imap_call(self, acc: Dict[str, Any], operation):
+        """
+        Run operation(mail) on the account's cached IMAP connection.
+        
+        The connection is opened and logged in on first use and kept on the
+        account; if the server has dropped it, it is reopened once. Blocking;
+        callers run it in a worker thread.
+        """
+        with acc['_imap_lock']:
+            return self._imap_call_locked(acc, operation)
+    
+    def _imap_call_locked(self, acc: Dict[str, Any], operation):
+        """_imap_call with the account's IMAP lock held."""
+        mail = acc.get('_imap')
+        if mail is not None:
+            try:
+                return operation(mail)
+            except (imaplib.IMAP4.abort, OSError) as e:
+                logger.debug(f"Cached IMAP connection lost, reconnecting: {e}")
+                self._drop_imap(acc)
+        
+        mail = imaplib.IMAP4_SSL(acc['imap_server'], acc['imap_port'])
+        mail.login(acc['username'], acc['password'])
+        acc['_imap'] = mail
+        return operation(mail)
+    
+    @staticmethod
+    def _drop_imap(acc: Dict[str, Any]):
+        """Log out and forget the account's cached IMAP connection."""
+        mail = acc.pop('_imap', None)
+        if mail is not None:
+            try:
+                mail.logout()
+            except Exception:
+                pass
+    
+    async def _idle_start(self, account: str, folder: str = 'INBOX') -> Dict[str, Any]:
+        """
+        Start watching a folder with IMAP IDLE.
+        
+        A dedicated connection waits for the server to push new-message
+        notifications, so callers use wait_new instead of polling receive.
+        """
+        if account not in self.accounts:
+            return {
+                'success': False,
+                'error': f'Account not found: {account}'
+            }
+        
+        acc = self.accounts[account]
+        if not acc.get('imap_server'):
+            return {
+                'success': False,
+                'error': 'IMAP server not configured'
+            }
+        
+        if account in self._idle and self._idle[account]['thread'].is_alive():
+            return {
+                'success': False,
+                'message': f'Already idling on: {account}'
+            }
+        
+        watcher = {
+            'folder': folder,
+            'queue': asyncio.Queue(),
+            'stop': threading.Event()
+        }
+        watcher['thread'] = threading.Thread(
+            target=self._idle_loop,
+            args=(acc, folder, asyncio.get_running_loop(), watcher['queue'], watcher['stop']),
+            name=f'imap-idle-{account}',
+            daemon=True
+        )
+        self._idle[account] = watcher
+        watcher['thread'].start()
+        
+        logger.info(f"IMAP IDLE started for {account}/{folder}")
+        return {
+            'success': True,
+            'account': account,
+            'folder': folder
+        }
+    
+    async def _idle_stop(self, account: str) -> Dict[str, Any]:
+        """Stop the IDLE watcher for an account."""
+        watcher = self._idle.pop(account, None)
+        if watcher is None:
+            return {
+                'success': False,
+                'message': f'Not idling on: {account}'
+            }
+        
+        watcher['stop'].set()
+        await asyncio.to_thread(watcher['thread'].join, 5)
+        
+        logger.info(f"IMAP IDLE stopped for {account}")
+        return {'success': True, 'account': account}
+    
+    async def _wait_new(self, account: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for messages announced by IDLE and fetch them.
+        
+        Each returned email carries its UID under 'uid'.
+        
+        Args:
+            timeout: Seconds to wait; None waits until a message arrives
+        """
+        try:
+            watcher = self._idle.get(account)
+            if watcher is None:
+                return {
+                    'success': False,
+                    'error': f'IDLE not started for: {account}'
+                }
+            
+            queue = watcher['queue']
+            try:
+                uids = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return {'success': True, 'emails': [], 'count': 0}
+            
+            # Fold in any further notifications that arrived meanwhile
+            while not queue.empty():
+                uids.extend(queue.get_nowait())
+            
+            # IDLE queues UIDs, so expunges since then do not shift the set
+            def fetch(mail):
+                mail.select(watcher['folder'])
+                return self._fetch_emails(mail, uids, uid=True)
+            
+            emails = await asyncio.to_thread(self._imap_call, self.accounts[account], fetch)
+            return {
+                'success': True,
+                'emails': emails,
+                'count': len(emails)
+            }
+        
+        except Exception as e:
+            logger.error(f"Wait for new emails failed: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _idle_loop(self, acc: Dict[str, Any], folder: str, loop: asyncio.AbstractEventLoop,
+                   queue: asyncio.Queue, stop: threading.Event):
+        """IDLE thread: hold a connection open and report new messages until stopped."""
+        while not stop.is_set():
+            mail = None
+            try:
+                mail = _IdleIMAP4_SSL(acc['imap_server'], acc['imap_port'])
+                mail.login(acc['username'], acc['password'])
+                status, data = mail.select(folder)
+                known = int(data[0])
+                uid_next = self._uid_next(mail)
+                
+                while not stop.is_set():
+                    known, arrived = self._idle_once(mail, known, stop)
+                    if arrived:
+                        uids, uid_next = self._new_uids(mail, uid_next)
+                        if uids:
+                            loop.call_soon_threadsafe(queue.put_nowait, uids)
+            
+            except Exception as e:
+                if not stop.is_set():
+                    logger.warning(f"IMAP IDLE connection lost, retrying: {e}")
+                    stop.wait(IDLE_RETRY_SECONDS)
+            finally:
+                if mail is not None:
+                    try:
+                        mail.logout()
+                    except Exception:
+                        pass
+    
+    def _idle_once(self, mail: imaplib.IMAP4_SSL, known: int,
+                   stop: threading.Event) -> tuple:
+        """
+        Run one IDLE command until new mail arrives, it needs renewing or stop is set.
+        
+        imaplib has no IDLE support, so the command is written by hand and
+        the socket is polled once a second to notice stop. mail must be an
+        _IdleIMAP4_SSL, so that no line waits unseen in a read buffer.
+        
+        Returns:
+            (message count of the folder after the updates seen,
+            whether the folder grew)
+        """
+        tag = mail._new_tag()
+        mail.send(tag + b' IDLE\r\n')
+        line = mail.readline()
+        if not line.startswith(b'+'):
+            raise imaplib.IMAP4.error(f'IDLE rejected: {line!r}')
+        
+        sock = mail.socket()
+        deadline = time.monotonic() + IDLE_RENEW_SECONDS
+        arrived = False
+        while not arrived and not stop.is_set() and time.monotonic() < deadline:
+            readable, _, _ = select.select([sock], [], [], 1.0)
+            if readable or sock.pending():
+                known, grew = self._idle_update(mail.readline(), known)
+                arrived |= grew
+                # Lines that arrived in the same TLS record are already
+                # decrypted, so select() would not report them
+                while sock.pending():
+                    known, grew = self._idle_update(mail.readline(), known)
+                    arrived |= grew
+        
+        # IDLE is ended as soon as mail arrives, so its UIDs can be resolved
+        mail.send(b'DONE\r\n')
+        while True:
+            line = mail.readline()
+            if line.startswith(tag):
+                return known, arrived
+            known, grew = self._idle_update(line, known)
+            arrived |= grew
+    
+    @staticmethod
+    def _idle_update(line: bytes, known: int) -> tuple:
+        """
+        Track the folder size from an untagged response.
+        
+        Returns:
+            (new message count, whether the folder grew)
+        """
+        if not line:
+            raise imaplib.IMAP4.abort('IMAP connection closed during IDLE')
+        
+        match = _IDLE_UPDATE_RE.match(line)
+        if match is None:
+            return known, False
+        
+        number = int(match.group(1))
+        if match.group(2) == b'EXPUNGE':
+            return max(known - 1, 0), False
+        return number, number > known
+    
+    @staticmethod
+    def _uid_next(mail: imaplib.IMAP4) -> int:
+        """UIDNEXT of the selected folder, from the untagged SELECT response."""
+        status, data = mail.response('UIDNEXT')
+        if not data or data[0] is None:
+            raise imaplib.IMAP4.error('Server did not report UIDNEXT')
+        return int(data[0])
+    
+    @staticmethod
+    def _new_uids(mail: imaplib.IMAP4, uid_next: int) -> tuple:
+        """
+        Find the UIDs of messages added since uid_next was recorded.
+        
+        Returns:
+            (new UIDs, UIDNEXT to use for the next lookup)
+        """
+        status, data = mail.uid('SEARCH', None, f'UID {uid_next}:*')
+        # 'n:*' always matches the highest UID, even when it is below n
+        uids = [uid for uid in data[0].split() if int(uid) >= uid_next]
+        if uids:
+            uid_next = max(map(int, uids)) + 1
+        return uids, uid_next
+    
+    @staticmethod
+    def _fetch_batch(mail: imaplib.IMAP4, email_ids: List[bytes], spec: str,
+                     uid: bool = False) -> List[tuple]:
+        """
+        Fetch several messages in one round trip.
+        
+        Args:
+            uid: email_ids are UIDs; a UID FETCH is sent and UIDs are returned
+        
+        Returns:
+            (sequence number, UID or None, data) in the order the server answered
+        """
+        if not email_ids:
+            return []
+        
+        message_set = b','.join(email_ids).decode()
+        if uid:
+            status, msg_data = mail.uid('FETCH', message_set, spec)
+        else:
+            status, msg_data = mail.fetch(message_set, spec)
+        
+        # Each message arrives as (b'<id> (<spec> {size}', data), separated by b')'
+        results = []
+        for index, response_part in enumerate(msg_data):
+            if not isinstance(response_part, tuple):
+                continue
+            
+            # The leading number is the sequence number
+            email_id = response_part[0].split(None, 1)[0].decode()
+            email_uid = None
+            if uid:
+                # The UID item may also follow the literal
+                match = _UID_RE.search(response_part[0])
+                if match is None and index + 1 < len(msg_data) and isinstance(msg_data[index + 1], bytes):
+                    match = _UID_RE.search(msg_data[index + 1])
+                email_uid = match.group(1).decode() if match else None
+            
+            results.append((email_id, email_uid, response_part[1]))
+        return results
+    
     async def _delete_email(self, account: str, email_id: str,
-                           folder: str = 'INBOX') -> Dict[str, Any]:
-        """Delete email."""
+                           folder: str = 'INBOX', uid: bool = False) -> Dict[str, Any]:
+        """
+        Delete email.
+        
+        Args:
+            uid: email_id is a UID (an email's 'uid'), not a sequence
+                number (its 'id')
+        """
         try:
             if account not in self.accounts:
                 return {
@@ -364,16 +1020,17 @@ class EmailPlugin:
             
             acc = self.accounts[account]
             
-            mail = imaplib.IMAP4_SSL(acc['imap_server'], acc['imap_port'])
-            mail.login(acc['username'], acc['password'])
-            mail.select(folder)
-            
-            # Mark for deletion
-            mail.store(email_id, '+FLAGS', '\\Deleted')
-            mail.expunge()
+            def delete(mail):
+                mail.select(folder)
+                
+                # Mark for deletion
+                if uid:
+                    mail.uid('STORE', email_id, '+FLAGS', '\\Deleted')
+                else:
+                    mail.store(email_id, '+FLAGS', '\\Deleted')
+                mail.expunge()
             
-            mail.close()
-            mail.logout()
+            await asyncio.to_thread(self._imap_call, acc, delete)
             
             logger.info(f"Email deleted: {email_id}")
             return {
@@ -388,9 +1045,27 @@ class EmailPlugin:
                 'error': str(e)
             }
     
-    async def _create_template(self, name: str, content: str) -> Dict[str, Any]:
-        """Create email template."""
+    async def _create_template(self, name: str, content: str,
+                               engine: str = 'format') -> Dict[str, Any]:
+        """
+        Create email template.
+        
+        Args:
+            engine: 'format' for str.format placeholders ({name}), or
+                'jinja' for Jinja2 syntax ({{ name }}, loops, conditionals),
+                compiled once here
+        """
         try:
+            if engine == 'jinja':
+                if not JINJA_AVAILABLE:
+                    return {
+                        'success': False,
+                        'error': 'jinja2 not installed'
+                    }
+                self._compiled_templates[name] = _JINJA_ENV.from_string(content)
+            else:
+                self._compiled_templates.pop(name, None)
+            
             self.templates[name] = content
             
             logger.info(f"Email template created: {name}")
@@ -407,32 +1082,58 @@ class EmailPlugin:
             }
     
     async def _send_bulk(self, account: str, recipients: List[str],
-                        subject: str, body: str, **kwargs) -> Dict[str, Any]:
-        """Send bulk emails."""
+                        subject: str, body: str,
+                        cc: Optional[Union[str, List[str]]] = None,
+                        bcc: Optional[Union[str, List[str]]] = None,
+                        attachments: Optional[List[str]] = None,
+                        html: bool = False,
+                        template: Optional[str] = None,
+                        template_vars: Optional[Dict[str, Any]] = None,
+                        concurrency: int = 5) -> Dict[str, Any]:
+        """
+        Send the same email to each recipient separately.
+        
+        Up to concurrency workers each hold one SMTP session and take
+        recipients from a shared queue, so the handshake, STARTTLS and
+        login are paid once per worker. Keep concurrency within the
+        provider's connection limit (e.g. 15 for Gmail, 5-10 for Zoho).
+        """
         try:
+            if account not in self.accounts:
+                return {
+                    'success': False,
+                    'error': f'Account not found: {account}'
+                }
+            
+            acc = self.accounts[account]
+            body = self._render_body(body, template, template_vars)
+            
+            # Normalized once; every recipient shares the same copies
+            cc_list = _as_list(cc)
+            copies = cc_list + _as_list(bcc)
+            
             results = {
                 'success': 0,
                 'failed': 0,
                 'errors': []
             }
             
+            # Body and attachments are read and encoded once for the batch;
+            # each recipient only gets a fresh envelope of headers
+            parts = self._build_parts(body, attachments, html)
+            
+            def build(recipient: str):
+                msg = self._build_message(acc, [recipient], subject, parts, cc_list)
+                return msg, [recipient, *copies]
+            
+            queue = asyncio.Queue()
             for recipient in recipients:
-                result = await self._send_email(
-                    account=account,
-                    to=recipient,
-                    subject=subject,
-                    body=body,
-                    **kwargs
-                )
-                
-                if result['success']:
-                    results['success'] += 1
-                else:
-                    results['failed'] += 1
-                    results['errors'].append({
-                        'recipient': recipient,
-                        'error': result.get('error', 'Unknown error')
-                    })
+                queue.put_nowait(recipient)
+            
+            workers = max(1, min(concurrency, len(recipients)))
+            await asyncio.gather(*[
+                self._bulk_worker(acc, queue, build, results) for _ in range(workers)
+            ])
             
             logger.info(f"Bulk email: {results['success']} sent, {results['failed']} failed")
             return {
@@ -447,34 +1148,166 @@ class EmailPlugin:
                 'error': str(e)
             }
     
-    def _get_email_body(self, msg) -> str:
-        """Extract email body."""
-        body = ""
+    async def _bulk_worker(self, acc: Dict[str, Any], queue: asyncio.Queue,
+                           build, results: Dict[str, Any]):
+        """Send queued recipients over this worker's own SMTP session."""
+        server = None
+        try:
+            while True:
+                try:
+                    recipient = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                try:
+                    msg, envelope = build(recipient)
+                    if server is None:
+                        server = await asyncio.to_thread(self._open_smtp, acc)
+                    server = await asyncio.to_thread(self._send_on, acc, server, msg, envelope)
+                    results['success'] += 1
+                except Exception as e:
+                    results['failed'] += 1
+                    results['errors'].append({
+                        'recipient': recipient,
+                        'error': str(e)
+                    })
+        finally:
+            if server is not None:
+                await asyncio.to_thread(self._close_smtp, server)
+    
+    def _send_on(self, acc: Dict[str, Any], server: smtplib.SMTP, msg: EmailMessage,
+                 envelope: List[str]) -> smtplib.SMTP:
+        """
+        Send over an open session, reconnecting once if it was dropped.
+        
+        Returns:
+            The session to keep using
+        """
+        try:
+            server.send_message(msg, acc['username'], envelope)
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError):
+            server.close()
+            server = self._open_smtp(acc)
+            server.send_message(msg, acc['username'], envelope)
+        return server
+    
+    @staticmethod
+    def _close_smtp(server: smtplib.SMTP):
+        """End an SMTP session, dropping the socket if QUIT fails."""
+        try:
+            server.quit()
+        except smtplib.SMTPException:
+            server.close()
+    
+    def _parse_msg(self, msg) -> Dict[str, Any]:
+        """
+        Extract the plain-text body and attachment flag in one walk.
+        
+        The result is kept on the message, so later lookups are free.
+        """
+        parsed = getattr(msg, '_cosik_parsed', None)
+        if parsed is not None:
+            return parsed
+        
+        body = None
+        has_attachments = False
         
         if msg.is_multipart():
-            for part in msg.walk():
-                content_type = part.get_content_type()
-                if content_type == 'text/plain':
-                    try:
-                        body = part.get_payload(decode=True).decode()
-                        break
-                    except:
-                        pass
+            # Iterative pre-order walk; subparts go on the stack reversed so
+            # the first text/plain part is still the one picked. Messages
+            # from message_from_bytes are legacy Message objects without
+            # iter_parts, so the subpart list comes from get_payload()
+            stack = [msg]
+            while stack:
+                part = stack.pop()
+                if part.is_multipart():
+                    stack.extend(reversed(part.get_payload()))
+                    continue
+                if part.get_content_disposition() == 'attachment':
+                    has_attachments = True
+                if body is None and part.get_content_type() == 'text/plain':
+                    body = self._decode_part(part)
+                if has_attachments and body is not None:
+                    break
         else:
-            try:
-                body = msg.get_payload(decode=True).decode()
-            except:
-                pass
+            body = self._decode_part(msg)
         
-        return body
+        parsed = msg._cosik_parsed = {
+            'body': body or '',
+            'has_attachments': has_attachments
+        }
+        return parsed
+    
+    @staticmethod
+    def _decode_part(part) -> Optional[str]:
+        """Decode a part's payload with its declared charset."""
+        payload = part.get_payload(decode=True)
+        if payload is None:
+            return None
+        charset = part.get_content_charset() or 'utf-8'
+        try:
+            return payload.decode(charset, errors='replace')
+        except LookupError:
+            return payload.decode('utf-8', errors='replace')
+    
+    def _get_email_body(self, msg) -> str:
+        """Extract email body."""
+        return self._parse_msg(msg)['body']
     
     def _has_attachments(self, msg) -> bool:
         """Check if email has attachments."""
-        if msg.is_multipart():
-            for part in msg.walk():
-                if part.get_content_disposition() == 'attachment':
-                    return True
-        return False
+        return self._parse_msg(msg)['has_attachments']
+    
+    async def close(self):
+        """Stop IDLE watchers and log out of cached SMTP and IMAP sessions."""
+        for acc in self.accounts.values():
+            async with acc['_asmtp_lock']:
+                smtp = acc.pop('_asmtp', None)
+                if smtp is not None:
+                    try:
+                        await smtp.quit()
+                    except (aiosmtplib.SMTPException, OSError):
+                        smtp.close()
+        
+        await asyncio.to_thread(self._close_sessions)
+    
+    def _close_sessions(self):
+        """Blocking part of close; also run at interpreter exit."""
+        for watcher in self._idle.values():
+            watcher['stop'].set()
+        self._idle.clear()
+        
+        for acc in self.accounts.values():
+            with acc['_smtp_lock']:
+                server = acc.pop('_smtp', None)
+                if server is not None:
+                    try:
+                        self._close_smtp(server)
+                    except OSError:
+                        pass
+            with acc['_imap_lock']:
+                self._drop_imap(acc)
+    
+    def cleanup(self):
+        """
+        Cleanup when plugin is unloaded.
+        
+        Unloading is synchronous, so sessions are closed before returning
+        rather than in a task nobody awaits. Async SMTP sessions are
+        dropped without QUIT.
+        """
+        atexit.unregister(self._close_sessions)
+        
+        for acc in self.accounts.values():
+            smtp = acc.pop('_asmtp', None)
+            if smtp is not None:
+                try:
+                    smtp.close()
+                except Exception:
+                    pass
+        
+        self._close_sessions()
+        logger.info("Email plugin cleaned up")
     
     def get_capabilities(self) -> Dict[str, Any]:
         """Get plugin capabilities."""
@@ -483,9 +1316,10 @@ class EmailPlugin:
             'version': '1.0.0',
             'description': 'Email operations (send/receive)',
             'actions': [
-                'send', 'receive', 'search', 'delete',
+                'send', 'receive', 'receive_multi', 'search', 'delete',
                 'add_account', 'list_accounts',
-                'create_template', 'send_bulk'
+                'create_template', 'send_bulk',
+                'idle_start', 'idle_stop', 'wait_new'
             ],
             'protocols': ['SMTP', 'IMAP']
         }
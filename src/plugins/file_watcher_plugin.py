@@ -4,6 +4,8 @@ Allows the AI agent to watch directories and files for changes.
 """
 
 import asyncio
+from collections import deque
+from itertools import islice
 from typing import Dict, Any, List, Optional, Set
 from pathlib import Path
 from datetime import datetime
@@ -15,17 +17,27 @@ try:
     WATCHDOG_AVAILABLE = True
     
     class FileChangeHandler(FileSystemEventHandler):
-        """Handler for file system events."""
+        """
+        Handler for file system events.
+        
+        watchdog calls it on the observer thread, so events are handed to
+        the plugin's event loop and queued for a single consumer task.
+        """
         
-        def __init__(self, callback):
-            """Initialize handler with callback."""
+        def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+            """Initialize handler with the loop and queue that receive events."""
             super().__init__()
-            self.callback = callback
+            self.loop = loop
+            self.queue = queue
         
         def on_any_event(self, event: 'FileSystemEvent'):
             """Handle any file system event."""
             if not event.is_directory:
-                asyncio.create_task(self.callback(event))
+                try:
+                    self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+                except RuntimeError:
+                    # Event loop already closed
+                    pass
                 
 except ImportError:
     WATCHDOG_AVAILABLE = False
@@ -41,10 +53,21 @@ class FileWatcherPlugin:
     def __init__(self, config):
         """Initialize file watcher plugin."""
         self.config = config
-        self.observers = {}
-        self.event_history = []
+        # One observer thread serves every watched path; watches maps each
+        # path to its scheduled watch
+        self.observer = None
+        self.watches = {}
         self.max_history = config.get('plugins.file_watcher.max_history', 500)
+        # Oldest events fall off on append, without copying the rest
+        self.event_history = deque(maxlen=self.max_history)
         self.watched_paths = set()
+        # Requested path -> resolved path string, so resolve() (a stat per
+        # path component) runs once per watch rather than on every call
+        self._path_resolve_cache: Dict[str, str] = {}
+        
+        # Events from every observer thread are recorded by one task
+        self._event_queue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
         
         if not WATCHDOG_AVAILABLE:
             logger.warning("File watcher plugin initialized but watchdog is not available")
@@ -94,29 +117,29 @@ class FileWatcherPlugin:
     async def _watch(self, path: str, recursive: bool = True, **kwargs) -> Dict[str, Any]:
         """Start watching a path for changes."""
         try:
-            path_obj = Path(path).resolve()
+            path_str = self._resolve(path)
             
-            if not path_obj.exists():
+            if path_str in self.watched_paths:
                 return {
                     'success': False,
-                    'error': f'Path does not exist: {path}'
+                    'message': f'Already watching: {path}'
                 }
             
-            path_str = str(path_obj)
-            
-            if path_str in self.watched_paths:
+            if not Path(path_str).exists():
+                self._path_resolve_cache.pop(path, None)
                 return {
                     'success': False,
-                    'message': f'Already watching: {path}'
+                    'error': f'Path does not exist: {path}'
                 }
             
-            # Create observer
-            observer = Observer()
-            handler = FileChangeHandler(self._on_file_event)
-            observer.schedule(handler, path_str, recursive=recursive)
-            observer.start()
+            if self.observer is None:
+                self.observer = Observer()
+                self.observer.start()
+            
+            handler = FileChangeHandler(asyncio.get_running_loop(), self._ensure_drain())
+            watch = self.observer.schedule(handler, path_str, recursive=recursive)
             
-            self.observers[path_str] = observer
+            self.watches[path_str] = watch
             self.watched_paths.add(path_str)
             
             logger.info(f"Started watching: {path_str} (recursive: {recursive})")
@@ -136,8 +159,7 @@ class FileWatcherPlugin:
     async def _unwatch(self, path: str, **kwargs) -> Dict[str, Any]:
         """Stop watching a path."""
         try:
-            path_obj = Path(path).resolve()
-            path_str = str(path_obj)
+            path_str = self._resolve(path)
             
             if path_str not in self.watched_paths:
                 return {
@@ -145,13 +167,12 @@ class FileWatcherPlugin:
                     'message': f'Not watching: {path}'
                 }
             
-            # Stop observer
-            observer = self.observers[path_str]
-            observer.stop()
-            observer.join(timeout=2)
-            
-            del self.observers[path_str]
+            self.observer.unschedule(self.watches.pop(path_str))
             self.watched_paths.remove(path_str)
+            self._path_resolve_cache = {
+                key: value for key, value in self._path_resolve_cache.items()
+                if value != path_str
+            }
             
             logger.info(f"Stopped watching: {path_str}")
             return {
@@ -166,6 +187,14 @@ class FileWatcherPlugin:
                 'error': f'Failed to unwatch path: {e}'
             }
     
+    def _resolve(self, path: str) -> str:
+        """Resolve a path to its absolute string form, memoized per path."""
+        path_str = self._path_resolve_cache.get(path)
+        if path_str is None:
+            path_str = str(Path(path).resolve())
+            self._path_resolve_cache[path] = path_str
+        return path_str
+    
     async def _list_watched(self, **kwargs) -> Dict[str, Any]:
         """List all watched paths."""
         return {
@@ -176,14 +205,14 @@ class FileWatcherPlugin:
     
     async def _get_history(self, limit: int = 50, event_type: Optional[str] = None, **kwargs) -> Dict[str, Any]:
         """Get file event history."""
-        history = self.event_history
-        
-        # Filter by event type if specified
-        if event_type:
-            history = [e for e in history if e['event_type'] == event_type]
-        
-        # Limit results
-        history_items = history[-limit:] if limit > 0 else history
+        # Walk back from the newest event, filtering by event type if
+        # specified, and stop once limit events have matched
+        newest_first = (
+            e for e in reversed(self.event_history)
+            if not event_type or e['event_type'] == event_type
+        )
+        history_items = list(islice(newest_first, limit if limit > 0 else None))
+        history_items.reverse()
         
         return {
             'success': True,
@@ -205,7 +234,25 @@ class FileWatcherPlugin:
             'cleared_count': count
         }
     
-    async def _on_file_event(self, event: 'FileSystemEvent'):
+    def _ensure_drain(self) -> asyncio.Queue:
+        """Start the event consumer task on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if (self._drain_task is None or self._drain_task.done()
+                or self._drain_task.get_loop() is not loop):
+            self._event_queue = asyncio.Queue()
+            self._drain_task = loop.create_task(self._drain(self._event_queue))
+        return self._event_queue
+    
+    async def _drain(self, queue: asyncio.Queue):
+        """Record queued file events as they arrive."""
+        while True:
+            event = await queue.get()
+            try:
+                self._on_file_event(event)
+            except Exception as e:
+                logger.error(f"Error recording file event: {e}")
+    
+    def _on_file_event(self, event: 'FileSystemEvent'):
         """Handle file system event."""
         event_data = {
             'event_type': event.event_type,
@@ -220,10 +267,6 @@ class FileWatcherPlugin:
         
         self.event_history.append(event_data)
         
-        # Trim history if needed
-        if len(self.event_history) > self.max_history:
-            self.event_history = self.event_history[-self.max_history:]
-        
         logger.debug(f"File event: {event.event_type} - {event.src_path}")
     
     def get_capabilities(self) -> List[str]:
@@ -238,17 +281,24 @@ class FileWatcherPlugin:
     
     def cleanup(self):
         """Cleanup when plugin is unloaded."""
-        # Stop all observers
-        for path, observer in self.observers.items():
+        # Stop the shared observer, which drops every watch
+        if self.observer is not None:
             try:
-                observer.stop()
-                observer.join(timeout=2)
-                logger.info(f"Stopped watching: {path}")
+                self.observer.stop()
+                self.observer.join(timeout=2)
+                for path in self.watches:
+                    logger.info(f"Stopped watching: {path}")
             except Exception as e:
-                logger.error(f"Error stopping observer for {path}: {e}")
+                logger.error(f"Error stopping file observer: {e}")
+            self.observer = None
         
-        self.observers.clear()
+        self.watches.clear()
         self.watched_paths.clear()
+        self._path_resolve_cache.clear()
+        
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
         logger.info("File watcher plugin cleaned up")
 
 
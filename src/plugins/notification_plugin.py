@@ -11,6 +11,9 @@ Features:
 - Custom notification templates
 """
 
+import asyncio
+from collections import deque
+from itertools import islice
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
@@ -56,9 +59,9 @@ class NotificationSystem:
         # Toast notifier
         self.toaster = ToastNotifier() if TOAST_AVAILABLE else None
         
-        # Notification history
-        self.history = []
+        # Notification history; oldest entries fall off on append
         self.max_history = self.notification_config.get('max_history', 1000)
+        self.history = deque(maxlen=self.max_history)
         
         # Notification templates
         self.templates = {}
@@ -87,29 +90,34 @@ class NotificationSystem:
                 'sent': []
             }
             
+            channels = []
+            
             # Desktop notification
             if notification_type in ['desktop', 'all']:
-                desktop_result = await self._send_desktop(title, message, **kwargs)
-                if desktop_result['success']:
-                    result['sent'].append('desktop')
+                channels.append(('desktop', self._send_desktop(title, message, **kwargs)))
             
             # Sound notification
             if notification_type in ['sound', 'all'] or priority == 'critical':
-                sound_result = await self._send_sound(priority, **kwargs)
-                if sound_result['success']:
-                    result['sent'].append('sound')
+                channels.append(('sound', self._send_sound(priority, **kwargs)))
             
             # Email notification
             if notification_type in ['email', 'all']:
-                email_result = await self._send_email(title, message, **kwargs)
-                if email_result['success']:
-                    result['sent'].append('email')
+                channels.append(('email', self._send_email(title, message, **kwargs)))
             
             # Webhook notification
             if notification_type in ['webhook', 'all']:
-                webhook_result = await self._send_webhook(title, message, **kwargs)
-                if webhook_result['success']:
-                    result['sent'].append('webhook')
+                channels.append(('webhook', self._send_webhook(title, message, **kwargs)))
+            
+            # Channels are independent, so they run concurrently and the
+            # send takes as long as the slowest one
+            channel_results = await asyncio.gather(
+                *[coro for _, coro in channels], return_exceptions=True
+            )
+            for (channel, _), channel_result in zip(channels, channel_results):
+                if isinstance(channel_result, BaseException):
+                    logger.error(f"{channel} notification failed: {channel_result}")
+                elif channel_result['success']:
+                    result['sent'].append(channel)
             
             # Add to history
             self._add_to_history({
@@ -142,7 +150,9 @@ class NotificationSystem:
                 logger.warning("Toast notifications not available")
                 return {'success': False, 'error': 'Toast not available'}
             
-            self.toaster.show_toast(
+            # show_toast can stall on COM setup even with threaded=True
+            await asyncio.to_thread(
+                self.toaster.show_toast,
                 title=title,
                 msg=message,
                 duration=duration,
@@ -171,7 +181,8 @@ class NotificationSystem:
             }
             
             frequency, duration = sounds.get(priority, sounds['normal'])
-            winsound.Beep(frequency, duration)
+            # Beep blocks for the whole tone
+            await asyncio.to_thread(winsound.Beep, frequency, duration)
             
             return {'success': True}
         
@@ -219,21 +230,18 @@ class NotificationSystem:
     def _add_to_history(self, notification: Dict[str, Any]):
         """Add notification to history."""
         self.history.append(notification)
-        
-        # Trim history if too large
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
     
     async def get_history(self, limit: int = 50, priority: Optional[str] = None) -> Dict[str, Any]:
         """Get notification history."""
         try:
-            filtered = self.history
-            
-            if priority:
-                filtered = [n for n in filtered if n.get('priority') == priority]
-            
-            # Get latest N
-            recent = filtered[-limit:]
+            # Walk back from the newest notification, filtering by priority
+            # if specified, and stop once limit notifications have matched
+            newest_first = (
+                n for n in reversed(self.history)
+                if not priority or n.get('priority') == priority
+            )
+            recent = list(islice(newest_first, limit if limit > 0 else None))
+            recent.reverse()
             
             return {
                 'success': True,
@@ -252,7 +260,7 @@ class NotificationSystem:
         """Clear notification history."""
         try:
             count = len(self.history)
-            self.history = []
+            self.history.clear()
             
             return {
                 'success': True,
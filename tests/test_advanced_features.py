@@ -141,8 +141,8 @@ class TestContextManager:
         """Test session start."""
         await context_manager.start_session('test_session')
         
-        assert context_manager.current_context['session_id'] == 'test_session'
-        assert context_manager.current_context['start_time'] is not None
+        assert context_manager.current_context.session_id == 'test_session'
+        assert context_manager.current_context.start_time is not None
     
     @pytest.mark.asyncio
     async def test_update_goal(self, context_manager):
@@ -150,8 +150,8 @@ class TestContextManager:
         await context_manager.start_session('test_session')
         await context_manager.update_goal('Test goal')
         
-        assert context_manager.current_context['current_goal'] is not None
-        assert context_manager.current_context['current_goal']['description'] == 'Test goal'
+        assert context_manager.current_context.current_goal is not None
+        assert context_manager.current_context.current_goal['description'] == 'Test goal'
     
     @pytest.mark.asyncio
     async def test_add_task(self, context_manager):
@@ -161,7 +161,63 @@ class TestContextManager:
         task = {'id': 'task1', 'description': 'Test task'}
         await context_manager.add_task(task)
         
-        assert len(context_manager.current_context['active_tasks']) == 1
+        assert len(context_manager.current_context.active_tasks) == 1
+    
+    @pytest.mark.asyncio
+    async def test_relevant_context_cache(self, context_manager):
+        """Test that cached context follows constraint changes and stays unshared."""
+        await context_manager.start_session('test_session')
+        
+        first = await context_manager.get_relevant_context('query')
+        first['extra'] = True
+        assert 'extra' not in await context_manager.get_relevant_context('query')
+        
+        constraints = [{'type': 'forbidden_action', 'actions': ['delete']}]
+        context_manager.set_constraints(constraints)
+        context = await context_manager.get_relevant_context('query')
+        assert context['constraints'] == constraints
+    
+    @pytest.mark.asyncio
+    async def test_relevant_context_follows_stored_tasks(self, config):
+        """Test that similar past tasks are looked up again after a task is stored."""
+        from src.context.context_manager import ContextManager
+        
+        class FakeMemory:
+            def __init__(self):
+                self.task_version = 0
+                self.tasks = []
+            
+            async def get_previous_session_context(self):
+                return None
+            
+            async def find_similar_tasks(self, query, limit=5):
+                return list(self.tasks)
+            
+            async def add_task_result(self, task, result):
+                self.tasks.append(task)
+                self.task_version += 1
+        
+        memory = FakeMemory()
+        context_manager = ContextManager(config, memory)
+        await context_manager.start_session('test_session')
+        
+        assert (await context_manager.get_relevant_context('open'))['similar_past_tasks'] == []
+        await memory.add_task_result({'intent': 'open_application'}, {'success': True})
+        context = await context_manager.get_relevant_context('open')
+        assert context['similar_past_tasks'] == [{'intent': 'open_application'}]
+    
+    @pytest.mark.asyncio
+    async def test_update_task_status(self, context_manager):
+        """Test updating task status by id."""
+        await context_manager.start_session('test_session')
+        await context_manager.add_task({'id': 'task1', 'description': 'Test task'})
+        await context_manager.update_task_status('task1', 'completed')
+        await context_manager.update_task_status('missing', 'failed')
+        
+        task = context_manager.current_context.active_tasks[0]
+        assert task['status'] == 'completed'
+        assert context_manager.performance_metrics['tasks_completed'] == 1
+        assert context_manager.performance_metrics['tasks_failed'] == 0
     
     @pytest.mark.asyncio
     async def test_suggest_next_action(self, context_manager):
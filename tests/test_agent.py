@@ -115,6 +115,36 @@ class TestConfigLoader:
         # For now, just verify the method exists and is callable
         assert hasattr(config, 'update')
 
+    @pytest.mark.asyncio
+    async def test_update_config_writes_file(self, tmp_path):
+        """Test that updates are persisted and untouched sections survive."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("agent:\n  max_retries: 3\nai:\n  model: gpt-4\n", encoding='utf-8')
+        config = ConfigLoader(str(config_path))
+
+        assert await config.update({'agent': {'max_retries': 10}})
+        assert await config.update({'ai': {'temperature': 0.5}})
+
+        reloaded = ConfigLoader(str(config_path))
+        assert reloaded.get('agent.max_retries') == 10
+        assert reloaded.get('ai.model') == 'gpt-4'
+        assert reloaded.get('ai.temperature') == 0.5
+
+    @pytest.mark.asyncio
+    async def test_update_config_writes_in_place_changes(self, tmp_path):
+        """Test that sections changed through get() are saved by the next update."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("agent:\n  max_retries: 3\nai:\n  model: gpt-4\n", encoding='utf-8')
+        config = ConfigLoader(str(config_path))
+
+        assert await config.update({'agent': {'max_retries': 10}})
+        config.get('ai')['model'] = 'gpt-4o'
+        assert await config.update({'agent': {'max_retries': 11}})
+
+        reloaded = ConfigLoader(str(config_path))
+        assert reloaded.get('ai.model') == 'gpt-4o'
+        assert reloaded.get('agent.max_retries') == 11
+
 
 class TestMemoryManager:
     """Test memory management."""
@@ -175,6 +205,40 @@ class TestMemoryManager:
         assert isinstance(recent, list)
         assert len(recent) >= 2
     
+    @pytest.mark.asyncio
+    async def test_concurrent_interactions_batched(self, memory):
+        """Test that concurrent writes each get their own row ID."""
+        ids = await asyncio.gather(*[
+            memory.add_interaction(f"command {i}", {'intent': 'test'})
+            for i in range(20)
+        ])
+        
+        assert all(i > 0 for i in ids)
+        assert len(set(ids)) == 20
+        
+        recent = await memory.get_recent_interactions(limit=50)
+        assert len(recent) == 20
+        await memory.stop()
+    
+    @pytest.mark.asyncio
+    async def test_find_similar_tasks(self, memory):
+        """Test similarity search over stored tasks."""
+        pytest.importorskip('numpy')
+        await memory.add_task_result(
+            {'intent': 'open_application', 'parameters': {'application': 'notepad'}},
+            {'success': True}
+        )
+        await memory.add_task_result(
+            {'intent': 'type_text', 'parameters': {'text': 'hello world'}},
+            {'success': True}
+        )
+        
+        similar = await memory.find_similar_tasks("open notepad", limit=5)
+        
+        assert isinstance(similar, list)
+        assert similar[0]['intent'] == 'open_application'
+        await memory.stop()
+    
     @pytest.mark.asyncio
     async def test_save_and_load_state(self, memory):
         """Test state persistence."""
@@ -65,6 +65,42 @@ class TestClipboardPlugin:
         assert isinstance(caps, list)
         assert 'copy' in caps
         assert 'paste' in caps
+    
+    @pytest.mark.asyncio
+    async def test_history_collapses_repeats(self, clipboard):
+        """Test that consecutive identical entries are counted, not duplicated."""
+        await clipboard._add_to_history('same', 'copy')
+        await clipboard._add_to_history('same', 'copy')
+        await clipboard._add_to_history('same', 'paste')
+        
+        assert len(clipboard.history) == 2
+        assert clipboard.history[0]['count'] == 2
+        assert clipboard.history[1]['count'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_large_entry_spilled(self, clipboard, tmp_path):
+        """Test that large entries keep a preview and spill content to disk."""
+        clipboard.spill_dir = tmp_path
+        content = 'x' * (clipboard.spill_threshold + 1)
+        await clipboard._add_to_history(content, 'copy')
+        
+        entry = clipboard.history[-1]
+        assert entry['spilled']
+        assert 'content' not in entry
+        assert len(entry['preview']) == clipboard.preview_len
+        
+        result = await clipboard._get_full(entry['content_hash'])
+        assert result['content'] == content
+    
+    @pytest.mark.asyncio
+    async def test_get_full_rejects_paths(self, clipboard, tmp_path):
+        """Test that get_full only accepts a bare content digest."""
+        clipboard.spill_dir = tmp_path / 'spill'
+        (tmp_path / 'secret').write_text('secret')
+        
+        for bad in ('../secret', str(tmp_path / 'secret'), 'A' * 32, '0' * 31):
+            result = await clipboard._get_full(bad)
+            assert not result['success']
 
 
 class TestFileWatcherPlugin:
@@ -11,8 +11,12 @@ Testing:
 
 import pytest
 import asyncio
+import hashlib
+import json
+import threading
 from pathlib import Path
 import sys
+from datetime import date
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -83,6 +87,97 @@ class TestDatabasePlugin:
         assert result['success'] == True
         assert result['affected_rows'] >= 1
     
+    @pytest.mark.asyncio
+    async def test_insert_many(self, plugin):
+        """Test batched insertion."""
+        await plugin.execute('', action='connect', database='test_db', path='./data/test.db')
+        
+        schema = {
+            'id': 'INTEGER PRIMARY KEY',
+            'name': 'TEXT',
+            'value': 'INTEGER'
+        }
+        await plugin.execute('', action='create_table', table_name='test_data', schema=schema, database='test_db')
+        
+        rows = [{'name': f'row{i}', 'value': i} for i in range(50)]
+        result = await plugin.execute('', action='insert_many', table='test_data', rows=rows, database='test_db')
+        
+        assert result['success'] == True
+        assert result['affected_rows'] == 50
+    
+    @pytest.mark.asyncio
+    async def test_insert_rejects_bad_identifier(self, plugin):
+        """Test that table and column names are validated."""
+        await plugin.execute('', action='connect', database='test_db', path='./data/test.db')
+        
+        result = await plugin.execute('', action='insert', table='test_data; DROP TABLE x', data={'name': 'a'}, database='test_db')
+        
+        assert result['success'] == False
+        assert 'identifier' in result['error']
+    
+    @pytest.mark.asyncio
+    async def test_transaction_rollback(self, plugin):
+        """Test that writes inside begin/rollback are discarded."""
+        await plugin.execute('', action='connect', database='test_db', path='./data/test.db')
+        await plugin.execute('', action='create_table', table_name='txn_data', schema={'value': 'INTEGER'}, database='test_db')
+        await plugin.execute('', action='delete', table='txn_data', where='1 = 1', database='test_db')
+        
+        assert (await plugin.execute('', action='begin', database='test_db'))['success']
+        for i in range(5):
+            await plugin.execute('', action='insert', table='txn_data', data={'value': i}, database='test_db')
+        assert (await plugin.execute('', action='rollback', database='test_db'))['success']
+        
+        result = await plugin.execute('', action='query', sql='SELECT COUNT(*) AS n FROM txn_data', database='test_db')
+        assert result['rows'][0]['n'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_isolate_failures(self, plugin, tmp_path, monkeypatch):
+        """Test that queued writes share a batch and a failing one only fails itself."""
+        await plugin.execute('', action='connect', database='writes', path=str(tmp_path / 'writes.db'))
+        await plugin.execute('', action='create_table', table_name='items',
+                             schema={'name': 'TEXT NOT NULL'}, database='writes')
+        
+        batches = []
+        write_batch = plugin._write_batch
+        def record_batch(database, writes):
+            batches.append(len(writes))
+            return write_batch(database, writes)
+        monkeypatch.setattr(plugin, '_write_batch', record_batch)
+        
+        results = await asyncio.gather(*(
+            plugin.execute('', action='execute', sql='INSERT INTO items (name) VALUES (?)',
+                           params=(name,), database='writes')
+            for name in ('a', 'b', None, 'c')
+        ))
+        
+        assert batches == [4]
+        assert [r['success'] for r in results] == [True, True, False, True]
+        assert 'NOT NULL' in results[2]['error']
+        
+        result = await plugin.execute('', action='query', sql='SELECT name FROM items ORDER BY name',
+                                      database='writes')
+        assert [row['name'] for row in result['rows']] == ['a', 'b', 'c']
+        await plugin.execute('', action='disconnect', database='writes')
+    
+    @pytest.mark.asyncio
+    async def test_execute_outside_write_batch(self, plugin, tmp_path):
+        """Test that statements SQLite refuses inside a transaction still run."""
+        await plugin.execute('', action='connect', database='direct', path=str(tmp_path / 'direct.db'))
+        await plugin.execute('', action='create_table', table_name='items',
+                             schema={'value': 'INTEGER'}, database='direct')
+        
+        for sql in ('VACUUM', 'PRAGMA journal_mode=DELETE'):
+            result = await plugin.execute('', action='execute', sql=sql, database='direct')
+            assert result['success'] == True, result
+        
+        assert (await plugin.execute('', action='execute', sql='BEGIN', database='direct'))['success']
+        await plugin.execute('', action='insert', table='items', data={'value': 1}, database='direct')
+        assert (await plugin.execute('', action='execute', sql='ROLLBACK', database='direct'))['success']
+        
+        result = await plugin.execute('', action='query', sql='SELECT COUNT(*) AS n FROM items', database='direct')
+        assert result['rows'][0]['n'] == 0
+        await plugin.execute('', action='disconnect', database='direct')
+    
     @pytest.mark.asyncio
     async def test_query_data(self, plugin):
         """Test data querying."""
@@ -93,6 +188,80 @@ class TestDatabasePlugin:
         assert result['success'] == True
         assert 'rows' in result
     
+    @pytest.mark.asyncio
+    async def test_query_columnar(self, plugin):
+        """Test columnar query output."""
+        await plugin.execute('', action='connect', database='test_db', path='./data/test.db')
+        
+        result = await plugin.execute('', action='query', sql='SELECT 1 as a, 2 as b', database='test_db', format='columnar')
+        
+        assert result['columns'] == ['a', 'b']
+        assert result['data'] == [[1], [2]]
+    
+    @pytest.mark.asyncio
+    async def test_query_as_json(self, plugin):
+        """Test that as_json returns the result serialized as JSON bytes."""
+        await plugin.execute('', action='connect', database='test_db', path='./data/test.db')
+        
+        result = await plugin.execute('', action='query', sql="SELECT 1 AS a, 'x' AS b",
+                                      database='test_db', as_json=True)
+        assert result['row_count'] == 1
+        assert 'rows' not in result
+        assert json.loads(result['json']) == [{'a': 1, 'b': 'x'}]
+        
+        result = await plugin.execute('', action='query', sql="SELECT 1 AS a, 'x' AS b",
+                                      database='test_db', as_json=True, format='columnar')
+        assert json.loads(result['json']) == {'columns': ['a', 'b'], 'data': [[1], ['x']]}
+    
+    @pytest.mark.asyncio
+    async def test_sql_functions(self, plugin):
+        """Test the sha256() function and REGEXP operator registered on SQLite connections."""
+        await plugin.execute('', action='connect', database='test_db', path='./data/test.db')
+        
+        result = await plugin.execute(
+            '', action='query', database='test_db',
+            sql="SELECT sha256('abc') AS digest, sha256(NULL) AS empty, "
+                "'order-42' REGEXP '^order-[0-9]+$' AS hit, 'invoice' REGEXP '^order' AS miss"
+        )
+        
+        row = result['rows'][0]
+        assert row['digest'] == hashlib.sha256(b'abc').hexdigest()
+        assert row['empty'] is None
+        assert (row['hit'], row['miss']) == (1, 0)
+    
+    @pytest.mark.asyncio
+    async def test_query_stream(self, plugin):
+        """Test that streamed queries yield the result in chunks."""
+        await plugin.execute('', action='connect', database='test_db', path='./data/test.db')
+        
+        sql = ('WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 5) '
+               'SELECT x FROM n')
+        result = await plugin.execute('', action='query', sql=sql, database='test_db',
+                                      stream=True, chunk_size=2)
+        
+        assert result['success'] == True
+        chunks = [chunk async for chunk in result['stream']]
+        assert [[row['x'] for row in chunk] for chunk in chunks] == [[1, 2], [3, 4], [5]]
+    
+    @pytest.mark.asyncio
+    async def test_backup(self, plugin, tmp_path):
+        """Test that a stepped backup copies every table."""
+        await plugin.execute('', action='connect', database='src', path=str(tmp_path / 'src.db'))
+        await plugin.execute('', action='create_table', table_name='items',
+                             schema={'value': 'INTEGER'}, database='src')
+        await plugin.execute('', action='insert_many', table='items',
+                             rows=[{'value': i} for i in range(100)], database='src')
+        
+        backup_path = str(tmp_path / 'backup.db')
+        result = await plugin.execute('', action='backup', database='src', backup_path=backup_path, pages=1)
+        
+        assert result['success'] == True
+        assert result['pages'] > 1
+        assert not plugin.connections['src']['lock'].locked()
+        await plugin.execute('', action='connect', database='copy', path=backup_path)
+        result = await plugin.execute('', action='query', sql='SELECT COUNT(*) AS n FROM items', database='copy')
+        assert result['rows'][0]['n'] == 100
+    
     @pytest.mark.asyncio
     async def test_list_tables(self, plugin):
         """Test listing tables."""
@@ -172,6 +341,290 @@ class TestEmailPlugin:
         assert result['success'] == True
         assert 'welcome' in plugin.templates
     
+    @pytest.mark.asyncio
+    async def test_send_bulk_reuses_connection(self, plugin, monkeypatch):
+        """Test that a bulk send logs in once and sends one message per recipient."""
+        sessions = []
+        
+        class FakeSMTP:
+            def __init__(self, host, port):
+                self.sent = []
+                sessions.append(self)
+            
+            def starttls(self):
+                pass
+            
+            def login(self, username, password):
+                pass
+            
+            def send_message(self, msg, from_addr, to_addrs):
+                self.sent.append((msg['To'], to_addrs))
+            
+            def quit(self):
+                pass
+            
+            def close(self):
+                pass
+        
+        monkeypatch.setattr('src.plugins.email_plugin.smtplib.SMTP', FakeSMTP)
+        await plugin.execute('', action='add_account', name='test', smtp_server='localhost',
+                             smtp_port=25, username='me@example.com', password='pw')
+        
+        result = await plugin.execute('', action='send_bulk', account='test',
+                                      recipients=['a@example.com', 'b@example.com', 'c@example.com'],
+                                      subject='Hi', body='Hello', concurrency=1)
+        
+        assert result['results']['success'] == 3
+        assert len(sessions) == 1
+        assert [to for to, _ in sessions[0].sent] == ['a@example.com', 'b@example.com', 'c@example.com']
+
+    @pytest.mark.asyncio
+    async def test_send_reuses_cached_session(self, plugin, monkeypatch):
+        """Test that consecutive sends share one SMTP session until close."""
+        sessions = []
+
+        class FakeSMTP:
+            def __init__(self, host, port):
+                self.sent = 0
+                self.quit_called = False
+                sessions.append(self)
+
+            def login(self, username, password):
+                pass
+
+            def noop(self):
+                return 250, b'OK'
+
+            def send_message(self, msg, from_addr, to_addrs):
+                self.sent += 1
+
+            def quit(self):
+                self.quit_called = True
+
+        monkeypatch.setattr('src.plugins.email_plugin.smtplib.SMTP', FakeSMTP)
+        monkeypatch.setattr('src.plugins.email_plugin.AIOSMTPLIB_AVAILABLE', False)
+        await plugin.execute('', action='add_account', name='test', smtp_server='localhost',
+                             smtp_port=25, username='me@example.com', password='pw', use_tls=False)
+
+        for _ in range(3):
+            result = await plugin.execute('', action='send', account='test',
+                                          to='a@example.com', subject='Hi', body='Hello')
+            assert result['success'] == True
+
+        assert len(sessions) == 1
+        assert sessions[0].sent == 3
+
+        await plugin.close()
+        assert sessions[0].quit_called
+        assert '_smtp' not in plugin.accounts['test']
+
+    @pytest.mark.asyncio
+    async def test_cleanup_closes_sessions(self, plugin, monkeypatch):
+        """Test that unloading closes cached sessions before returning."""
+        class FakeSession:
+            closed = False
+
+            def quit(self):
+                self.closed = True
+
+            def close(self):
+                self.closed = True
+
+        unregistered = []
+        monkeypatch.setattr('src.plugins.email_plugin.atexit.unregister', unregistered.append)
+        await plugin.execute('', action='add_account', name='test', smtp_server='localhost',
+                             smtp_port=25, username='me@example.com', password='pw')
+        smtp, asmtp = FakeSession(), FakeSession()
+        plugin.accounts['test']['_smtp'] = smtp
+        plugin.accounts['test']['_asmtp'] = asmtp
+
+        plugin.cleanup()
+
+        assert smtp.closed and asmtp.closed
+        assert '_smtp' not in plugin.accounts['test']
+        assert '_asmtp' not in plugin.accounts['test']
+        assert unregistered == [plugin._close_sessions]
+
+    def test_idle_drains_lines_from_one_read(self, plugin, monkeypatch):
+        """Test that IDLE handles every line of a read before polling again."""
+        class FakeSocket:
+            def __init__(self):
+                # Both lines arrive in one TLS record once the socket is readable
+                self.lines = [b'* 3 EXPUNGE\r\n', b'* 4 EXISTS\r\n']
+                self.received = False
+
+            def pending(self):
+                return int(self.received and bool(self.lines))
+
+        class FakeIMAP:
+            def __init__(self):
+                self.sock = FakeSocket()
+                self.done = False
+
+            def _new_tag(self):
+                return b'A1'
+
+            def send(self, data):
+                self.done = data == b'DONE\r\n'
+
+            def socket(self):
+                return self.sock
+
+            def readline(self):
+                if self.done:
+                    return b'A1 OK IDLE terminated\r\n'
+                if not hasattr(self, 'started'):
+                    self.started = True
+                    return b'+ idling\r\n'
+                return self.sock.lines.pop(0)
+
+        mail = FakeIMAP()
+        stop = threading.Event()
+        polls = []
+
+        def fake_select(readable, writable, errors, timeout):
+            polls.append(len(mail.sock.lines))
+            if len(polls) > 1:
+                stop.set()
+                return [], [], []
+            mail.sock.received = True
+            return readable, [], []
+
+        monkeypatch.setattr('src.plugins.email_plugin.select.select', fake_select)
+
+        assert plugin._idle_once(mail, 3, stop) == (4, True)
+        # IDLE ends on new mail without waiting for another read
+        assert polls == [2]
+        assert mail.done
+
+    @pytest.mark.asyncio
+    async def test_wait_new_fetches_queued_uids(self, plugin):
+        """Test that IDLE notifications are fetched by UID, not sequence number."""
+        class FakeIMAP:
+            def select(self, folder):
+                return 'OK', [b'2']
+
+            def uid(self, command, *args):
+                if command == 'SEARCH':
+                    assert args == (None, 'UID 7:*')
+                    return 'OK', [b'7 9']
+                assert args == ('7,9', '(RFC822)')
+                return 'OK', [
+                    (b'1 (UID 7 RFC822 {14}', b'Subject: A\r\n\r\n'),
+                    b')',
+                    (b'2 (UID 9 RFC822 {14}', b'Subject: B\r\n\r\n'),
+                    b')'
+                ]
+
+        await plugin.execute('', action='add_account', name='test', smtp_server='localhost',
+                             smtp_port=25, username='me@example.com', password='pw',
+                             imap_server='localhost')
+        plugin.accounts['test']['_imap'] = FakeIMAP()
+
+        uids, uid_next = plugin._new_uids(FakeIMAP(), 7)
+        assert (uids, uid_next) == ([b'7', b'9'], 10)
+
+        queue = asyncio.Queue()
+        queue.put_nowait(uids[:1])
+        queue.put_nowait(uids[1:])
+        plugin._idle['test'] = {'folder': 'INBOX', 'queue': queue, 'stop': threading.Event()}
+
+        result = await plugin._wait_new('test', timeout=1)
+
+        assert result['success']
+        assert [(e['uid'], e['subject']) for e in result['emails']] == [('7', 'A'), ('9', 'B')]
+
+    def test_fetch_headers_uses_bodystructure(self, plugin):
+        """Test that header-only fetches detect attachments from BODYSTRUCTURE."""
+        class FakeIMAP:
+            def fetch(self, message_set, spec):
+                # Without PEEK, so received messages are marked seen
+                assert spec == '(BODY[HEADER] BODYSTRUCTURE)'
+                return 'OK', [
+                    (b'1 (BODY[HEADER] {24}', b'Subject: Report\r\n\r\n'),
+                    b' BODYSTRUCTURE (("text" "plain" NIL NIL NIL "7bit" 5 1)'
+                    b'("application" "pdf" NIL NIL NIL "base64" 9 NIL ("attachment" ("filename" "a.pdf"))) "mixed"))',
+                    (b'2 (BODYSTRUCTURE ("text" "plain" NIL NIL NIL "7bit" 5 1) BODY[HEADER] {20}',
+                     b'Subject: Hi\r\n\r\n'),
+                    b')'
+                ]
+
+        emails = plugin._fetch_emails(FakeIMAP(), [b'1', b'2'], body=False)
+
+        assert [(e['id'], e['subject'], e['has_attachments']) for e in emails] == [
+            ('1', 'Report', True),
+            ('2', 'Hi', False)
+        ]
+        assert 'body' not in emails[0]
+
+    @pytest.mark.asyncio
+    async def test_receive_multi_reports_per_account(self, plugin):
+        """Test that a multi-account receive returns one result per account."""
+        await plugin.execute('', action='add_account', name='smtp_only',
+                             smtp_server='localhost', smtp_port=25)
+
+        result = await plugin.execute('', action='receive_multi', accounts=['smtp_only', 'missing'])
+
+        assert set(result['results']) == {'smtp_only', 'missing'}
+        assert result['results']['smtp_only']['error'] == 'IMAP server not configured'
+        assert result['results']['missing']['success'] == False
+        assert result['count'] == 0
+
+    @pytest.mark.asyncio
+    async def test_search_results_delete_the_same_message(self, plugin):
+        """Test that either id from search deletes the message that was found."""
+        class FakeIMAP:
+            uids = {'1': '7', '2': '9'}
+
+            def __init__(self):
+                self.deleted = []
+
+            def select(self, folder):
+                return 'OK', [b'2']
+
+            def uid(self, command, *args):
+                if command == 'SEARCH':
+                    return 'OK', [b'9']
+                if command == 'FETCH':
+                    assert args[0] == '9'
+                    return 'OK', [(b'2 (UID 9 BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {14}',
+                                   b'Subject: B\r\n\r\n'), b')']
+                self.deleted.append(args[0])
+                return 'OK', []
+
+            def store(self, message_set, command, flags):
+                self.deleted.append(self.uids[message_set])
+                return 'OK', []
+
+            def expunge(self):
+                return 'OK', []
+
+        await plugin.execute('', action='add_account', name='test', smtp_server='localhost',
+                             smtp_port=25, username='me@example.com', password='pw',
+                             imap_server='localhost')
+        mail = plugin.accounts['test']['_imap'] = FakeIMAP()
+
+        result = await plugin.execute('', action='search', account='test', query='B')
+        found = result['emails'][0]
+        assert (found['id'], found['uid']) == ('2', '9')
+
+        await plugin.execute('', action='delete', account='test', email_id=found['id'])
+        await plugin.execute('', action='delete', account='test', email_id=found['uid'], uid=True)
+        assert mail.deleted == ['9', '9']
+
+    def test_search_criteria(self, plugin):
+        """Test structured search queries and rejection of unsafe values."""
+        criteria = plugin._search_criteria({
+            'from': 'boss@example.com',
+            'since': date(2024, 3, 5),
+            'unseen': True
+        })
+
+        assert criteria == ['FROM', '"boss@example.com"', 'SINCE', '"05-Mar-2024"', 'UNSEEN']
+
+        with pytest.raises(ValueError):
+            plugin._search_criteria({'subject': 'x") OR ALL ("'})
+
     def test_capabilities(self, plugin):
         """Test plugin capabilities."""
         caps = plugin.get_capabilities()
@@ -204,18 +657,127 @@ class TestBrowserAutomationPlugin:
         assert 'navigate' in caps['actions']
         assert 'click' in caps['actions']
     
+    def test_selector_mapping(self, plugin):
+        """Test by-strategy to Playwright selector mapping."""
+        assert plugin._to_selector('#main', 'css') == 'css=#main'
+        assert plugin._to_selector('main', 'id') == 'id=main'
+        assert plugin._to_selector('//div', 'xpath') == 'xpath=//div'
+        assert plugin._to_selector('q', 'name') == '[name="q"]'
+
+    @pytest.mark.asyncio
+    async def test_batch_single_round_trip(self, plugin):
+        """Test that batched steps are sent to the page in one call."""
+        class FakePage:
+            def __init__(self):
+                self.calls = []
+
+            async def evaluate(self, expression, arg):
+                self.calls.append(arg)
+                return [{'success': True} for _ in arg[0]]
+
+        page = FakePage()
+        plugin.browsers['default'] = {'page': page}
+        steps = [
+            {'action': 'type', 'selector': '#q', 'text': 'cosik'},
+            {'action': 'click', 'selector': '#go'}
+        ]
+
+        result = await plugin._batch(steps)
+
+        assert result['success']
+        assert len(result['results']) == 2
+        assert page.calls == [[steps]]
+
     @pytest.mark.asyncio
-    async def test_by_method_mapping(self, plugin):
-        """Test CSS selector mapping."""
+    async def test_stopped_session_is_reused(self, plugin):
+        """Test that a stopped session returns to the pool for the next start."""
+        class FakePage:
+            async def goto(self, url):
+                self.url = url
+
+        class FakeContext:
+            async def new_page(self):
+                return FakePage()
+
+            async def clear_cookies(self):
+                pass
+
+        class FakeBrowser:
+            contexts = 0
+
+            async def new_context(self, **kwargs):
+                FakeBrowser.contexts += 1
+                return FakeContext()
+
+        plugin._launched[('chrome', False)] = FakeBrowser()
+
+        await plugin._start_browser(session_name='first')
+        page = plugin.browsers['first']['page']
+        await plugin._stop_browser(session_name='first')
+        await plugin._start_browser(session_name='second')
+
+        assert plugin.browsers['second']['page'] is page
+        assert page.url == 'about:blank'
+        assert FakeBrowser.contexts == 1
+
+    @pytest.mark.asyncio
+    async def test_cleanup_keeps_shutdown_task(self, plugin):
+        """Test that cleanup holds on to the shutdown it schedules."""
+        class FakePlaywright:
+            stopped = False
+
+            async def stop(self):
+                self.stopped = True
+
+        playwright = plugin._playwright = FakePlaywright()
+        plugin.cleanup()
+
+        assert plugin._shutdown_task is not None
+        await plugin._shutdown_task
+        assert playwright.stopped
+
+    def test_cleanup_without_running_loop(self, plugin):
+        """Test that cleanup outside a loop shuts down on the Playwright loop."""
+        class FakePlaywright:
+            stopped = False
+
+            async def stop(self):
+                self.stopped = True
+
+        loop = asyncio.new_event_loop()
         try:
-            from selenium.webdriver.common.by import By
-            
-            assert plugin._get_by_method('css') == By.CSS_SELECTOR
-            assert plugin._get_by_method('id') == By.ID
-            assert plugin._get_by_method('xpath') == By.XPATH
-        except ImportError:
-            # Selenium not available, skip this test
-            pytest.skip("Selenium not installed")
+            playwright = plugin._playwright = FakePlaywright()
+            plugin._playwright_loop = loop
+            plugin.cleanup()
+        finally:
+            loop.close()
+
+        assert playwright.stopped
+        assert plugin._playwright is None
+
+    @pytest.mark.asyncio
+    async def test_execute_many_keeps_order(self, plugin, monkeypatch):
+        """Test that bulk execution returns results in request order."""
+        monkeypatch.setattr('src.plugins.browser_automation_plugin.PLAYWRIGHT_AVAILABLE', True)
+
+        class FakePage:
+            def __init__(self, name):
+                self.name = name
+
+            async def inner_text(self, selector, timeout=None):
+                await asyncio.sleep(0)
+                return f'{self.name}:{selector}'
+
+        plugin.browsers['a'] = {'page': FakePage('a')}
+        plugin.browsers['b'] = {'page': FakePage('b')}
+
+        results = await plugin.execute_many([
+            {'action': 'get_text', 'selector': '#1', 'session_name': 'a'},
+            {'action': 'get_text', 'selector': '#2', 'session_name': 'b'},
+            {'action': 'get_text', 'selector': '#3', 'session_name': 'a'}
+        ])
+
+        assert [r['text'] for r in results] == ['a:css=#1', 'b:css=#2', 'a:css=#3']
 
 
 class TestNotificationPlugin: